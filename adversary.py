@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Plays the solver against an adversary to find its worst case (like Absurdle).
+
+There is no fixed answer. After each guess the adversary looks at every answer still consistent
+with the feedback so far, splits them by the pattern the guess would get and gives the pattern
+shared by the most answers, keeping the game going for as long as it can. Solver is
+deterministic, so the guesses and patterns are a real game: any answer left at the end needs
+that many guesses. The biggest bucket isn't always the slowest one to solve, so this is a lower
+bound on Solver's worst case rather than the worst case itself (DecisionTree.compile has that).
+
+The buckets come from one pass over the remaining answers per guess (a row of the pattern matrix
+with exact feedback), not from playing a Solver for each answer.
+"""
+import functools
+import sys
+
+from patterns import presence_pattern
+from patterns import solved
+from patterns import to_string
+from wordle_solver import Solver
+from wordle_solver import WordIndex
+from wordle_solver import pattern_matrix
+
+# A game this long means Solver and the adversary disagree about which answers are left
+MAX_GUESSES = 20
+
+def partition(guess, answers, exact_feedback = False):
+    """
+    Returns a dict of pattern to the answers (matrix columns) that give guess that pattern
+    """
+    buckets = dict()
+    if exact_feedback:
+        row = pattern_matrix().row(guess)
+        for column in answers:
+            buckets.setdefault(row[column], []).append(column)
+    else:
+        words = WordIndex.shared().answer_words
+        for column in answers:
+            buckets.setdefault(presence_pattern(guess, words[column]), []).append(column)
+    return buckets
+
+def worst_pattern(guess, buckets):
+    """
+    The pattern the adversary gives: the biggest bucket, one that doesn't solve the game if there is
+    a tie, then the lowest pattern so the choice is repeatable
+    """
+    finished = solved(len(guess))
+    return max(buckets, key = lambda code: (len(buckets[code]), code != finished, -code))
+
+def play(starting_word = 'SLATE', **options):
+    """
+    Returns the guesses and patterns of an adversarial game as a list of (guess, pattern).
+    options are passed on to the Solver, e.g. exact_feedback = True
+    """
+    exact_feedback = options.get('exact_feedback', False)
+    solver = Solver(**options)
+    answers = range(0, len(WordIndex.shared().answer_words))
+    guess = starting_word.upper()
+    path = []
+    while True:
+        buckets = partition(guess, answers, exact_feedback)
+        code = worst_pattern(guess, buckets)
+        answers = buckets[code]
+        path.append((guess, code))
+        if code == solved(len(guess)):
+            return path
+        if len(path) >= MAX_GUESSES:
+            raise RuntimeError(f'{starting_word}: no answer after {MAX_GUESSES} guesses')
+        solver.feedback(guess, code)
+        guess = solver.next_guess()
+
+def _forced(starting_word, options):
+    return starting_word, play(starting_word, **options)
+
+def play_all(starting_words, jobs = 1, **options):
+    """
+    Yields (starting word, path) for each starting word, in the same order, spreading them over
+    jobs processes like solve_all
+    """
+    player = functools.partial(_forced, options = options)
+    if jobs <= 1:
+        yield from map(player, starting_words)
+        return
+    WordIndex.shared().guess_letters
+    if options.get('exact_feedback'):
+        pattern_matrix()
+    import multiprocessing
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    chunksize = max(1, len(starting_words) // (jobs * 8))
+    with context.Pool(jobs) as pool:
+        yield from pool.imap(player, starting_words, chunksize)
+
+def path_string(path):
+    return ' '.join(f'{guess}:{to_string(code, len(guess))}' for guess, code in path)
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    import time
+    from wordle_runner import word_arguments
+    parser = argparse.ArgumentParser(description='Find the most guesses an adversary can force the solver to make')
+    parser.add_argument('-w', '--words', action="store", dest="words", default="SLATE", help="Starting words, separated by commas or in a file")
+    parser.add_argument('-a', '--all', action="store_true", dest="all", help="Try every allowed guess as the starting word")
+    parser.add_argument('-di','--disable-intersecting', action="store_true", dest="disable_intersecting", help="Disable intersecting guesses")
+    parser.add_argument('-x', '--exact', action="store_true", dest="exact", help="Use real Wordle feedback for duplicate letters")
+    parser.add_argument('-j', '--jobs', action="store", dest="jobs", type=int, default=1, help="Play starting words across this many processes (0 for one per core)")
+    args = parser.parse_args()
+
+    start = time.time()
+    words = list(WordIndex.shared().guesses) if args.all else word_arguments(args.words)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+    options = dict(use_intersecting = not args.disable_intersecting, exact_feedback = args.exact, cache = True)
+    worst = None
+    try:
+        # One CSV row per starting word: word,guesses,path
+        for word, path in play_all(words, jobs, **options):
+            print(f'{word},{len(path)},{path_string(path)}', flush = True)
+            if worst is None or len(path) > len(worst[1]):
+                worst = (word, path)
+    except BrokenPipeError:
+        # Whatever rows were piped into stopped reading (e.g. head), don't complain on exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    if worst is not None:
+        print(f'Most guesses forced: {len(worst[1])} ({path_string(worst[1])}), {len(words)} starting words in {round(time.time() - start, 1)}s', file = sys.stderr)
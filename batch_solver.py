@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Solves many answers in lockstep.
+
+Solver is deterministic, so two games that have had the same feedback so far are in the same state
+and will make the same next guess. Instead of playing each answer on its own, BatchSolver keeps one
+Solver per distinct state together with the answers still in that state. Every turn each state's guess
+is scored against all of its answers at once, the answers are split into groups by the feedback they
+would give, and each group continues from a copy of the state with that feedback applied. next_guess
+then runs once per group rather than once per game.
+
+The Solutions are the same as Solver(answer).solve(starting_word) would give for each answer.
+"""
+import time
+
+from patterns import presence_pattern
+from wordle_solver import Solution
+from wordle_solver import Solver
+from wordle_solver import UnsupportedAnswer
+from wordle_solver import WordIndex
+from wordle_solver import pattern_matrix
+
+class BatchSolver:
+    def __init__(self, **options):
+        """
+        options are the Solver options, e.g. use_intersecting = False, exact_feedback = True
+        """
+        self.options = options
+        self.exact_feedback = options.get('exact_feedback', False)
+        # Counters for the last solve
+        self.games = 0
+        self.states = 0
+        self.elapsed = 0
+
+    def _split(self, guess, answers):
+        """
+        Groups answers by the pattern guess gets against them, keeping their order
+        """
+        groups = dict()
+        if self.exact_feedback:
+            matrix = pattern_matrix()
+            row = matrix.row(guess)
+            column_of = matrix.column
+            codes = [row[column_of(answer)] for answer in answers]
+        else:
+            codes = [presence_pattern(guess, answer) for answer in answers]
+        for code, answer in zip(codes, answers):
+            group = groups.get(code)
+            if group is None:
+                groups[code] = [answer]
+            else:
+                group.append(answer)
+        return groups
+
+    def solve(self, words, starting_word = None):
+        """
+        Returns a Solution for each word, in the same order as words
+        starting_word: the first guess, the policy's starting word by default (see Solver.solve)
+        """
+        start = time.perf_counter()
+        words = [word.upper() for word in words]
+        answers = WordIndex.shared().answer_set
+        for word in words:
+            if word not in answers:
+                raise UnsupportedAnswer()
+
+        solutions = dict()
+        self.states = 0
+        root = Solver(**self.options)
+        if starting_word is None:
+            dictionary = root.puzzle.dictionary
+            starting_word = dictionary.index.starting_word(dictionary.policy.starting_word)
+        guess = starting_word if starting_word else root.puzzle.next_guess()
+        frontier = [(root, guess, list(dict.fromkeys(words)))]
+        while len(frontier) > 0:
+            following = []
+            for solver, guess, answers in frontier:
+                self.states += 1
+                # Every group continues from this guess, so it is only removed from the word lists once
+                solver.puzzle.add_guess(guess)
+                for code, group in self._split(guess, answers).items():
+                    if guess in group:
+                        # Only the answer itself gives all green
+                        solutions[guess] = Solution(list(solver.guesses()))
+                        continue
+                    child = solver.copy()
+                    child.feedback(guess, code, add_guess = False)
+                    following.append((child, child.puzzle.next_guess(), group))
+            frontier = following
+
+        self.games = len(words)
+        self.elapsed = time.perf_counter() - start
+        return [solutions[word] for word in words]
+
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed > 0 else 0
+
+def solve_batch(words, starting_word = None, **options):
+    """
+    Returns a Solution for each word, like list(solve_all(words, starting_word, **options))
+    """
+    return BatchSolver(**options).solve(words, starting_word)
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Solve every answer in lockstep')
+    parser.add_argument('-w', '--word', action="store", dest="word", default="SLATE", help="Starting word")
+    parser.add_argument('-di','--disable-intersecting', action="store_true", dest="disable_intersecting", help="Disable intersecting guesses")
+    parser.add_argument('-x', '--exact', action="store_true", dest="exact", help="Use real Wordle feedback for duplicate letters")
+    args = parser.parse_args()
+
+    batch = BatchSolver(use_intersecting = not args.disable_intersecting, exact_feedback = args.exact)
+    solutions = batch.solve(WordIndex.shared().answers, args.word.upper())
+    guess_count = sum(solution.guess_count for solution in solutions)
+    print(f'Solved {batch.games} answers from {batch.states} states in {round(batch.elapsed, 2)}s '
+        f'({round(batch.games_per_second())} games/sec), average {round(guess_count / batch.games, 4)} guesses')
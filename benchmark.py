@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Timings for the solver's hot paths, so changes can be judged on numbers.
+
+Each benchmark is run a few times and its median and fastest times are kept, then run once more
+under tracemalloc to record peak memory. Results can be saved as a JSON baseline and later runs
+compared against it:
+    ./benchmark.py -o baseline.json
+    ./benchmark.py -c baseline.json -t 0.2
+Comparing exits with status 1 if any benchmark got slower (or used more memory) than the tolerance allows.
+Times are compared by the fastest run, which is the least affected by whatever else the machine is doing.
+"""
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+from patterns import presence_pattern
+from wordle_solver import Dictionary
+from wordle_solver import Solver
+from wordle_solver import WordIndex
+from wordle_solver import solve_all
+
+BENCHMARK_VERSION = 1
+STARTING_WORD = 'SLATE'
+# Every SAMPLE_STEP'th answer (by score) is in the fixed sample
+SAMPLE_STEP = 25
+DICTIONARIES = 1000
+
+def sample_answers():
+    return list(WordIndex.shared().answers[::SAMPLE_STEP])
+
+def _first_guess_states():
+    """
+    Solvers for the sample answers that got feedback for the starting word, with answers not yet pruned
+    """
+    solvers = []
+    for answer in sample_answers():
+        solver = Solver(answer)
+        solver.feedback(STARTING_WORD, presence_pattern(STARTING_WORD, answer))
+        solvers.append(solver)
+    return solvers
+
+def _intersecting_states():
+    """
+    Dictionaries for the sample answers at the first turn where the solver looks for an intersecting word
+    """
+    dictionaries = []
+    for answer in sample_answers():
+        solver = Solver(answer)
+        guess = STARTING_WORD
+        while guess != answer:
+            solver.feedback(guess, presence_pattern(guess, answer))
+            dictionary = solver.puzzle.dictionary
+            dictionary._update()
+            if 2 < dictionary.answer_count() < 50:
+                dictionaries.append(dictionary)
+                break
+            guess = solver.next_guess()
+    return dictionaries
+
+def bench_word_index(_):
+    WordIndex()
+
+def bench_dictionary_init(_):
+    for _ in range(0, DICTIONARIES):
+        Dictionary()
+
+def bench_update_answers(solvers):
+    for solver in solvers:
+        dictionary = solver.puzzle.dictionary
+        dictionary._update_answers(dictionary.feedback.take_changes())
+
+def bench_intersecting_word(dictionaries):
+    for dictionary in dictionaries:
+        dictionary._find_best_intersecting_word()
+
+def bench_solve_sample(answers):
+    for answer in answers:
+        Solver(answer).solve(STARTING_WORD)
+
+def bench_sweep(answers):
+    for _ in solve_all(answers, STARTING_WORD):
+        pass
+
+# name: (setup, benchmark, repeat). setup's result is passed to the benchmark and isn't timed
+BENCHMARKS = {
+    'word_index': (None, bench_word_index, 3),
+    'dictionary_init': (None, bench_dictionary_init, 10),
+    'update_answers': (_first_guess_states, bench_update_answers, 10),
+    'intersecting_word': (_intersecting_states, bench_intersecting_word, 5),
+    'solve_sample': (sample_answers, bench_solve_sample, 3),
+    'sweep': (lambda: WordIndex.shared().answers, bench_sweep, 1),
+}
+
+def measure(setup, benchmark, repeat):
+    times = []
+    for _ in range(0, repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        benchmark(argument)
+        times.append(time.perf_counter() - start)
+
+    argument = setup() if setup is not None else None
+    tracemalloc.start()
+    benchmark(argument)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': statistics.median(times), 'min': min(times), 'repeat': repeat, 'peak_kb': peak // 1024}
+
+def run(names = None, report = print):
+    """
+    Runs the named benchmarks (all of them by default) and returns the results as a dictionary
+    """
+    # Load the shared index first so only the first benchmark to need it doesn't pay for it
+    WordIndex.shared().guess_letters
+    results = dict()
+    for name, (setup, benchmark, repeat) in BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        results[name] = measure(setup, benchmark, repeat)
+        report(format_result(name, results[name]))
+    return {
+        'version': BENCHMARK_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'benchmarks': results,
+    }
+
+def format_result(name, result):
+    return f'{name.ljust(20)} {result["seconds"]:10.4f}s  (min {result["min"]:.4f}s)  peak {result["peak_kb"]} KB'
+
+def compare(baseline, current, tolerance = 0.2):
+    """
+    Returns a list of (name, metric, baseline value, current value) for every benchmark in both
+    results whose fastest time or peak memory grew by more than tolerance (0.2 is 20%). A metric
+    that was 0 in the baseline has nothing to grow from, so it is skipped.
+    """
+    regressions = []
+    for name, result in current['benchmarks'].items():
+        before = baseline['benchmarks'].get(name)
+        if before is None:
+            continue
+        for metric in ['min', 'peak_kb']:
+            if before[metric] > 0 and result[metric] > before[metric] * (1 + tolerance):
+                regressions.append((name, metric, before[metric], result[metric]))
+    return regressions
+
+def print_comparison(baseline, current):
+    for name, result in current['benchmarks'].items():
+        before = baseline['benchmarks'].get(name)
+        if before is None:
+            print(f'{name.ljust(20)} {result["seconds"]:10.4f}s  (no baseline)')
+            continue
+        change = (result['min'] / before['min'] - 1) * 100 if before['min'] > 0 else 0
+        print(f'{name.ljust(20)} {before["min"]:10.4f}s -> {result["min"]:.4f}s  {change:+.1f}%'
+            f'  peak {before["peak_kb"]} -> {result["peak_kb"]} KB')
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the solver')
+    parser.add_argument('-b', '--benchmark', action="append", dest="benchmarks", choices=list(BENCHMARKS.keys()), help="Only run this benchmark (can be repeated)")
+    parser.add_argument('-q', '--quick', action="store_true", dest="quick", help="Skip the full sweep")
+    parser.add_argument('-o', '--output', action="store", dest="output", help="Write the results to this JSON file")
+    parser.add_argument('-c', '--compare', action="store", dest="compare", help="Compare against a baseline JSON file")
+    parser.add_argument('-t', '--tolerance', action="store", dest="tolerance", type=float, default=0.2, help="Allowed slowdown before a benchmark counts as a regression (0.2 is 20%%)")
+    args = parser.parse_args()
+
+    names = args.benchmarks
+    if names is None and args.quick:
+        names = [name for name in BENCHMARKS.keys() if name != 'sweep']
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get('version') != BENCHMARK_VERSION:
+            sys.exit(f'{args.compare} is a version {baseline.get("version")} baseline, expected {BENCHMARK_VERSION}')
+
+    results = run(names, report = print if baseline is None else lambda line: None)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent = 2)
+    if baseline is not None:
+        print_comparison(baseline, results)
+        regressions = compare(baseline, results, args.tolerance)
+        for name, metric, before, after in regressions:
+            print(f'REGRESSION {name} {metric}: {before} -> {after}')
+        sys.exit(1 if len(regressions) > 0 else 0)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+The solver's policy compiled into a decision tree.
+
+For a fixed starting word and fixed settings the Solver is deterministic: the next guess only
+depends on the guesses so far and the feedback they got. Walking every answer through
+Solver.solve therefore gives a tree where each node is a guess and each child is keyed by the
+pattern (see patterns.py) that guess received. TreeSolver plays that tree, so every next_guess
+is a dictionary lookup with no filtering or scoring.
+"""
+import json
+import os
+
+from patterns import pattern
+from patterns import presence_pattern
+from patterns import solved
+from patterns import words_digest
+from patterns import GREEN, YELLOW
+from wordle_solver import Solver
+from wordle_solver import WordIndex
+from wordle_solver import solve_all
+from batch_solver import solve_batch
+
+TREE_VERSION = 1
+
+class Node:
+    __slots__ = ('guess', 'children')
+
+    def __init__(self, guess):
+        self.guess = guess
+        # Key is pattern, value is the Node for the next guess
+        self.children = dict()
+
+    def depth(self):
+        return 1 + max([child.depth() for child in self.children.values()], default = 0)
+
+    def __repr__(self):
+        return f'{self.guess}:{len(self.children)}'
+
+class DecisionTree:
+    def __init__(self, root, use_intersecting = True, exact_feedback = False, digest = None):
+        """
+        root: Node for the starting word
+        exact_feedback: whether patterns follow real Wordle rules (patterns.pattern)
+        or the rules Solver uses by default (patterns.presence_pattern)
+        digest: words_digest of the word lists the tree was compiled from
+        """
+        self.root = root
+        self.use_intersecting = use_intersecting
+        self.exact_feedback = exact_feedback
+        self.digest = digest if digest is not None else _index_digest()
+
+    @property
+    def starting_word(self):
+        return self.root.guess
+
+    def pattern(self, guess, answer):
+        return pattern(guess, answer) if self.exact_feedback else presence_pattern(guess, answer)
+
+    @classmethod
+    def compile(cls, starting_word = 'SLATE', use_intersecting = True, exact_feedback = False, answers = None, jobs = 1):
+        """
+        Solves every answer (all of them by default) and merges the guess paths into a tree.
+        With one job the answers are solved in lockstep (see batch_solver.py)
+        """
+        if answers is None:
+            answers = WordIndex.shared().answers
+        tree = cls(Node(starting_word), use_intersecting, exact_feedback)
+        options = dict(use_intersecting = use_intersecting, exact_feedback = exact_feedback)
+        if jobs <= 1:
+            solutions = solve_batch(answers, starting_word, **options)
+        else:
+            solutions = solve_all(answers, starting_word, jobs, **options)
+        for answer, solution in zip(answers, solutions):
+            tree.add(answer, solution.guesses)
+        return tree
+
+    def add(self, answer, guesses):
+        """
+        Adds the path Solver took to answer
+        """
+        node = self.root
+        for guess, next_guess in zip(guesses, guesses[1:]):
+            code = self.pattern(guess, answer)
+            child = node.children.get(code)
+            if child is None:
+                child = Node(next_guess)
+                node.children[code] = child
+            elif child.guess != next_guess:
+                raise ValueError(f'{answer}: solver chose {next_guess} where the tree has {child.guess}, it is not deterministic')
+            node = child
+
+    def _encode(self, node):
+        # Leaves are just the word, other nodes are [word, {pattern: child}]
+        if len(node.children) == 0:
+            return node.guess
+        return [node.guess, dict((str(code), self._encode(child)) for code, child in node.children.items())]
+
+    @classmethod
+    def _decode(cls, data):
+        if isinstance(data, str):
+            return Node(data)
+        node = Node(data[0])
+        for code, child in data[1].items():
+            node.children[int(code)] = cls._decode(child)
+        return node
+
+    def save(self, filename):
+        data = {
+            'version': TREE_VERSION,
+            'use_intersecting': self.use_intersecting,
+            'exact_feedback': self.exact_feedback,
+            'digest': self.digest,
+            'tree': self._encode(self.root),
+        }
+        with open(filename, 'w') as f:
+            json.dump(data, f, separators = (',', ':'))
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Loads a tree written by save, refusing trees compiled from other word lists
+        """
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != TREE_VERSION:
+            raise ValueError(f'{filename} is a version {data.get("version")} tree, expected {TREE_VERSION}')
+        if data['digest'] != _index_digest():
+            raise ValueError(f'{filename} was compiled from different word lists')
+        return cls(cls._decode(data['tree']), data['use_intersecting'], data['exact_feedback'], data['digest'])
+
+def _index_digest():
+    index = WordIndex.shared()
+    return words_digest(index.guess_words, index.answer_words).hex()
+
+class TreeSolver:
+    """
+    Plays a DecisionTree. While the game follows the tree next_guess is a lookup; as soon as a
+    guess or its feedback leaves the tree a live Solver is built from the guesses so far and takes over.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.node = tree.root
+        self.solver = None
+        self.history = list()
+        self._is_solved = False
+
+    def feedback(self, word, code):
+        """
+        Registers a guess and the pattern it received
+        """
+        word = word.upper()
+        self.history.append((word, code))
+        self._is_solved = code == solved(len(word))
+        if self.solver is not None:
+            self.solver.feedback(word, code)
+        elif self.node is not None and self.node.guess == word and code in self.node.children:
+            self.node = self.node.children[code]
+        elif not self._is_solved:
+            self._fall_back()
+
+    def guess(self, word, in_place, out_of_place):
+        """
+        Same arguments as Solver.guess: green letters like '__A__' and a string of yellow letters
+        """
+        self.feedback(word, self.code(word, in_place, out_of_place))
+
+    def code(self, word, in_place, out_of_place):
+        """
+        Builds the pattern for interactive feedback. Without exact_feedback every other copy of a green
+        or yellow letter is yellow too, since that is how Solver reads its own feedback
+        """
+        word = word.upper()
+        in_place = in_place.upper() if in_place else ""
+        out_of_place = out_of_place.upper() if out_of_place else ""
+        found = set(letter for letter in in_place if letter != "_") | set(out_of_place)
+        yellows = set(word.index(letter) for letter in out_of_place if letter in word)
+        code = 0
+        for index in reversed(range(0, len(word))):
+            if index < len(in_place) and in_place[index] == word[index]:
+                digit = GREEN
+            elif index in yellows or (not self.tree.exact_feedback and word[index] in found):
+                digit = YELLOW
+            else:
+                digit = 0
+            code = code * 3 + digit
+        return code
+
+    def _fall_back(self):
+        self.node = None
+        self.solver = Solver(use_intersecting = self.tree.use_intersecting, exact_feedback = self.tree.exact_feedback)
+        for word, code in self.history:
+            self.solver.feedback(word, code)
+
+    def next_guess(self):
+        if self.node is not None:
+            return self.node.guess
+        return self.solver.next_guess()
+
+    def is_on_tree(self):
+        return self.node is not None
+
+    def is_solved(self):
+        return self._is_solved
+
+    def guesses(self):
+        return list(map(lambda entry: entry[0], self.history))
+
+if __name__ == '__main__':
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description='Compile the solver into a decision tree')
+    parser.add_argument('-w', '--word', action="store", dest="word", default="SLATE", help="Starting word")
+    parser.add_argument('-o', '--output', action="store", dest="output", help="Tree file to write")
+    parser.add_argument('-di','--disable-intersecting', action="store_true", dest="disable_intersecting", help="Disable intersecting guesses")
+    parser.add_argument('-x', '--exact', action="store_true", dest="exact", help="Use real Wordle feedback for duplicate letters")
+    parser.add_argument('-j', '--jobs', action="store", dest="jobs", type=int, default=1, help="Solve answers across this many processes")
+    args = parser.parse_args()
+
+    start = time.time()
+    word = args.word.upper()
+    tree = DecisionTree.compile(word, not args.disable_intersecting, args.exact, jobs = args.jobs)
+    output = args.output if args.output else f'tree-{word}.json'
+    tree.save(output)
+    print(f'Compiled {word} tree (depth {tree.root.depth()}) in {round(time.time() - start, 1)}s: {output} ({os.path.getsize(output)} bytes)')
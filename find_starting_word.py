@@ -1,66 +1,99 @@
 #!/usr/bin/env python3
-from wordle_solver import Solver
 from wordle_solver import Dictionary
-import pandas as pd
-import numpy as np
+from wordle_solver import pattern_matrix
+from patterns import bucket_counts
+from patterns import partition_stats
+from patterns import solved
+import argparse
 
-def sort_results(results):
-    return dict(sorted(results.items(), key = lambda item: item[1]['avg']))
+# Metrics which are better when larger, everything else is better when smaller
+DESCENDING = ['entropy']
+COLUMNS = ['avg', 'best', 'best_word', 'worst', 'worst_word', 'expected', 'entropy', 'largest']
 
-def print_best(results):
-    results = sort_results(results)
+def sort_results(results, key = 'avg'):
+    return dict(sorted(results.items(), key = lambda item: item[1][key], reverse = key in DESCENDING))
+
+def print_best(results, key = 'avg'):
+    results = sort_results(results, key)
     words = list(results.keys())
     avgs = list(results.values())
     print(f'THE BEST STARTING WORD IS {words[0]}: {avgs[0]}')
 
-dictionary = Dictionary()
-
-words = []
-avg = []
-best = []
-best_word = []
-worst = []
-worst_word = []
-total_answer_count = len(dictionary.answers)
-for index, starting_word in enumerate(dictionary.guesses):
-    after_guess_count = 0
-    starting_count = 0
-    words.append(starting_word)
+def evaluate(starting_word, answers, columns, matrix):
+    """
+    Scores one starting word by partitioning the answers with its row of feedback patterns.
+    Every answer in a bucket leaves the whole bucket as possible answers, so nothing has to be solved.
+        avg: average fraction of answers remaining after the guess
+        best/worst: smallest/largest fraction remaining, with the first answer (by score) that gets it
+        expected: expected number of answers remaining
+        entropy: information gained by the guess, in bits
+        largest: size of the largest bucket
+    The avg/best/worst metrics skip the starting word itself as an answer
+    """
+    total_answer_count = len(answers)
+    row = matrix.row(starting_word)
+    counts = bucket_counts(row)
+    expected, entropy, largest = partition_stats(counts)
 
-    this_avg = 0
-    this_best = total_answer_count
-    this_best_word = None
-    this_worst = 0
-    this_worst_word = None
-    for answer in dictionary.answers:
-        if starting_word == answer:
-            continue
-        # Guess the word
-        solver = Solver(answer)
-        solver.puzzle.add_guess(starting_word)
-        solver._process_guess(starting_word)
-        _ = solver.puzzle.next_guess()
+    # Each answer leaves its bucket, so the remaining counts add up to the sum of squared bucket sizes
+    sizes = dict(counts)
+    evaluated = total_answer_count
+    after_guess_count = sum(count * count for count in counts.values())
+    if starting_word in columns:
+        # The starting word is alone in the all green bucket
+        del sizes[solved(len(starting_word))]
+        evaluated -= 1
+        after_guess_count -= 1
 
-        starting_count += total_answer_count # should be 2315
-        after_guess_count += solver.answer_count()
-        partition_amount = solver.answer_count() / total_answer_count
+    # Nothing is left when the starting word is the only answer
+    best_count = min(sizes.values(), default = 0)
+    worst_count = max(sizes.values(), default = 0)
+    best_word = None
+    worst_word = None
+    for answer in answers:
+        size = sizes.get(row[columns[answer]]) if answer != starting_word else None
+        if best_word is None and size == best_count:
+            best_word = answer
+        if worst_word is None and size == worst_count:
+            worst_word = answer
+        if best_word is not None and worst_word is not None:
+            break
 
-        this_avg = after_guess_count / starting_count
+    return {
+        'avg': after_guess_count / (evaluated * total_answer_count) if evaluated > 0 else 0,
+        'best': best_count / total_answer_count,
+        'best_word': best_word,
+        'worst': worst_count / total_answer_count,
+        'worst_word': worst_word,
+        'expected': expected,
+        'entropy': entropy,
+        'largest': largest,
+    }
 
-        if partition_amount < this_best:
-            this_best = partition_amount
-            this_best_word = answer
-        if partition_amount > this_worst:
-            this_worst = partition_amount
-            this_worst_word = answer
+def format_result(starting_word, result):
+    return ','.join([starting_word] + [str(result[column]) for column in COLUMNS])
 
-#        print(f'{starting_word},{answer},{solver.answer_count()},{solver.answer_count() / total_answer_count}')
+parser = argparse.ArgumentParser(description='Score every guess as a starting word')
+parser.add_argument('-s', '--sort', action="store", dest="sort", choices=['avg', 'worst', 'expected', 'entropy', 'largest'], help="Print starting words ranked by this metric")
 
-    avg.append(this_avg)
-    best.append(this_best)
-    best_word.append(this_best_word)
-    worst.append(this_worst)
-    worst_word.append(this_worst_word)
-    print(f'{starting_word},{this_avg},{this_best},{this_best_word},{this_worst},{this_worst_word}')
+if __name__ == '__main__':
+    args = parser.parse_args()
+    dictionary = Dictionary()
+    matrix = pattern_matrix()
+    if not matrix.is_cached():
+        # Every row is needed, so write them all to the cache for next time
+        matrix.build()
+    answers = dictionary.answers
+    columns = dict((answer, matrix.column(answer)) for answer in answers)
 
+    results = dict()
+    for starting_word in dictionary.guesses:
+        result = evaluate(starting_word, answers, columns, matrix)
+        if args.sort:
+            results[starting_word] = result
+        else:
+            print(format_result(starting_word, result))
 
+    if args.sort:
+        for starting_word, result in sort_results(results, args.sort).items():
+            print(format_result(starting_word, result))
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Works out the day's answer from the result grids players share (rows of 🟩🟨⬛ without the words).
+
+A row of a grid is the pattern some guess got against the answer, so an answer is only consistent
+with a grid if, for every row short of the all green one, at least one allowed guess gives that
+pattern against it. ReverseIndex counts, for every answer and pattern, the guesses that give it
+(from the pattern matrix of the lists Dictionary loads), and lists those guesses on demand.
+
+Every row is evidence. Over all grids, an answer is ranked by how many rows no guess could have
+given against it (contradictions, 0 for the real answer unless some grids are from another day or
+mistyped), then by how likely the rows are if players picked their guesses uniformly: a row with a
+pattern few guesses give against an answer is unlikely for that answer. Both only need a count of
+how often each pattern appears in the rows, so any number of grids takes the same memory.
+
+Grids are read from a stream in batches: a grid is a run of pattern lines, and anything else (the
+"Wordle 1,234 4/6" header, a blank line, a name) ends it. With jobs > 1 batches are counted in
+worker processes.
+"""
+import array
+import collections
+import functools
+import itertools
+import math
+import os
+import struct
+import sys
+
+from patterns import CACHE_DIRECTORY
+from patterns import GRAY, GREEN, YELLOW
+from patterns import encode
+from patterns import decode
+from patterns import solved
+from wordle_solver import WordIndex
+from wordle_solver import pattern_matrix
+
+# Squares in shared grids, including the high contrast colors
+SQUARES = {'🟩': GREEN, '🟧': GREEN, '🟨': YELLOW, '🟦': YELLOW, '⬛': GRAY, '⬜': GRAY}
+
+REVERSE_VERSION = 1
+REVERSE_MAGIC = b'WREV'
+# magic, version, word length, answers, patterns digest
+REVERSE_HEADER = struct.Struct('<4sHBI32s')
+
+BATCH_SIZE = 10000
+
+def parse_row(line, length = 5):
+    """
+    Returns the pattern for a line of squares, or None if it isn't one
+    """
+    squares = line.strip()
+    if len(squares) != length or any(square not in SQUARES for square in squares):
+        return None
+    return encode([SQUARES[square] for square in squares])
+
+def to_squares(code, length = 5):
+    """
+    Returns a pattern as a row of a shared grid
+    """
+    return ''.join('⬛🟨🟩'[digit] for digit in decode(code, length))
+
+def read_grids(lines, length = 5):
+    """
+    Yields each grid in lines as a tuple of patterns
+    """
+    grid = []
+    for line in lines:
+        code = parse_row(line, length)
+        if code is not None:
+            grid.append(code)
+        elif len(grid) > 0:
+            yield tuple(grid)
+            grid = []
+    if len(grid) > 0:
+        yield tuple(grid)
+
+def batches(grids, size = BATCH_SIZE):
+    """
+    Yields lists of at most size grids, so only one batch is held at a time
+    """
+    grids = iter(grids)
+    while True:
+        batch = list(itertools.islice(grids, size))
+        if len(batch) == 0:
+            return
+        yield batch
+
+class ReverseIndex:
+    """
+    For every answer and pattern, how many guesses give that pattern. counts is indexed by
+    answer column * 3^length + pattern, and possible[pattern] has a bit for each answer column
+    that pattern is possible for.
+    """
+    def __init__(self, matrix = None, cache_directory = CACHE_DIRECTORY):
+        self.matrix = matrix if matrix is not None else pattern_matrix()
+        self.answers = self.matrix.answers
+        self.length = self.matrix.length
+        self.size = 3**self.length
+        self.path = None
+        self.counts = None
+        if cache_directory is not None:
+            self.path = os.path.join(cache_directory, f'reverse-v{REVERSE_VERSION}-{self.matrix.digest.hex()[0:16]}.bin')
+            self.counts = self._read()
+        if self.counts is None:
+            self.counts = self._count()
+            if self.path is not None:
+                self._write()
+        self.possible = [0] * self.size
+        for column in range(0, len(self.answers)):
+            bit = 1 << column
+            offset = column * self.size
+            for code in range(0, self.size):
+                if self.counts[offset + code] > 0:
+                    self.possible[code] |= bit
+        self.consistent = functools.lru_cache(maxsize = 65536)(self._consistent)
+
+    def _count(self):
+        counts = array.array('I', bytes(4 * len(self.answers) * self.size))
+        for column, answer in enumerate(self.answers):
+            offset = column * self.size
+            for code, count in collections.Counter(self.matrix.column_patterns(answer)).items():
+                counts[offset + code] = count
+        return counts
+
+    def _read(self):
+        """
+        The counts from the cache file, None if there isn't one for these word lists
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as f:
+            header = f.read(REVERSE_HEADER.size)
+            expected = (REVERSE_MAGIC, REVERSE_VERSION, self.length, len(self.answers), self.matrix.digest)
+            if len(header) != REVERSE_HEADER.size or REVERSE_HEADER.unpack(header) != expected:
+                return None
+            counts = array.array('I')
+            try:
+                counts.fromfile(f, len(self.answers) * self.size)
+            except EOFError:
+                return None
+        if sys.byteorder != 'little':
+            counts.byteswap()
+        return counts
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok = True)
+        counts = self.counts
+        if sys.byteorder != 'little':
+            counts = array.array('I', counts)
+            counts.byteswap()
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(REVERSE_HEADER.pack(REVERSE_MAGIC, REVERSE_VERSION, self.length, len(self.answers), self.matrix.digest))
+            counts.tofile(f)
+        os.replace(temporary, self.path)
+
+    def count(self, answer, code):
+        return self.counts[self.matrix.column(answer) * self.size + code]
+
+    def guesses(self, answer, code):
+        """
+        Returns every guess that gets the pattern code against answer, highest scoring first
+        """
+        patterns = self.matrix.column_patterns(answer)
+        words = [self.matrix.guesses[row] for row, found in enumerate(patterns) if found == code]
+        ids = WordIndex.shared().guess_ids
+        return sorted(words, key = lambda word: ids.get(word, len(ids)))
+
+    def _consistent(self, grid):
+        """
+        Bits of the answer columns every row of grid is possible for
+        """
+        bits = (1 << len(self.answers)) - 1
+        finished = solved(self.length)
+        for code in grid:
+            if code != finished:
+                bits &= self.possible[code]
+        return bits
+
+    def answers_for(self, grid):
+        """
+        Returns the answers consistent with grid
+        """
+        bits = self.consistent(grid)
+        return [answer for column, answer in enumerate(self.answers) if bits >> column & 1]
+
+class Tally:
+    """
+    What the grids seen so far add up to: how often each pattern was a row, not counting the
+    solved rows, and how many grids were solved or fit no answer at all
+    """
+    def __init__(self, length = 5):
+        self.length = length
+        self.rows = [0] * 3**length
+        self.grids = 0
+        self.solved = 0
+        self.impossible = 0
+
+    def add(self, grid, index):
+        finished = solved(self.length)
+        self.grids += 1
+        if grid[-1] == finished:
+            self.solved += 1
+        for code in grid:
+            if code != finished:
+                self.rows[code] += 1
+        if index.consistent(grid) == 0:
+            self.impossible += 1
+
+    def merge(self, other):
+        self.rows = [mine + theirs for mine, theirs in zip(self.rows, other.rows)]
+        self.grids += other.grids
+        self.solved += other.solved
+        self.impossible += other.impossible
+
+    def ranked(self, index, top = None):
+        """
+        Returns (answer, contradictions, log likelihood) for the answers, most likely first
+        """
+        guesses = len(index.matrix.guesses)
+        seen = [(code, rows) for code, rows in enumerate(self.rows) if rows > 0]
+        scores = []
+        for column, answer in enumerate(index.answers):
+            offset = column * index.size
+            contradictions = 0
+            likelihood = 0.0
+            for code, rows in seen:
+                count = index.counts[offset + code]
+                if count == 0:
+                    contradictions += rows
+                else:
+                    likelihood += rows * math.log(count / guesses)
+            scores.append((answer, contradictions, likelihood))
+        scores.sort(key = lambda score: (score[1], -score[2]))
+        return scores[0:top] if top is not None else scores
+
+def _tally(batch):
+    index = reverse_index()
+    tally = Tally(index.length)
+    for grid in batch:
+        tally.add(grid, index)
+    return tally
+
+@functools.lru_cache(maxsize = None)
+def reverse_index():
+    """
+    The process-wide ReverseIndex for the lists Dictionary loads
+    """
+    return ReverseIndex()
+
+def infer(grids, jobs = 1, batch_size = BATCH_SIZE):
+    """
+    Counts grids (any iterable, read one batch at a time) and returns the Tally
+    """
+    index = reverse_index()
+    tally = Tally(index.length)
+    if jobs <= 1:
+        for batch in batches(grids, batch_size):
+            tally.merge(_tally(batch))
+        return tally
+    import multiprocessing
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    pending = batches(grids, batch_size)
+    with context.Pool(jobs) as pool:
+        while True:
+            # The pool would read every batch ahead, so it gets a few at a time
+            window = list(itertools.islice(pending, jobs * 2))
+            if len(window) == 0:
+                break
+            for counted in pool.imap_unordered(_tally, window):
+                tally.merge(counted)
+    return tally
+
+if __name__ == '__main__':
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Infer the answer from players' shared result grids")
+    parser.add_argument('-i', '--input', action="store", dest="input", help="File of grids, stdin by default")
+    parser.add_argument('-n', '--top', action="store", dest="top", type=int, default=10, help="How many of the likeliest answers to print")
+    parser.add_argument('-a', '--answer', action="store", dest="answer", help="Instead, print each grid's likeliest guesses for this answer")
+    parser.add_argument('-g', '--guesses', action="store", dest="guesses", type=int, default=3, help="Guesses printed for each row with --answer")
+    parser.add_argument('-b', '--batch-size', action="store", dest="batch_size", type=int, default=BATCH_SIZE, help="Grids read at a time")
+    parser.add_argument('-j', '--jobs', action="store", dest="jobs", type=int, default=1, help="Count batches across this many processes (0 for one per core)")
+    args = parser.parse_args()
+
+    start = time.time()
+    stream = open(args.input, 'r', encoding = 'utf-8') if args.input else sys.stdin
+    index = reverse_index()
+    grids = read_grids(stream, index.length)
+    if args.answer:
+        answer = args.answer.upper()
+        if answer not in index.answer_set:
+            parser.error(f'{answer} is not an answer')
+        for grid in grids:
+            rows = []
+            for code in grid:
+                guesses = index.guesses(answer, code)
+                rows.append(f'{to_squares(code, index.length)} {" ".join(guesses[0:args.guesses]) if guesses else "-"}')
+            print(' | '.join(rows))
+        sys.exit(0)
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+    tally = infer(grids, jobs, args.batch_size)
+    print(f'{"answer":<6}  {"contradictions":>14}  {"log likelihood":>14}')
+    for answer, contradictions, likelihood in tally.ranked(index, args.top):
+        print(f'{answer:<6}  {contradictions:>14}  {likelihood:>14.1f}')
+    print(f'{tally.grids} grids ({tally.solved} solved, {tally.impossible} fit no answer) in {round(time.time() - start, 1)}s', file = sys.stderr)
@@ -0,0 +1,114 @@
+"""
+A memo of chosen guesses shared by every game in a process.
+
+Games that open with the same word keep running into the same states: every answer that gives
+SLATE the same feedback leaves the same candidates, and so gets the same next guess. The Dictionary
+works out a key for its state (see Dictionary._state_key) from the feedback and the words guessed,
+which decide the candidates left, and adds its options (including its policy.Policy), which decide
+the guess chosen from them, so a hit skips pruning the answers as well as picking the guess. The
+candidates and the intersecting word for a state are kept under the state alone too, so games with
+other options or policies reuse them.
+
+Entries are kept least recently used first and the oldest are evicted past max_entries. The cache
+can be saved to a JSON file and loaded by a later run; keys include a digest of the word lists so
+entries from other dictionaries never match.
+"""
+import collections
+import json
+import os
+
+# Bumped whenever Dictionary changes how its keys are made, so old files aren't loaded
+CACHE_VERSION = 2
+
+class GuessCache:
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the process-wide GuessCache, created on first use
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @classmethod
+    def set_shared(cls, cache):
+        cls._shared = cache
+
+    def __init__(self, max_entries = 65536, store_answers = True):
+        """
+        max_entries: how many states are remembered
+        store_answers: if True the pruned answers are kept too, otherwise a hit still prunes them
+        """
+        self.max_entries = max_entries
+        self.store_answers = store_answers
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Returns (guess, answers) for key, answers being None unless they are stored, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, guess, answers = None):
+        self.entries[key] = (guess, tuple(answers) if self.store_answers and answers is not None else None)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last = False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0,
+        }
+
+    def __str__(self):
+        stats = self.stats()
+        return f'Guess cache: {stats["entries"]} entries, {stats["hits"]} hits, {stats["misses"]} misses ({stats["hit_rate"]:.1%} hit rate), {stats["evictions"]} evictions'
+
+    def save(self, path):
+        """
+        Writes the entries, oldest first, to path. The file is replaced in one step.
+        """
+        data = {'version': CACHE_VERSION, 'entries': [[key, guess, list(answers) if answers is not None else None] for key, (guess, answers) in self.entries.items()]}
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(data, file)
+        os.replace(temporary, path)
+
+    def load(self, path):
+        """
+        Adds the entries saved in path, returns how many. A missing file or one from another
+        version of the cache loads nothing.
+        """
+        try:
+            with open(path, 'r') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return 0
+        if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+            return 0
+        for key, guess, answers in data['entries']:
+            self.put(key, guess, answers)
+        return len(data['entries'])
+
+    def __len__(self):
+        return len(self.entries)
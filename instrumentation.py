@@ -0,0 +1,69 @@
+"""
+Cheap timers and counters for the solver's hot paths.
+
+Profiling is off unless WORDLE_PROFILE=1 is set, which is read once at import (STATS.enabled can also be
+switched on before solving). The solver checks STATS.enabled before it reads the clock or counts
+anything, so a normal run only pays for that attribute lookup.
+
+Phases recorded:
+    filter: pruning answers with new feedback, scanned is answers before and kept is answers after
+    intersecting: searching for an intersecting word, scanned is guesses considered
+    next_guess: choosing a guess, including any filtering and searching
+Counts are per process, so with worker processes only the parent's work is counted.
+"""
+import collections
+import os
+import time
+
+clock = time.perf_counter
+
+def env_flag(name):
+    """
+    True if the environment variable is set to 1
+    """
+    value = os.getenv(name)
+    try:
+        return value is not None and int(value) == 1
+    except ValueError:
+        return False
+
+class Stats:
+    def __init__(self, enabled = False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        self.seconds = collections.Counter()
+        self.calls = collections.Counter()
+        self.scanned = collections.Counter()
+        self.kept = collections.Counter()
+
+    def record(self, phase, seconds, scanned = 0, kept = 0):
+        self.seconds[phase] += seconds
+        self.calls[phase] += 1
+        self.scanned[phase] += scanned
+        self.kept[phase] += kept
+
+    def summary(self):
+        """
+        Returns {phase: {seconds, calls, scanned, kept}}
+        """
+        return dict((phase, {
+            'seconds': self.seconds[phase],
+            'calls': self.calls[phase],
+            'scanned': self.scanned[phase],
+            'kept': self.kept[phase],
+        }) for phase in self.calls.keys())
+
+    def __str__(self):
+        lines = []
+        for phase, totals in self.summary().items():
+            line = f'{phase.ljust(14)} {totals["calls"]:8} calls {totals["seconds"]:9.3f}s'
+            if totals['scanned'] > 0:
+                line += f' {totals["scanned"]:12} scanned'
+            if totals['kept'] > 0:
+                line += f' {totals["kept"]:10} kept'
+            lines.append(line)
+        return '\n'.join(lines)
+
+STATS = Stats(env_flag('WORDLE_PROFILE'))
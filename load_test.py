@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Load generator for solver_service.py.
+
+Each client keeps one connection open and plays whole games against answers from the answer list:
+create a game, send every guess with its feedback, ask for the next guess and the answer count, then
+delete the game. Reports requests/sec and the p50/p99 latency of each request.
+"""
+import asyncio
+import json
+import statistics
+import time
+
+from patterns import pattern
+from patterns import to_input
+from wordle_solver import WordIndex
+
+MAX_TURNS = 20
+
+def feedback(word, answer):
+    """
+    Returns (in_place, out_of_place) for Solver.guess, as a player would type them
+    """
+    return to_input(word, pattern(word, answer))
+
+class Client:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.latencies = []
+        self.errors = 0
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def request(self, method, path, payload = None):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        head = f'{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n'
+        start = time.perf_counter()
+        self.writer.write(head.encode('latin-1') + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        data = json.loads(await self.reader.readexactly(length)) if length > 0 else None
+        self.latencies.append(time.perf_counter() - start)
+        if status != 200:
+            self.errors += 1
+        return status, data
+
+    async def play(self, answer, starting_word):
+        """
+        Plays one game, returns the number of guesses or None if the service gave up
+        """
+        status, data = await self.request('POST', '/games', {})
+        id = data['id']
+        word = starting_word
+        turns = 0
+        while turns < MAX_TURNS:
+            turns += 1
+            in_place, out_of_place = feedback(word, answer)
+            await self.request('POST', f'/games/{id}/guess', {'word': word, 'in_place': in_place, 'out_of_place': out_of_place})
+            if word == answer:
+                break
+            status, data = await self.request('GET', f'/games/{id}/next_guess')
+            if status != 200:
+                turns = None
+                break
+            word = data['guess']
+            await self.request('GET', f'/games/{id}/answer_count')
+        await self.request('DELETE', f'/games/{id}')
+        return turns
+
+async def run(host, port, answers, clients, starting_word):
+    queue = asyncio.Queue()
+    for answer in answers:
+        queue.put_nowait(answer)
+    results = []
+
+    async def worker(client):
+        await client.connect()
+        try:
+            while not queue.empty():
+                results.append(await client.play(queue.get_nowait(), starting_word))
+        finally:
+            await client.close()
+
+    pool = [Client(host, port) for _ in range(0, clients)]
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(client) for client in pool])
+    elapsed = time.perf_counter() - start
+    latencies = [latency for client in pool for latency in client.latencies]
+    return {
+        'games': len(results),
+        'failed_games': sum(1 for turns in results if turns is None),
+        'requests': len(latencies),
+        'errors': sum(client.errors for client in pool),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+def percentile(values, p):
+    if len(values) < 2:
+        return values[0] if values else 0
+    return statistics.quantiles(values, n = 100, method = 'inclusive')[p - 1]
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Measure solver_service.py latency and throughput')
+    parser.add_argument('--host', action="store", dest="host", default="127.0.0.1", help="Service address")
+    parser.add_argument('-p', '--port', action="store", dest="port", type=int, default=8080, help="Service port")
+    parser.add_argument('-c', '--clients', action="store", dest="clients", type=int, default=16, help="Concurrent connections")
+    parser.add_argument('-g', '--games', action="store", dest="games", type=int, default=200, help="Games to play, spread over the answer list")
+    parser.add_argument('-w', '--word', action="store", dest="word", default="SLATE", help="Starting word")
+    args = parser.parse_args()
+
+    answers = WordIndex.shared().answers
+    step = max(1, len(answers) // args.games)
+    report = asyncio.run(run(args.host, args.port, answers[::step][0:args.games], args.clients, args.word.upper()))
+    print(f'{report["games"]} games ({report["failed_games"]} failed), {report["requests"]} requests ({report["errors"]} errors) in {round(report["seconds"], 2)}s')
+    print(f'{round(report["requests_per_second"])} requests/sec, p50 {report["p50_ms"]:.2f}ms, p99 {report["p99_ms"]:.2f}ms')
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Several boards at once, like Quordle (4) and Octordle (8).
+
+Every guess is played on all unsolved boards, so rather than each board picking its own guess,
+MultiSolver scores guesses jointly: a guess is only as good as the sum of how well it splits the
+candidates of every board. All boards' candidates are laid out as one list of pattern matrix columns,
+each tagged with its board, so counting a guess's partitions for every board is a single pass over
+its row (see _partition_counts).
+
+Feedback follows real Wordle rules (patterns.pattern).
+"""
+import collections
+import math
+import random
+import time
+
+from patterns import solved
+from strategies import rank_guesses
+from wordle_solver import UnsupportedAnswer
+from wordle_solver import WordIndex
+from wordle_solver import pattern_matrix
+
+# How a guess is scored across boards, lower is better
+#  expected: total expected number of candidates left
+#  entropy: total information gained (negated)
+SCORING = ('expected', 'entropy')
+
+class Board:
+    def __init__(self, candidates, target = None):
+        self.candidates = list(candidates)
+        self.target = target
+        # Number of guesses it took to solve, None until then
+        self.solved_at = None
+
+    def is_solved(self):
+        return self.solved_at is not None
+
+class MultiSolution:
+    def __init__(self, guesses, boards):
+        self.guesses = guesses
+        self.guess_count = len(guesses)
+        self.words = [board.target for board in boards]
+        self.solved_at = [board.solved_at for board in boards]
+
+class MultiSolver:
+    def __init__(self, targets = None, boards = None, scoring = 'expected', top_k = 100):
+        """
+        targets: the answer on each board, or None to play interactively with feedback
+        boards: number of boards when there are no targets
+        scoring: one of SCORING
+        top_k: how many guesses (ranked by strategies.rank_guesses) get their partitions counted
+        """
+        if scoring not in SCORING:
+            raise ValueError(f'Unknown scoring {scoring}, expected one of {SCORING}')
+        self.index = WordIndex.shared()
+        self.matrix = pattern_matrix()
+        self.scoring = scoring
+        self.top_k = top_k
+        if targets is not None:
+            targets = [target.upper() for target in targets]
+            for target in targets:
+                if target not in self.index.answer_set:
+                    raise UnsupportedAnswer()
+        else:
+            targets = [None] * boards
+        self.boards = [Board(self.index.answers, target) for target in targets]
+        self.guesses = list()
+        # Counters for the last choice
+        self.evaluated = 0
+
+    def unsolved(self):
+        return [board for board in self.boards if not board.is_solved()]
+
+    def is_solved(self):
+        return all(board.is_solved() for board in self.boards)
+
+    def feedback(self, word, codes):
+        """
+        Registers a guess with the pattern it got on each board (None or anything for solved boards)
+        """
+        word = word.upper()
+        self.guesses.append(word)
+        green = solved(len(word))
+        for board, code in zip(self.boards, codes):
+            if board.is_solved():
+                continue
+            if code == green:
+                board.solved_at = len(self.guesses)
+                board.candidates = [word]
+            else:
+                board.candidates = self.matrix.filter(word, code, board.candidates)
+
+    def play(self, word):
+        """
+        Plays word against the targets
+        """
+        word = word.upper()
+        codes = [self.matrix.get(word, board.target) if not board.is_solved() else None for board in self.boards]
+        self.feedback(word, codes)
+
+    def _partition_counts(self, guess, columns, boards):
+        """
+        Counts the candidates of every board by the pattern guess gives them, in one pass.
+        columns and boards line up: the matrix column of each candidate and the board it is on.
+        Returns a Counter keyed by board * 3^length + pattern.
+        """
+        row = self.matrix.row(guess)
+        return collections.Counter(map(int.__add__, boards, map(row.__getitem__, columns)))
+
+    def _score(self, counts, totals, base):
+        score = 0
+        if self.scoring == 'expected':
+            for key, count in counts.items():
+                score += count * count / totals[key // base]
+        else:
+            for key, count in counts.items():
+                total = totals[key // base]
+                score += count * math.log2(count / total) / total
+        return score
+
+    def next_guess(self):
+        """
+        Returns the guess with the best joint score over all unsolved boards
+        """
+        boards = self.unsolved()
+        # A board with a single candidate has to be played sooner or later, and it can still split the others
+        for board in boards:
+            if len(board.candidates) == 1:
+                return board.candidates[0]
+
+        base = 3**self.index.length
+        columns = []
+        tags = []
+        totals = []
+        candidates = dict()
+        for number, board in enumerate(boards):
+            totals.append(len(board.candidates))
+            for word in board.candidates:
+                columns.append(self.matrix.column(word))
+                tags.append(number * base)
+                candidates[word] = True
+
+        ranked = rank_guesses(list(candidates.keys()), self.index.guesses)[0:self.top_k]
+        already = set(ranked)
+        ranked += [word for word in candidates.keys() if word not in already][0:self.top_k]
+
+        best = None
+        best_key = None
+        self.evaluated = 0
+        for guess in ranked:
+            counts = self._partition_counts(guess, columns, tags)
+            # Ties go to guesses which could solve a board
+            key = (self._score(counts, totals, base), guess not in candidates)
+            self.evaluated += 1
+            if best_key is None or key < best_key:
+                best = guess
+                best_key = key
+        return best
+
+    def solve(self, starting_word = "SLATE", max_guesses = 50):
+        guess = starting_word if starting_word else self.next_guess()
+        while not self.is_solved() and len(self.guesses) < max_guesses:
+            self.play(guess)
+            if not self.is_solved():
+                guess = self.next_guess()
+        return MultiSolution(self.guesses, self.boards)
+
+def evaluate(boards = 4, games = 100, seed = 0, starting_word = "SLATE", **options):
+    """
+    Solves games random tuples of distinct answers, yielding a MultiSolution for each
+    """
+    answers = list(WordIndex.shared().answers)
+    generator = random.Random(seed)
+    for _ in range(0, games):
+        yield MultiSolver(generator.sample(answers, boards), **options).solve(starting_word)
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Solve several boards at once (Quordle, Octordle)')
+    parser.add_argument('-b', '--boards', action="store", dest="boards", type=int, default=4, help="Boards per game")
+    parser.add_argument('-n', '--games', action="store", dest="games", type=int, default=100, help="Number of random games")
+    parser.add_argument('-s', '--seed', action="store", dest="seed", type=int, default=0, help="Seed for picking answers")
+    parser.add_argument('-w', '--word', action="store", dest="word", default="SLATE", help="Starting word")
+    parser.add_argument('-sc', '--scoring', action="store", dest="scoring", default="expected", choices=SCORING, help="How guesses are scored across boards")
+    parser.add_argument('-k', '--top-k', action="store", dest="top_k", type=int, default=100, help="Guesses evaluated per turn")
+    args = parser.parse_args()
+
+    # A game is lost when it needs more guesses than boards + 5 (9 for Quordle, 13 for Octordle)
+    limit = args.boards + 5
+    start = time.perf_counter()
+    count = 0
+    guess_count = 0
+    lost = 0
+    histogram = collections.Counter()
+    for solution in evaluate(args.boards, args.games, args.seed, args.word.upper(), scoring = args.scoring, top_k = args.top_k):
+        count += 1
+        guess_count += solution.guess_count
+        histogram[solution.guess_count] += 1
+        if solution.guess_count > limit:
+            lost += 1
+        print(f'{round(guess_count / count, 4)} {",".join(solution.words)}({solution.guess_count}): {", ".join(solution.guesses)}')
+    elapsed = time.perf_counter() - start
+    for guesses, games in sorted(histogram.items()):
+        print(f'{guesses}: {games}')
+    print(f'Games: {count}, Average guesses: {round(guess_count / count, 4)}, Lost (over {limit}): {lost}')
+    print(f'Solved in {round(elapsed, 2)}s ({round(count / elapsed, 1)} games/sec)')
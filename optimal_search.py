@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Searches for the decision tree with the fewest total guesses for a starting word.
+
+Solver picks guesses greedily. This instead finds, for every set of answers reachable from the
+starting word, the guess minimizing the total number of guesses needed to solve all of them,
+looking as deep as it takes. Feedback follows real Wordle rules (the pattern matrix).
+
+The cost of a set of n answers is at least 2n - 1: at best one of them is guessed right away and
+every other one is solved by the next guess. A guess splits the set into buckets by pattern, so
+its cost is at least n + (2b - 1) for each bucket of b answers it doesn't solve. Guesses are tried
+in order of that bound and the search stops as soon as the bound can't beat the best guess found;
+buckets are searched with what is left of the budget, and give up (fail high) when they can't fit.
+Every set searched is kept in a transposition table, either with its cost and guess or, if it
+gave up, the budget it couldn't fit in as a lower bound.
+
+Only the top_k guesses (by strategies.rank_guesses) and the top_k answers are tried for each set,
+so the result is near optimal rather than exact; top_k = None tries every guess in the pool. Each
+first level bucket is searched on its own, so with jobs > 1 they are spread over processes.
+The result is a DecisionTree (exact feedback) that TreeSolver replays, see decision_tree.py.
+"""
+import functools
+import time
+
+from decision_tree import DecisionTree
+from decision_tree import Node
+from patterns import solved
+from strategies import rank_guesses
+from wordle_solver import WordIndex
+from wordle_solver import pattern_matrix
+
+def lower_bound(size):
+    """
+    Fewest total guesses that could solve size answers
+    """
+    return 2 * size - 1
+
+class Search:
+    def __init__(self, top_k = 20, pool_size = 1000):
+        """
+        top_k: how many guesses and answers are tried for each set, None for every guess in the pool
+        pool_size: how many guesses (ranked for a first level bucket) the guesses tried come from
+        """
+        self.top_k = top_k
+        self.pool_size = pool_size
+        self.index = WordIndex.shared()
+        self.matrix = pattern_matrix()
+        # Matrix columns, so sets of answers are tuples of small ints
+        self.words = list(self.index.answer_words)
+        self.solved = solved(self.index.length)
+        self.pool = self.index.guesses
+        # Key is a tuple of columns, value is (cost, guess) or (lower bound, None)
+        self.table = dict()
+        self.nodes = 0
+        self.table_hits = 0
+
+    def columns(self, words):
+        return tuple(sorted(self.matrix.column(word) for word in words))
+
+    def partition(self, guess, answers):
+        """
+        Returns the answers guess doesn't solve, split into tuples by pattern
+        """
+        row = self.matrix.row(guess)
+        buckets = dict()
+        for column in answers:
+            code = row[column]
+            bucket = buckets.get(code)
+            if bucket is None:
+                buckets[code] = [column]
+            else:
+                bucket.append(column)
+        buckets.pop(self.solved, None)
+        return [tuple(bucket) for bucket in buckets.values()]
+
+    def candidates(self, answers):
+        """
+        Guesses worth trying for answers: the best ranked guesses from the pool and the answers themselves
+        """
+        words = [self.words[column] for column in answers]
+        ranked = rank_guesses(words, self.pool)
+        if self.top_k is None:
+            return ranked + words
+        return ranked[0:self.top_k] + words[0:self.top_k]
+
+    def cost(self, answers, limit = None):
+        """
+        Returns the fewest total guesses to solve answers (a sorted tuple of columns), or if that is
+        limit or more, some lower bound that is at least limit
+        """
+        size = len(answers)
+        if size <= 2:
+            return lower_bound(size)
+        if limit is None:
+            limit = size * size + 1
+        entry = self.table.get(answers)
+        if entry is not None and (entry[1] is not None or entry[0] >= limit):
+            self.table_hits += 1
+            return entry[0]
+        if lower_bound(size) >= limit:
+            return lower_bound(size)
+        self.nodes += 1
+
+        options = []
+        tried = set()
+        members = set(self.words[column] for column in answers)
+        for guess in self.candidates(answers):
+            if guess in tried:
+                continue
+            tried.add(guess)
+            buckets = self.partition(guess, answers)
+            # A guess that keeps every answer together gets nowhere
+            if len(buckets) == 1 and len(buckets[0]) == size:
+                continue
+            bound = size + sum(lower_bound(len(bucket)) for bucket in buckets)
+            # Largest buckets first, they are the likeliest to go over budget
+            buckets.sort(key = len, reverse = True)
+            options.append((bound, guess not in members, guess, buckets))
+        options.sort(key = lambda option: option[0:2])
+
+        best = limit
+        best_guess = None
+        for bound, _, guess, buckets in options:
+            if bound >= best:
+                break
+            total = bound
+            for bucket in buckets:
+                estimate = lower_bound(len(bucket))
+                total += self.cost(bucket, best - total + estimate) - estimate
+                if total >= best:
+                    break
+            else:
+                best = total
+                best_guess = guess
+        if best_guess is None:
+            self.table[answers] = (limit, None)
+            return limit
+        self.table[answers] = (best, best_guess)
+        return best
+
+    def guess(self, answers):
+        """
+        The best guess for answers, searching for it if need be
+        """
+        if len(answers) <= 2:
+            return self.words[answers[0]]
+        entry = self.table.get(answers)
+        if entry is None or entry[1] is None:
+            self.cost(answers)
+            entry = self.table[answers]
+        return entry[1]
+
+    def tree(self, answers):
+        """
+        Returns the Node for answers, with a child for each pattern its guess gets
+        """
+        node = Node(self.guess(answers))
+        row = self.matrix.row(node.guess)
+        for bucket in self.partition(node.guess, answers):
+            node.children[row[bucket[0]]] = self.tree(bucket)
+        return node
+
+def _search_bucket(bucket, options):
+    """
+    Searches one first level bucket in its own Search, returns (cost, encoded subtree, nodes)
+    """
+    search = Search(**options)
+    words = [search.words[column] for column in bucket]
+    search.pool = rank_guesses(words, search.index.guesses)[0:search.pool_size]
+    cost = search.cost(bucket)
+    tree = DecisionTree(search.tree(bucket), exact_feedback = True)
+    return cost, tree._encode(tree.root), search.nodes
+
+def search(starting_word = 'SLATE', jobs = 1, **options):
+    """
+    Returns (DecisionTree, total guesses over every answer, sets searched) for starting_word
+    options: top_k and pool_size for Search
+    """
+    search = Search(**options)
+    answers = search.columns(search.words)
+    row = search.matrix.row(starting_word)
+    buckets = search.partition(starting_word, answers)
+    solver = functools.partial(_search_bucket, options = options)
+    if jobs <= 1:
+        results = map(solver, buckets)
+    else:
+        import multiprocessing
+        WordIndex.shared().guess_letters
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        # Biggest buckets first so no worker is left with one at the end
+        order = sorted(range(0, len(buckets)), key = lambda i: len(buckets[i]), reverse = True)
+        with context.Pool(jobs) as pool:
+            unordered = dict(zip(order, pool.imap(solver, [buckets[i] for i in order])))
+        results = [unordered[i] for i in range(0, len(buckets))]
+
+    root = Node(starting_word)
+    total = len(answers)
+    nodes = 0
+    for bucket, (cost, encoded, searched) in zip(buckets, results):
+        root.children[row[bucket[0]]] = DecisionTree._decode(encoded)
+        total += cost
+        nodes += searched
+    return DecisionTree(root, exact_feedback = True), total, nodes
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    from decision_tree import TreeSolver
+    parser = argparse.ArgumentParser(description='Search for the decision tree with the fewest guesses for a starting word')
+    parser.add_argument('-w', '--word', action="store", dest="word", default="SLATE", help="Starting word")
+    parser.add_argument('-k', '--top-k', action="store", dest="top_k", type=int, default=20, help="Guesses and answers tried for each set of answers, 0 for every guess in the pool")
+    parser.add_argument('-P', '--pool-size', action="store", dest="pool_size", type=int, default=1000, help="Guesses the tried ones come from, per first level bucket")
+    parser.add_argument('-j', '--jobs', action="store", dest="jobs", type=int, default=1, help="Search first level buckets across this many processes (0 for one per core)")
+    parser.add_argument('-o', '--output', action="store", dest="output", help="Tree file to write")
+    args = parser.parse_args()
+
+    start = time.time()
+    word = args.word.upper()
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+    tree, total, nodes = search(word, jobs, top_k = args.top_k if args.top_k > 0 else None, pool_size = args.pool_size)
+    elapsed = time.time() - start
+    output = args.output if args.output else f'optimal-{word}.json'
+    tree.save(output)
+
+    # Replay every answer to check the tree
+    answers = WordIndex.shared().answers
+    guesses = 0
+    for answer in answers:
+        solver = TreeSolver(tree)
+        guess = solver.next_guess()
+        while True:
+            solver.feedback(guess, tree.pattern(guess, answer))
+            if solver.is_solved():
+                break
+            guess = solver.next_guess()
+        guesses += len(solver.guesses())
+    print(f'Searched {nodes} sets in {round(elapsed, 1)}s: {word} averages {round(total / len(answers), 4)} guesses (replayed {round(guesses / len(answers), 4)}), depth {tree.root.depth()}')
+    print(f'Wrote {output}')
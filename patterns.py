@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Feedback patterns for every (guess, answer) pair.
+
+A pattern is the colouring Wordle gives a guess for a given answer, encoded as a
+base 3 number with one digit per position (position 0 is the least significant):
+    0 = gray, 1 = yellow, 2 = green
+For five letter words every pattern fits in a single byte (3^5 = 243), so a whole
+row of patterns for one guess against all answers is just a byte string.
+
+PatternMatrix holds those rows. Rows are computed lazily, and the full matrix can be
+written once to a versioned binary cache (keyed by a hash of the word lists) which is
+memory-mapped on later runs.
+"""
+import array
+import collections
+import hashlib
+import math
+import mmap
+import os
+import struct
+
+GRAY = 0
+YELLOW = 1
+GREEN = 2
+
+CACHE_VERSION = 1
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.wordle-cache')
+CACHE_MAGIC = b'WPAT'
+# magic, version, word length, item size, rows, columns, sha256 of the word lists
+CACHE_HEADER = struct.Struct('<4sHBBII32s')
+# Rows computed on the fly are kept up to about this many bytes, least recently used are dropped first
+ROW_CACHE_BYTES = 256 * 1024 * 1024
+
+def pattern(guess, answer):
+    """
+    Returns the pattern for guess against answer following real Wordle rules for duplicate letters:
+    greens are matched first, then remaining letters are marked yellow from left to right only
+    while the answer still has unmatched copies of that letter.
+    """
+    code = 0
+    weight = 1
+    remaining = dict()
+    for g, a in zip(guess, answer):
+        if g != a:
+            remaining[a] = remaining.get(a, 0) + 1
+    for g, a in zip(guess, answer):
+        if g == a:
+            code += GREEN * weight
+        elif remaining.get(g, 0) > 0:
+            remaining[g] -= 1
+            code += YELLOW * weight
+        weight *= 3
+    return code
+
+def presence_pattern(guess, answer):
+    """
+    Returns the pattern Solver._process_guess works from: a letter that is not green is yellow
+    whenever the answer contains it anywhere, with no special handling for duplicate letters
+    """
+    code = 0
+    weight = 1
+    for g, a in zip(guess, answer):
+        if g == a:
+            code += GREEN * weight
+        elif g in answer:
+            code += YELLOW * weight
+        weight *= 3
+    return code
+
+def solved(length):
+    """
+    Returns the all green pattern for words of length letters
+    """
+    return 3**length - 1
+
+def decode(code, length):
+    """
+    Returns a list of digits (GRAY, YELLOW, GREEN) for each position of a pattern
+    """
+    digits = []
+    for _ in range(0, length):
+        digits.append(code % 3)
+        code //= 3
+    return digits
+
+def to_string(code, length):
+    """
+    Returns a pattern as a string with one character per position: G for green, Y for yellow and - for gray
+    """
+    return ''.join('-YG'[digit] for digit in decode(code, length))
+
+def to_input(word, code):
+    """
+    Returns (in_place, out_of_place) the way a player types a pattern for word into the interactive solver
+    (Solver.guess): green letters in place like '__A__' and the yellow letters, e.g. 'S'
+    """
+    digits = decode(code, len(word))
+    in_place = ''.join(letter if digit == GREEN else '_' for letter, digit in zip(word, digits))
+    out_of_place = ''.join(letter for letter, digit in zip(word, digits) if digit == YELLOW)
+    return in_place, out_of_place
+
+def encode(digits):
+    """
+    Returns the pattern for a list of digits (GRAY, YELLOW, GREEN), one per position
+    """
+    code = 0
+    for digit in reversed(digits):
+        code = code * 3 + digit
+    return code
+
+def typecode(length):
+    """
+    Array typecode that can hold every pattern for words of length letters
+    """
+    return 'B' if 3**length <= 256 else 'H'
+
+def compute_row(guess, answers):
+    """
+    Returns an array of patterns for guess against every word in answers.
+    Guesses without repeated letters (most of them) take a fast path: a letter that is not
+    green is yellow exactly when the answer contains it.
+    """
+    length = len(guess)
+    row = array.array(typecode(length), [0]) * len(answers)
+    if len(set(guess)) < length:
+        for column, answer in enumerate(answers):
+            row[column] = pattern(guess, answer)
+        return row
+
+    weights = [(index, letter, 3**index) for index, letter in enumerate(guess)]
+    for column, answer in enumerate(answers):
+        code = 0
+        for index, letter, weight in weights:
+            if answer[index] == letter:
+                code += GREEN * weight
+            elif letter in answer:
+                code += weight
+        row[column] = code
+    return row
+
+def bucket_counts(row):
+    """
+    Returns a Counter of how many answers share each pattern in a row, i.e. the size of every
+    partition of the answers after that guess
+    """
+    return collections.Counter(row)
+
+def partition_stats(counts):
+    """
+    Returns (expected remaining answers, entropy in bits, largest bucket) for a Counter from bucket_counts
+    """
+    total = sum(counts.values())
+    if total == 0:
+        return (0, 0, 0)
+    expected = 0
+    entropy = 0
+    for count in counts.values():
+        expected += count * count
+        entropy -= count * math.log2(count / total)
+    return (expected / total, entropy / total, max(counts.values()))
+
+def words_digest(guesses, answers):
+    """
+    sha256 of both word lists, used to key the on-disk cache
+    """
+    digest = hashlib.sha256()
+    digest.update(f'v{CACHE_VERSION}\n'.encode())
+    digest.update('\n'.join(guesses).encode())
+    digest.update(b'\0')
+    digest.update('\n'.join(answers).encode())
+    return digest.digest()
+
+class PatternMatrix:
+    """
+    Patterns for every guess (rows) against every answer (columns).
+    Rows not present in the on-disk cache are computed on first use and kept in memory, up to
+    row_cache_bytes worth of them.
+    """
+    def __init__(self, guesses, answers, cache_directory = CACHE_DIRECTORY, row_cache_bytes = ROW_CACHE_BYTES):
+        self.guesses = list(guesses)
+        self.answers = list(answers)
+        self.length = len(self.answers[0]) if self.answers else 0
+        self.typecode = typecode(self.length)
+        self.itemsize = array.array(self.typecode).itemsize
+        self.digest = words_digest(self.guesses, self.answers)
+        self._row_of = dict((word, index) for index, word in enumerate(self.guesses))
+        self._column_of = dict((word, index) for index, word in enumerate(self.answers))
+        self._rows = collections.OrderedDict()
+        self.max_rows = max(1, row_cache_bytes // max(1, len(self.answers) * self.itemsize))
+        self._matrix = None
+        self.path = None
+        if cache_directory is not None:
+            self.path = os.path.join(cache_directory, f'patterns-v{CACHE_VERSION}-{self.digest.hex()[0:16]}.bin')
+            self._open()
+
+    def _open(self):
+        """
+        Memory-maps the cache file if it exists and its header matches these word lists
+        """
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        expected = (CACHE_MAGIC, CACHE_VERSION, self.length, self.itemsize, len(self.guesses), len(self.answers), self.digest)
+        if len(mapped) < CACHE_HEADER.size or CACHE_HEADER.unpack_from(mapped) != expected \
+                or len(mapped) != CACHE_HEADER.size + len(self.guesses) * len(self.answers) * self.itemsize:
+            mapped.close()
+            return False
+        self._matrix = memoryview(mapped)[CACHE_HEADER.size:].cast(self.typecode)
+        return True
+
+    def is_cached(self):
+        return self._matrix is not None
+
+    def row(self, guess):
+        """
+        Returns the patterns of guess against every answer, indexed like self.answers
+        """
+        index = self._row_of.get(guess)
+        if index is not None and self._matrix is not None:
+            width = len(self.answers)
+            return self._matrix[index * width:(index + 1) * width]
+        row = self._rows.get(guess)
+        if row is None:
+            row = compute_row(guess, self.answers)
+            self._rows[guess] = row
+            if len(self._rows) > self.max_rows:
+                self._rows.popitem(last = False)
+        else:
+            self._rows.move_to_end(guess)
+        return row
+
+    def get(self, guess, answer):
+        """
+        Returns the pattern for a single pair, computing it directly if answer is not a column
+        """
+        column = self._column_of.get(answer)
+        if column is None:
+            return pattern(guess, answer)
+        return self.row(guess)[column]
+
+    def column(self, answer):
+        return self._column_of[answer]
+
+    def column_patterns(self, answer):
+        """
+        Returns the patterns of every guess against answer, indexed like self.guesses. From the
+        cache file this is a strided view of the column, otherwise every row is looked up.
+        """
+        column = self._column_of[answer]
+        if self._matrix is not None:
+            return self._matrix[column::len(self.answers)]
+        return array.array(self.typecode, (self.row(guess)[column] for guess in self.guesses))
+
+    def filter(self, guess, code, candidates):
+        """
+        Returns the candidates (in order) which would have given code as feedback for guess
+        """
+        row = self.row(guess)
+        column_of = self._column_of
+        return [word for word in candidates if row[column_of[word]] == code]
+
+    def build(self):
+        """
+        Computes every row and writes the versioned cache file, then memory-maps it.
+        The file is written to a temporary name first so a partially written cache is never read.
+        """
+        if self.path is None:
+            raise ValueError('PatternMatrix has no cache directory')
+        os.makedirs(os.path.dirname(self.path), exist_ok = True)
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, self.length, self.itemsize,
+                len(self.guesses), len(self.answers), self.digest))
+            for guess in self.guesses:
+                row = self._rows.get(guess)
+                if row is None:
+                    row = compute_row(guess, self.answers)
+                f.write(row.tobytes())
+        os.replace(temporary, self.path)
+        self._rows.clear()
+        return self._open()
+
+if __name__ == '__main__':
+    import time
+    from wordle_solver import pattern_matrix
+    start = time.time()
+    matrix = pattern_matrix()
+    if matrix.is_cached():
+        print(f'Pattern cache already built: {matrix.path}')
+    else:
+        matrix.build()
+        print(f'Built {len(matrix.guesses)}x{len(matrix.answers)} pattern cache in {round(time.time() - start, 1)}s: {matrix.path}')
@@ -0,0 +1,86 @@
+"""
+The choices the heuristic solver makes that are worth tuning, in one place.
+
+starting_word: the first guess, used by Solver.solve unless it is given another one. None (or a
+word the lists don't have) lets the solver pick it
+intersecting_above, intersecting_below: an intersecting word is guessed while the number of answers
+left is between these two (exclusive), otherwise the top scoring answer is
+by_position: answers are ranked by how common their letters are in those positions (True), or in
+any position like the guesses are (False), which decides the top scoring answer
+
+Policy() is the solver's behavior from before these were settings. A policy can be given as
+comma separated name=value pairs or a JSON file of them, see Policy.parse.
+"""
+import json
+import os
+
+FIELDS = ('starting_word', 'intersecting_above', 'intersecting_below', 'by_position')
+
+def _boolean(value):
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ('1', 'true', 'yes'):
+        return True
+    if str(value).lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f'Expected true or false, got {value}')
+
+class Policy:
+    def __init__(self, starting_word = 'SLATE', intersecting_above = 2, intersecting_below = 50, by_position = True):
+        self.starting_word = starting_word.upper() if starting_word else None
+        self.intersecting_above = int(intersecting_above)
+        self.intersecting_below = int(intersecting_below)
+        self.by_position = _boolean(by_position)
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Returns the Policy for a JSON file or a string like 'intersecting_below=40,by_position=false',
+        anything not given keeps its default
+        """
+        if os.path.isfile(text):
+            with open(text, 'r') as f:
+                return cls.from_dict(json.load(f))
+        values = dict()
+        for pair in text.split(','):
+            if pair.strip() == '':
+                continue
+            name, _, value = pair.partition('=')
+            values[name.strip()] = value.strip()
+        return cls.from_dict(values)
+
+    @classmethod
+    def from_dict(cls, values):
+        unknown = set(values) - set(FIELDS)
+        if len(unknown) > 0:
+            raise ValueError(f'Unknown policy settings {", ".join(sorted(unknown))}, expected some of {", ".join(FIELDS)}')
+        return cls(**values)
+
+    def to_dict(self):
+        return dict((name, getattr(self, name)) for name in FIELDS)
+
+    def intersects(self, count):
+        """
+        Whether to guess an intersecting word with count answers left
+        """
+        return self.intersecting_above < count < self.intersecting_below
+
+    def key(self):
+        """
+        The settings that decide guesses after the first, for keys of the guess cache
+        """
+        return f'{self.intersecting_above}-{self.intersecting_below}-{int(self.by_position)}'
+
+    def __eq__(self, other):
+        return isinstance(other, Policy) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash(tuple(self.to_dict().values()))
+
+    def __str__(self):
+        return ','.join(f'{name}={value}' for name, value in self.to_dict().items())
+
+    def __repr__(self):
+        return f'Policy({self})'
+
+DEFAULT_POLICY = Policy()
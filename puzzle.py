@@ -1,10 +1,14 @@
+import os
+
 LETTER_COUNT = 26
 LETTER_A = 65
+ALL_LETTERS = (1<<LETTER_COUNT)-1
+ANSWER_DICTIONARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nyt-answers.txt')
 
 class Word:
     def __init__(self, word):
         self.word = word
-        positions = [0,0,0,0,0]
+        positions = [0]*len(word)
         for index, letter in enumerate(word):
             shift = ord(letter)-LETTER_A
             positions[index] = 1<<shift
@@ -19,17 +23,27 @@ class Puzzle:
 
         return word_arr
 
-    def __init__(self):
+    def __init__(self, positions = None, answers = None):
         """
-        positions: an array of 5 integers
-        -- each integer corresponds to all possible letters in that position of 5 letter words
+        positions: an array of integers, one per letter of the words (5 for the NYT lists)
+        -- each integer corresponds to all possible letters in that position of the words
         -- where the inclusion of each letter is represented by an enabled bit `1`
 
         The numbers are built from the answers because some letters never appear in certain positions
         -- X is never first, Q is never in position 4 and J, Q, V are never last
+        answers: the words to build them from, nyt-answers.txt by default
+        Pass positions to start from other masks, e.g. [ALL_LETTERS]*5 to allow every letter everywhere
+
+        minimum/maximum: how many times a letter must/may appear in the word
         """
-        positional = [0,0,0,0,0]
-        answers = self._get_words('nyt-answers.txt')
+        self.minimum = dict()
+        self.maximum = dict()
+        if positions is not None:
+            self.positions = list(positions)
+            return
+        if answers is None:
+            answers = self._get_words(ANSWER_DICTIONARY)
+        positional = [0]*len(answers[0])
         for answer in answers:
             word = Word(answer)
             for index, pos in enumerate(word.positions):
@@ -49,7 +63,7 @@ class Puzzle:
 
     def set_green(self, position, letter):
         """
-        Takes a position/index [0-4] and a letter
+        Takes a position/index (0 for the first letter) and a letter
         disables bits for all other letters
         """
         shift = ord(letter)-LETTER_A
@@ -57,7 +71,7 @@ class Puzzle:
 
     def set_yellow(self, position, letter):
         """
-        Takes a position/index [0-4] and a letter
+        Takes a position/index (0 for the first letter) and a letter
         disables only the bit corresponding to letter
         """
         shift = ord(letter)-LETTER_A
@@ -68,6 +82,127 @@ class Puzzle:
         Takes a letter and disables that bit in all letter positions/indices
         """
         shift = ord(letter)-LETTER_A
-        for i in range(0,5):
+        for i in range(0,len(self.positions)):
             self.positions[i] &= ~(1<<shift)
 
+    def set_minimum(self, letter, count):
+        """
+        The letter must appear at least count times
+        """
+        if count > self.minimum.get(letter, 0):
+            self.minimum[letter] = count
+
+    def set_maximum(self, letter, count):
+        """
+        The letter may appear at most count times
+        """
+        if letter not in self.maximum or count < self.maximum[letter]:
+            self.maximum[letter] = count
+
+    def matches(self, word):
+        """
+        True if word is allowed by every position and letter count
+        """
+        for index, pos in enumerate(Word(word).positions):
+            if self.positions[index] & pos == 0:
+                return False
+        for letter, count in self.minimum.items():
+            if word.count(letter) < count:
+                return False
+        for letter, count in self.maximum.items():
+            if word.count(letter) > count:
+                return False
+        return True
+
+def _bits(mask):
+    """
+    Yields the letter index of every enabled bit in mask
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length()-1
+        mask ^= low
+
+class MaskIndex:
+    """
+    Bit-sliced masks for a whole word list, so a Puzzle can be evaluated against every word at once.
+
+    Words are numbered by their index in the list. For every position and letter there is one
+    integer with bit `i` enabled when word `i` has that letter in that position, and for every
+    letter and count there is one integer of the words with at least that many copies.
+    Evaluating a Puzzle is then a handful of AND/OR operations on those integers instead of a loop over words.
+    """
+    def __init__(self, words):
+        self.words = list(words)
+        self.length = len(self.words[0]) if self.words else 0
+        self.ids = dict((word, index) for index, word in enumerate(self.words))
+        self.all = (1<<len(self.words))-1
+        size = (len(self.words) + 7) // 8
+
+        by_position = [[bytearray(size) for _ in range(0,LETTER_COUNT)] for _ in range(0,self.length)]
+        at_least = [[] for _ in range(0,LETTER_COUNT)]
+        for index, word in enumerate(self.words):
+            byte = index >> 3
+            bit = 1 << (index & 7)
+            counts = [0]*LETTER_COUNT
+            for position, pos in enumerate(Word(word).positions):
+                letter = pos.bit_length()-1
+                by_position[position][letter][byte] |= bit
+                counts[letter] += 1
+                if counts[letter] > len(at_least[letter]):
+                    at_least[letter].append(bytearray(size))
+                at_least[letter][counts[letter]-1][byte] |= bit
+
+        self.by_position = [[int.from_bytes(b, 'little') for b in letters] for letters in by_position]
+        self.at_least = [[int.from_bytes(b, 'little') for b in counts] for counts in at_least]
+
+    def puzzle(self):
+        """
+        A Puzzle that allows every letter in every position
+        """
+        return Puzzle([ALL_LETTERS]*self.length)
+
+    def evaluate(self, puzzle, candidates = None):
+        """
+        Returns an integer with bit `i` enabled for every word `i` allowed by the puzzle
+        candidates: optional integer of words to start from
+        """
+        result = self.all if candidates is None else candidates
+        for position, allowed in enumerate(puzzle.positions):
+            if allowed == ALL_LETTERS:
+                continue
+            letters = self.by_position[position]
+            disallowed = ALL_LETTERS & ~allowed
+            # OR together whichever side has fewer letters
+            if bin(allowed).count('1') <= bin(disallowed).count('1'):
+                keep = 0
+                for letter in _bits(allowed):
+                    keep |= letters[letter]
+                result &= keep
+            else:
+                for letter in _bits(disallowed):
+                    result &= ~letters[letter]
+            if result == 0:
+                return 0
+        for letter, count in puzzle.minimum.items():
+            counts = self.at_least[ord(letter)-LETTER_A]
+            result &= counts[count-1] if count <= len(counts) else 0
+        for letter, count in puzzle.maximum.items():
+            counts = self.at_least[ord(letter)-LETTER_A]
+            if count < len(counts):
+                result &= ~counts[count]
+        return result
+
+    def select(self, result, words):
+        """
+        Returns the words (in their given order) whose bits are enabled in result
+        """
+        flags = result.to_bytes((len(self.words) + 7) // 8, 'little')
+        ids = self.ids
+        selected = []
+        for word in words:
+            index = ids[word]
+            if flags[index >> 3] >> (index & 7) & 1:
+                selected.append(word)
+        return selected
+
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+A small HTTP + JSON service for playing games with the interactive Solver methods.
+
+Each game is a session holding its own Solver. Sessions live in a bounded pool: when it is full the
+least recently used session is dropped, and sessions idle for longer than idle_timeout are evicted
+in the background. Every Solver shares the process wide WordIndex, so creating a game is cheap, and
+the process wide GuessCache, so games reaching the same state get their next guess without searching.
+
+Routes (bodies and responses are JSON):
+    POST   /games                      {"use_intersecting": true} -> {"id": "..."}
+    POST   /games/<id>/guess           {"word": "SLATE", "in_place": "__A__", "out_of_place": "S"} -> {"guesses": [...]}
+    GET    /games/<id>/next_guess      -> {"guess": "CRONY", "is_solved": false}
+    GET    /games/<id>/answer_count    -> {"answer_count": 9}
+    GET    /games/<id>/matches?answer=1&limit=100 -> {"count": 9, "words": [...]}
+    DELETE /games/<id>                 -> {}
+    GET    /stats                      -> pool and guess cache counters
+They behave like the Solver methods of the same names, see wordle_interactive.py.
+"""
+import asyncio
+import collections
+import http
+import json
+import secrets
+import time
+import urllib.parse
+
+from guess_cache import GuessCache
+from wordle_solver import Solver
+from wordle_solver import WordIndex
+
+MAX_BODY = 64 * 1024
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class Session:
+    __slots__ = ('solver', 'last_used')
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.last_used = time.monotonic()
+
+class SessionPool:
+    """
+    Game sessions by id, least recently used first
+    """
+    def __init__(self, max_sessions = 1024, idle_timeout = 600):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = collections.OrderedDict()
+        self.created = 0
+        self.evicted = 0
+
+    def create(self, **options):
+        while len(self.sessions) >= self.max_sessions:
+            self.sessions.popitem(last = False)
+            self.evicted += 1
+        id = secrets.token_hex(8)
+        self.sessions[id] = Session(Solver(**options))
+        self.created += 1
+        return id
+
+    def get(self, id):
+        """
+        Returns the Solver for a session and marks it as used, or None if there is no such session
+        """
+        session = self.sessions.get(id)
+        if session is None:
+            return None
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(id)
+        return session.solver
+
+    def remove(self, id):
+        return self.sessions.pop(id, None) is not None
+
+    def evict_idle(self, now = None):
+        """
+        Drops sessions idle for longer than idle_timeout, returns how many were dropped
+        """
+        now = now if now is not None else time.monotonic()
+        count = 0
+        # Least recently used come first, so stop at the first session that is still fresh
+        while len(self.sessions) > 0:
+            id, session = next(iter(self.sessions.items()))
+            if now - session.last_used <= self.idle_timeout:
+                break
+            del self.sessions[id]
+            count += 1
+        self.evicted += count
+        return count
+
+    def __len__(self):
+        return len(self.sessions)
+
+class SolverService:
+    def __init__(self, pool = None):
+        self.pool = pool if pool is not None else SessionPool()
+        self.requests = 0
+
+    def handle(self, method, target, body = b''):
+        """
+        Routes one request, returns (status, payload)
+        """
+        self.requests += 1
+        try:
+            url = urllib.parse.urlsplit(target)
+            parts = [part for part in url.path.split('/') if part]
+            query = urllib.parse.parse_qs(url.query)
+            return 200, self._route(method, parts, query, body)
+        except HTTPError as e:
+            return e.status, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'{type(e).__name__}: {e}'}
+
+    def _route(self, method, parts, query, body):
+        if parts == ['stats'] and method == 'GET':
+            return {'sessions': len(self.pool), 'created': self.pool.created, 'evicted': self.pool.evicted, 'requests': self.requests,
+                'guess_cache': GuessCache.shared().stats()}
+        if len(parts) == 0 or parts[0] != 'games':
+            raise HTTPError(404, 'Not found')
+        if len(parts) == 1:
+            if method != 'POST':
+                raise HTTPError(405, 'Use POST to create a game')
+            use_intersecting = self._json(body).get('use_intersecting', True)
+            if not isinstance(use_intersecting, bool):
+                raise HTTPError(400, 'use_intersecting must be true or false')
+            return {'id': self.pool.create(use_intersecting = use_intersecting, cache = True)}
+
+        solver = self.pool.get(parts[1])
+        if solver is None:
+            raise HTTPError(404, f'No game {parts[1]}')
+        action = parts[2] if len(parts) == 3 else None
+        if len(parts) == 2 and method == 'DELETE':
+            self.pool.remove(parts[1])
+            return {}
+        if action == 'guess' and method == 'POST':
+            request = self._json(body)
+            word = request.get('word')
+            length = solver.puzzle.dictionary.index.length
+            if not isinstance(word, str) or len(word) != length or not word.isalpha():
+                raise HTTPError(400, f'word must be a {length} letter string')
+            in_place = request.get('in_place')
+            out_of_place = request.get('out_of_place')
+            if not all(isinstance(value, str) for value in [in_place or '', out_of_place or '']):
+                raise HTTPError(400, 'in_place and out_of_place must be strings')
+            # Each square of in_place is _ or the guessed letter in that square
+            if in_place and (len(in_place) > len(word) or any(square != '_' and square != letter
+                    for square, letter in zip(in_place.upper(), word.upper()))):
+                raise HTTPError(400, 'in_place must be _ or the letter of word in each position')
+            if out_of_place and not set(out_of_place.upper()) <= set(word.upper()):
+                raise HTTPError(400, 'out_of_place letters must be in word')
+            solver.guess(word, in_place, out_of_place)
+            return {'guesses': solver.guesses()}
+        if action == 'next_guess' and method == 'GET':
+            try:
+                guess = solver.next_guess()
+            except IndexError:
+                raise HTTPError(409, 'No answers match the feedback given')
+            return {'guess': guess, 'is_solved': solver.is_solved()}
+        if action == 'answer_count' and method == 'GET':
+            return {'answer_count': solver.answer_count()}
+        if action == 'matches' and method == 'GET':
+            words = solver.matches(query.get('answer', ['0'])[0] not in ['0', 'false'])
+            limit = int(query['limit'][0]) if 'limit' in query and query['limit'][0].isdigit() else len(words)
+            return {'count': len(words), 'words': list(words[0:limit])}
+        raise HTTPError(404, 'Not found')
+
+    def _json(self, body):
+        if not body:
+            return dict()
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, 'Body must be JSON')
+        if not isinstance(data, dict):
+            raise HTTPError(400, 'Body must be a JSON object')
+        return data
+
+    async def serve_connection(self, reader, writer):
+        """
+        Answers HTTP/1.1 requests on one connection until the client closes it
+        """
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload = self.handle(method, target, body)
+                close = headers.get('connection', '').lower() == 'close'
+                writer.write(_response(status, payload, close))
+                await writer.drain()
+                if close:
+                    break
+        except HTTPError as e:
+            writer.write(_response(e.status, {'error': str(e)}, True))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            writer.write(_response(500, {'error': f'{type(e).__name__}: {e}'}, True))
+        finally:
+            writer.close()
+
+    async def evict_periodically(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.pool.evict_idle()
+
+    async def start(self, host = '127.0.0.1', port = 8080):
+        """
+        Loads the word index and starts listening, returns the asyncio server
+        """
+        WordIndex.shared().guess_letters
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+async def _read_request(reader):
+    """
+    Returns (method, target, headers, body) or None when the connection is closed
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, 'Bad request line')
+    headers = dict()
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', '0') or 0)
+    except ValueError:
+        raise HTTPError(400, 'Bad Content-Length')
+    if length < 0:
+        raise HTTPError(400, 'Bad Content-Length')
+    if length > MAX_BODY:
+        raise HTTPError(413, 'Body too large')
+    body = await reader.readexactly(length) if length > 0 else b''
+    return method.upper(), target, headers, body
+
+def _response(status, payload, close = False):
+    data = json.dumps(payload).encode()
+    head = f'HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n'
+    if close:
+        head += 'Connection: close\r\n'
+    return (head + '\r\n').encode('latin-1') + data
+
+async def serve(host, port, max_sessions, idle_timeout):
+    service = SolverService(SessionPool(max_sessions, idle_timeout))
+    server = await service.start(host, port)
+    print(f'Serving on {host}:{port}, at most {max_sessions} games, evicting after {idle_timeout}s idle')
+    eviction = asyncio.ensure_future(service.evict_periodically(max(1, idle_timeout / 10)))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        eviction.cancel()
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Serve the solver over HTTP')
+    parser.add_argument('--host', action="store", dest="host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument('-p', '--port', action="store", dest="port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument('-m', '--max-sessions', action="store", dest="max_sessions", type=int, default=1024, help="Most games kept at once")
+    parser.add_argument('-i', '--idle-timeout', action="store", dest="idle_timeout", type=float, default=600, help="Seconds before an idle game is dropped")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_sessions, args.idle_timeout))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,110 @@
+"""
+Works out the next guess for the interactive solver while the player is still typing feedback.
+
+Once a guess is entered, every answer still possible gives it one of at most 3^length patterns, and
+the player can only type one of those. A Speculator takes a copy of the Solver for each pattern,
+most likely first (the pattern shared by the most answers), applies it and asks for the next guess,
+all on a background thread while the main thread waits on input(). When the feedback typed matches a
+pattern already done, its Solver simply replaces the game's one.
+
+The background thread only ever touches copies of the Solver, and take() stops it before the game's
+own Solver is changed again.
+"""
+import collections
+import threading
+
+from patterns import pattern
+from patterns import solved
+from patterns import to_input
+
+def _key(word, in_place, out_of_place):
+    """
+    The same for any way of typing the same feedback: a short or missing in_place, yellows in any order
+    """
+    word = word.upper()
+    in_place = (in_place or '').upper().ljust(len(word), '_')
+    return word, in_place, ''.join(sorted((out_of_place or '').upper()))
+
+class Speculator:
+    def __init__(self, max_patterns = None):
+        """
+        max_patterns: how many of the likeliest patterns are worked out, None for all of them
+        """
+        self.max_patterns = max_patterns
+        self.results = dict()
+        self.thread = None
+        self.stop = threading.Event()
+        # A hit is feedback that was worked out in advance
+        self.hits = 0
+        self.misses = 0
+        self.computed = 0
+
+    def start(self, solver, word):
+        """
+        Starts working out the next guess for each pattern word could get, in the background
+        """
+        self.cancel()
+        self.results = dict()
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target = self._run, args = (solver, word.upper(), self.results, self.stop), daemon = True)
+        self.thread.start()
+
+    def _run(self, solver, word, results, stop):
+        buckets = collections.Counter(pattern(word, answer) for answer in solver.matches(True))
+        buckets.pop(solved(len(word)), None)
+        for code, _ in buckets.most_common(self.max_patterns):
+            if stop.is_set():
+                return
+            in_place, out_of_place = to_input(word, code)
+            speculative = solver.copy()
+            speculative.guess(word, in_place, out_of_place)
+            try:
+                guess = speculative.next_guess()
+            except IndexError:
+                # Nothing left, as the player would find out without speculating
+                continue
+            results[_key(word, in_place, out_of_place)] = (speculative, guess)
+            self.computed += 1
+
+    def wait(self):
+        """
+        Waits for every pattern to be worked out
+        """
+        if self.thread is not None:
+            self.thread.join()
+
+    def cancel(self):
+        """
+        Stops the background work, waiting for the pattern in progress
+        """
+        if self.thread is not None:
+            self.stop.set()
+            self.thread.join()
+            self.thread = None
+
+    def take(self, word, in_place, out_of_place):
+        """
+        Returns (solver, next guess) for this feedback if it was worked out, otherwise None.
+        The returned Solver has the guess and feedback applied already.
+        """
+        self.cancel()
+        result = self.results.get(_key(word, in_place, out_of_place))
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.results = dict()
+        return result
+
+    def stats(self):
+        turns = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'computed': self.computed,
+            'hit_rate': self.hits / turns if turns > 0 else 0,
+        }
+
+    def __str__(self):
+        stats = self.stats()
+        return f'Precomputed suggestions: {stats["hits"]} hits, {stats["misses"]} misses ({stats["hit_rate"]:.0%}), {stats["computed"]} patterns worked out'
@@ -0,0 +1,137 @@
+"""
+Guess selection strategies based on how a guess partitions the remaining answers.
+
+Dictionary.next_guess normally picks the top scoring answer or an intersecting word. A Strategy
+instead scores guesses by the buckets (see patterns.bucket_counts) they split the answers into:
+    entropy:  most information gained
+    expected: smallest expected number of answers left
+    worst:    smallest largest bucket
+Scoring every guess against every answer each turn is too slow, so guesses are first ranked with a
+cheap letter based pre-score and only the top_k are evaluated, within an optional time budget.
+"""
+import abc
+import collections
+import math
+import time
+
+def rank_guesses(answers, guesses):
+    """
+    Ranks guesses by how evenly their letters split the answers: a letter found in c of n answers
+    scores c*(n-c), both anywhere in the word and in its position.
+    Returns guesses sorted best first.
+    """
+    total = len(answers)
+    contains = collections.Counter()
+    at = collections.Counter()
+    for answer in answers:
+        contains.update(set(answer))
+        at.update(enumerate(answer))
+    letter_score = dict((letter, count * (total - count)) for letter, count in contains.items())
+    position_score = dict((key, count * (total - count)) for key, count in at.items())
+
+    scored = []
+    for guess in guesses:
+        score = 0
+        for letter in set(guess):
+            score += letter_score.get(letter, 0)
+        for key in enumerate(guess):
+            score += position_score.get(key, 0)
+        scored.append((score, guess))
+    scored.sort(key = lambda item: item[0], reverse = True)
+    return [guess for _, guess in scored]
+
+class Strategy(abc.ABC):
+    """
+    Base class for partition based strategies. Subclasses implement score, where lower is better.
+    top_k: how many guesses (by pre-score) get their buckets counted
+    time_budget: seconds allowed per choice, None for no limit. At least one guess is always evaluated.
+    """
+    name = None
+
+    def __init__(self, top_k = 100, time_budget = None):
+        self.top_k = top_k
+        self.time_budget = time_budget
+        # Counters for the last choice
+        self.evaluated = 0
+
+    @abc.abstractmethod
+    def score(self, counts, total):
+        """
+        Returns how good splitting total answers into buckets of these counts is, lower is better
+        """
+
+    def _pre_scores(self, answers, guesses):
+        return rank_guesses(answers, guesses)
+
+    def choose(self, answers, guesses, matrix):
+        """
+        Returns the best guess for the remaining answers
+        answers: remaining answers, best scoring first
+        guesses: words that may be guessed
+        matrix: patterns.PatternMatrix with a column for every answer
+        """
+        if len(answers) <= 2:
+            return answers[0]
+        deadline = time.perf_counter() + self.time_budget if self.time_budget is not None else None
+        columns = [matrix.column(answer) for answer in answers]
+        candidates = set(answers)
+        total = len(answers)
+
+        # Answers are always worth evaluating since they can win outright
+        ranked = self._pre_scores(answers, guesses)[0:self.top_k]
+        already = set(ranked)
+        ranked += [answer for answer in answers[0:self.top_k] if answer not in already]
+
+        best = None
+        best_key = None
+        self.evaluated = 0
+        for guess in ranked:
+            row = matrix.row(guess)
+            counts = collections.Counter(map(row.__getitem__, columns))
+            # Ties go to guesses which could be the answer
+            key = (self.score(counts, total), guess not in candidates)
+            self.evaluated += 1
+            if best_key is None or key < best_key:
+                best = guess
+                best_key = key
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        return best
+
+class EntropyStrategy(Strategy):
+    name = 'entropy'
+
+    def score(self, counts, total):
+        # Negated so that lower is better
+        entropy = 0
+        for count in counts.values():
+            entropy += count * math.log2(count / total)
+        return entropy / total
+
+class ExpectedSizeStrategy(Strategy):
+    name = 'expected'
+
+    def score(self, counts, total):
+        return sum(count * count for count in counts.values()) / total
+
+class WorstCaseStrategy(Strategy):
+    name = 'worst'
+
+    def score(self, counts, total):
+        # Break ties on the largest bucket with the expected size
+        return (max(counts.values()), sum(count * count for count in counts.values()))
+
+STRATEGIES = dict((strategy.name, strategy) for strategy in [EntropyStrategy, ExpectedSizeStrategy, WorstCaseStrategy])
+
+def get_strategy(strategy, **options):
+    """
+    Returns a Strategy for a name in STRATEGIES (options go to its constructor), passes a Strategy
+    through, and returns None for None or 'heuristic' (Dictionary's own choice)
+    """
+    if strategy is None or isinstance(strategy, Strategy):
+        return strategy
+    if strategy == 'heuristic':
+        return None
+    if strategy not in STRATEGIES:
+        raise ValueError(f'Unknown strategy {strategy}, expected heuristic or one of {list(STRATEGIES.keys())}')
+    return STRATEGIES[strategy](**options)
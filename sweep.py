@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Plays every answer with each policy in a grid of policy.Policy settings and ranks them.
+
+The grid is every combination of the values given for each setting. Answers are split into chunks
+and each worker process plays its chunk with every policy in turn, so the policies share the
+process's WordIndex and GuessCache: the answers left after some feedback, and the intersecting word
+for them, only depend on the state of the game, not on the thresholds (see Dictionary._choose_guess),
+so a state one policy has been in costs another policy a cache lookup.
+
+Because of that sharing, the seconds for a policy depend on which policies ran before it; they are
+the time spent solving with it in this sweep, summed over the workers.
+"""
+import itertools
+import time
+
+from policy import FIELDS
+from policy import Policy
+from wordle_solver import Solver
+from wordle_solver import WordIndex
+
+def grid(values):
+    """
+    Returns a Policy for every combination of values, a dict of setting name to the values to try
+    """
+    names = list(values.keys())
+    return [Policy.from_dict(dict(zip(names, combination))) for combination in itertools.product(*values.values())]
+
+def _evaluate(answers, policies, options):
+    """
+    Plays answers with every policy, returns (total guesses, most guesses, seconds) for each
+    """
+    results = []
+    for policy in policies:
+        start = time.perf_counter()
+        total = 0
+        most = 0
+        for answer in answers:
+            count = Solver(answer, policy = policy, cache = True, **options).solve().guess_count
+            total += count
+            most = max(most, count)
+        results.append((total, most, time.perf_counter() - start))
+    return results
+
+def sweep(policies, answers = None, jobs = 1, **options):
+    """
+    Returns a (policy, average guesses, most guesses, seconds) for each policy, best first: lowest
+    average, then fewest guesses at worst, then fastest
+    options are passed on to every Solver, e.g. exact_feedback = True
+    """
+    if answers is None:
+        answers = WordIndex.shared().answers
+    answers = list(answers)
+    # A few chunks per worker so one slow chunk doesn't hold up the rest
+    count = max(1, min(len(answers), jobs * 4 if jobs > 1 else 1))
+    chunks = [answers[start::count] for start in range(0, count)]
+    if jobs <= 1:
+        chunk_results = [_evaluate(chunk, policies, options) for chunk in chunks]
+    else:
+        import multiprocessing
+        WordIndex.shared().guess_letters
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        with context.Pool(jobs) as pool:
+            chunk_results = pool.starmap(_evaluate, [(chunk, policies, options) for chunk in chunks])
+
+    ranked = []
+    for number, policy in enumerate(policies):
+        total = sum(results[number][0] for results in chunk_results)
+        most = max(results[number][1] for results in chunk_results)
+        seconds = sum(results[number][2] for results in chunk_results)
+        ranked.append((policy, total / len(answers), most, seconds))
+    ranked.sort(key = lambda result: result[1:4])
+    return ranked
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    parser = argparse.ArgumentParser(description='Rank solver policies by their average guesses over every answer')
+    parser.add_argument('-s', '--set', action="append", dest="settings", default=[], help=f"A setting and the values to try, e.g. intersecting_below=30,50,80. Can be repeated, settings are {', '.join(FIELDS)}")
+    parser.add_argument('-x', '--exact', action="store_true", dest="exact", help="Use real Wordle feedback for duplicate letters")
+    parser.add_argument('-j', '--jobs', action="store", dest="jobs", type=int, default=1, help="Play answers across this many processes (0 for one per core)")
+    args = parser.parse_args()
+
+    values = dict()
+    for setting in args.settings:
+        name, _, choices = setting.partition('=')
+        values[name.strip()] = [choice.strip() for choice in choices.split(',') if choice.strip()]
+    try:
+        policies = grid(values)
+    except (ValueError, TypeError) as e:
+        parser.error(str(e))
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+
+    start = time.time()
+    results = sweep(policies, jobs = jobs, exact_feedback = args.exact)
+    print(f'{"rank":>4}  {"average":>7}  {"max":>3}  {"seconds":>7}  policy')
+    for rank, (policy, average, most, seconds) in enumerate(results, 1):
+        print(f'{rank:>4}  {average:>7.4f}  {most:>3}  {seconds:>7.2f}  {policy}')
+    print(f'{len(policies)} policies in {round(time.time() - start, 1)}s')
@@ -0,0 +1,19 @@
+from adversary import partition
+from adversary import play
+from patterns import solved
+from wordle_solver import Solver
+from wordle_solver import WordIndex
+
+def test_partition_covers_answers():
+    answers = range(0, len(WordIndex.shared().answer_words))
+    for exact_feedback in [False, True]:
+        buckets = partition('SLATE', answers, exact_feedback)
+        assert sum(len(bucket) for bucket in buckets.values()) == len(answers)
+
+def test_path_is_a_real_game():
+    for options in [{}, {'exact_feedback': True}]:
+        path = play('SLATE', **options)
+        assert path[-1][1] == solved(5)
+        # The last guess is an answer, and solving it plays the same game
+        answer = path[-1][0]
+        assert Solver(answer, **options).solve('SLATE').guesses == [guess for guess, _ in path]
@@ -0,0 +1,39 @@
+import pytest
+from batch_solver import BatchSolver
+from batch_solver import solve_batch
+from wordle_solver import Solver
+from wordle_solver import UnsupportedAnswer
+from wordle_solver import WordIndex
+from wordle_solver import solve_all
+
+def sample():
+    return list(WordIndex.shared().answers[::25])
+
+@pytest.mark.parametrize('options', [dict(), dict(use_intersecting = False), dict(exact_feedback = True)])
+def test_batch_matches_solver(options):
+    answers = sample()
+    expected = list(solve_all(answers, 'SLATE', **options))
+    solutions = solve_batch(answers, 'SLATE', **options)
+    assert [solution.guesses for solution in solutions] == [solution.guesses for solution in expected]
+    assert [solution.word for solution in solutions] == answers
+
+def test_batch_counts_states():
+    batch = BatchSolver()
+    solutions = batch.solve(['hound', 'bound', 'pound', 'HOUND'], 'SLATE')
+    assert [solution.word for solution in solutions] == ['HOUND', 'BOUND', 'POUND', 'HOUND']
+    # The first guesses are shared, so there are fewer states than guesses made
+    assert batch.games == 4
+    assert batch.states < sum(solution.guess_count for solution in solutions[0:3])
+
+def test_batch_rejects_unsupported_answer():
+    with pytest.raises(UnsupportedAnswer):
+        solve_batch(['HOUND', 'ZZZZZ'])
+
+def test_copy_is_independent():
+    solver = Solver()
+    solver.feedback('SLATE', 0)
+    copy = solver.copy()
+    copy.guess('CRONY', '__ON_', '')
+    assert solver.guesses() == ['SLATE']
+    assert copy.guesses() == ['SLATE', 'CRONY']
+    assert solver.answer_count() > copy.answer_count()
@@ -0,0 +1,22 @@
+from benchmark import compare
+from benchmark import measure
+
+def results(seconds, peak_kb):
+    return {'benchmarks': {'solve': {'seconds': seconds, 'min': seconds, 'repeat': 1, 'peak_kb': peak_kb}}}
+
+def test_compare_flags_regressions():
+    baseline = results(1.0, 100)
+    assert compare(baseline, results(1.1, 100), 0.2) == []
+    assert compare(baseline, results(0.5, 50), 0.2) == []
+    assert compare(baseline, results(1.3, 100), 0.2) == [('solve', 'min', 1.0, 1.3)]
+    assert compare(baseline, results(1.0, 200), 0.2) == [('solve', 'peak_kb', 100, 200)]
+    # A metric that was 0 can't regress by a fraction of itself
+    assert compare(results(1.0, 0), results(1.0, 50), 0.2) == []
+    # Benchmarks missing from the baseline are skipped
+    assert compare({'benchmarks': {}}, results(1.0, 100)) == []
+
+def test_measure_records_memory():
+    result = measure(lambda: 1000, lambda n: [0] * n * 1000, 2)
+    assert result['repeat'] == 2
+    assert result['min'] <= result['seconds']
+    assert result['peak_kb'] >= 7000
@@ -0,0 +1,49 @@
+from decision_tree import DecisionTree
+from decision_tree import TreeSolver
+from patterns import encode
+from patterns import GRAY, YELLOW
+from wordle_solver import Solver
+
+ANSWERS = ['HOUND', 'RIPER', 'LABEL', 'KHAKI', 'BOUND', 'POUND', 'ALERT']
+
+def play(tree, answer):
+    solver = TreeSolver(tree)
+    guess = solver.next_guess()
+    while True:
+        solver.feedback(guess, tree.pattern(guess, answer))
+        if solver.is_solved():
+            return solver
+        guess = solver.next_guess()
+
+def test_tree_replays_solver():
+    tree = DecisionTree.compile('SLATE', answers = ANSWERS)
+    for answer in ANSWERS:
+        solver = play(tree, answer)
+        assert solver.is_on_tree()
+        assert solver.guesses() == Solver(answer).solve('SLATE').guesses
+
+def test_save_and_load(tmp_path):
+    tree = DecisionTree.compile('SLATE', exact_feedback = True, answers = ANSWERS)
+    filename = tmp_path / 'tree.json'
+    tree.save(filename)
+    loaded = DecisionTree.load(filename)
+    assert loaded.exact_feedback
+    for answer in ANSWERS:
+        assert play(loaded, answer).guesses() == play(tree, answer).guesses()
+
+def test_falls_back_to_solver_off_tree():
+    tree = DecisionTree.compile('SLATE', answers = ANSWERS)
+    # Not compiled in, so the feedback for its first guess is off the tree
+    answer = 'ABIDE'
+    solver = play(tree, answer)
+    assert not solver.is_on_tree()
+    assert solver.guesses() == Solver(answer).solve('SLATE').guesses
+
+def test_unexpected_guess_falls_back():
+    tree = DecisionTree.compile('SLATE', answers = ANSWERS)
+    solver = TreeSolver(tree)
+    solver.guess('CRANE', None, 'e')
+    assert not solver.is_on_tree()
+    reference = Solver()
+    reference.feedback('CRANE', encode([GRAY, GRAY, GRAY, GRAY, YELLOW]))
+    assert solver.next_guess() == reference.next_guess()
@@ -0,0 +1,42 @@
+from grid_inference import ReverseIndex
+from grid_inference import infer
+from grid_inference import read_grids
+from grid_inference import to_squares
+from patterns import pattern
+from wordle_solver import Solver
+from wordle_solver import pattern_matrix
+
+def grid_text(answer, guesses):
+    return [f'Wordle 1,234 {len(guesses)}/6', ''] + [to_squares(pattern(guess, answer)) for guess in guesses] + ['']
+
+def test_read_grids():
+    lines = grid_text('HOUND', ['SLATE', 'CRONY', 'HOUND']) + ['someone', '⬛🟨🟩⬛', '🟩🟩🟩🟩🟩']
+    grids = list(read_grids(lines))
+    assert grids == [(pattern('SLATE', 'HOUND'), pattern('CRONY', 'HOUND'), pattern('HOUND', 'HOUND')), (pattern('HOUND', 'HOUND'),)]
+
+def test_reverse_index(tmp_path):
+    index = ReverseIndex(cache_directory = str(tmp_path))
+    code = pattern('CRONY', 'HOUND')
+    guesses = index.guesses('HOUND', code)
+    assert 'CRONY' in guesses and len(guesses) == index.count('HOUND', code)
+    assert all(pattern(guess, 'HOUND') == code for guess in guesses)
+    # Read back from the file it wrote
+    assert ReverseIndex(cache_directory = str(tmp_path)).counts == index.counts
+    grid = (pattern('SLATE', 'HOUND'), code, pattern('HUMID', 'HOUND'))
+    answers = index.answers_for(grid)
+    assert 'HOUND' in answers
+    assert len(answers) == sum(1 for answer in pattern_matrix().answers
+        if all(index.count(answer, row) > 0 for row in grid))
+
+def test_infer_answers():
+    lines = []
+    for opener in ['SLATE', 'CRANE', 'AUDIO', 'PIOUS', 'TRICK']:
+        lines += grid_text('HOUND', Solver('HOUND', exact_feedback = True).solve(opener).guesses)
+    for jobs in [1, 2]:
+        tally = infer(read_grids(lines), jobs, batch_size = 2)
+        assert (tally.grids, tally.solved, tally.impossible) == (5, 5, 0)
+        index = ReverseIndex()
+        # No contradictions is the same as fitting every grid
+        fits = set.intersection(*(set(index.answers_for(grid)) for grid in read_grids(lines)))
+        assert 'HOUND' in fits
+        assert set(answer for answer, contradictions, _ in tally.ranked(index) if contradictions == 0) == fits
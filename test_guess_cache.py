@@ -0,0 +1,49 @@
+from guess_cache import GuessCache
+from wordle_solver import Solver
+
+WORDS = ['HOUND', 'RIPER', 'LABEL', 'KHAKI', 'MOUND', 'BOUND']
+
+def test_lru_eviction_and_stats():
+    cache = GuessCache(max_entries = 2)
+    cache.put('a', 'SLATE', ['SLATE'])
+    cache.put('b', 'CRONY')
+    assert cache.get('a') == ('SLATE', ('SLATE',))
+    cache.put('c', 'HOUND')
+    # b was used least recently
+    assert cache.get('b') is None
+    assert cache.get('c') == ('HOUND', None)
+    stats = cache.stats()
+    assert (stats['entries'], stats['hits'], stats['misses'], stats['evictions']) == (2, 2, 1, 1)
+
+def test_save_and_load(tmp_path):
+    cache = GuessCache()
+    cache.put('a', 'SLATE', ['SLATE', 'CRONY'])
+    cache.put('b', 'CRONY')
+    path = str(tmp_path / 'guesses.json')
+    cache.save(path)
+    loaded = GuessCache()
+    assert loaded.load(path) == 2
+    assert list(loaded.entries.items()) == list(cache.entries.items())
+    assert GuessCache().load(str(tmp_path / 'missing.json')) == 0
+    old = tmp_path / 'old.json'
+    old.write_text('{"version": 1, "entries": [["a", "SLATE", null]]}')
+    assert GuessCache().load(str(old)) == 0
+
+def test_cached_games_match():
+    for options in [{}, {'exact_feedback': True}]:
+        cache = GuessCache()
+        expected = [Solver(word, **options).solve('SLATE').guesses for word in WORDS]
+        for _ in range(0, 2):
+            assert [Solver(word, cache = cache, **options).solve('SLATE').guesses for word in WORDS] == expected
+        assert cache.hits > 0
+
+def test_hit_prunes_answers():
+    cache = GuessCache()
+    first = Solver('MOUND', cache = cache)
+    first.guess('SLATE', None, None)
+    guess = first.next_guess()
+    second = Solver('BOUND', cache = cache)
+    second.guess('SLATE', None, None)
+    assert second.next_guess() == guess
+    assert cache.hits == 1
+    assert list(second.matches(True)) == list(first.matches(True))
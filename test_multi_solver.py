@@ -0,0 +1,45 @@
+import collections
+import pytest
+from multi_solver import MultiSolver
+from multi_solver import evaluate
+from patterns import pattern
+from wordle_solver import UnsupportedAnswer
+
+TARGETS = ['HOUND', 'RIPER', 'LABEL', 'KHAKI']
+
+def test_solves_every_board():
+    solution = MultiSolver(TARGETS).solve('SLATE')
+    for target, solved_at in zip(solution.words, solution.solved_at):
+        assert solution.guesses[solved_at - 1] == target
+    assert solution.guess_count == max(solution.solved_at)
+    assert solution.guess_count <= len(TARGETS) + 5
+
+def test_partitions_match_each_board():
+    solver = MultiSolver(TARGETS)
+    solver.play('SLATE')
+    boards = solver.unsolved()
+    base = 3**5
+    columns = [solver.matrix.column(word) for board in boards for word in board.candidates]
+    tags = [number * base for number, board in enumerate(boards) for word in board.candidates]
+    counts = solver._partition_counts('CRONY', columns, tags)
+    for number, board in enumerate(boards):
+        expected = collections.Counter(pattern('CRONY', word) for word in board.candidates)
+        assert dict((key - number * base, count) for key, count in counts.items() if key // base == number) == expected
+
+def test_interactive_feedback_matches_play():
+    played = MultiSolver(TARGETS)
+    interactive = MultiSolver(boards = len(TARGETS))
+    for word in ['SLATE', 'CRONY']:
+        played.play(word)
+        interactive.feedback(word, [pattern(word, target) for target in TARGETS])
+    assert [board.candidates for board in interactive.boards] == [board.candidates for board in played.boards]
+    assert interactive.next_guess() == played.next_guess()
+
+def test_evaluate_and_errors():
+    solutions = list(evaluate(boards = 2, games = 3, seed = 1))
+    assert len(solutions) == 3
+    assert all(len(set(solution.words)) == 2 for solution in solutions)
+    with pytest.raises(UnsupportedAnswer):
+        MultiSolver(['HOUND', 'ZZZZZ'])
+    with pytest.raises(ValueError):
+        MultiSolver(TARGETS, scoring = 'best')
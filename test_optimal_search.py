@@ -0,0 +1,45 @@
+from decision_tree import DecisionTree
+from optimal_search import Search
+from optimal_search import lower_bound
+from strategies import rank_guesses
+
+WORDS = ['HOUND', 'MOUND', 'BOUND', 'FOUND', 'POUND', 'ROUND', 'SOUND', 'WOUND', 'BOXER', 'RIPER']
+
+def brute_force(search, answers, known):
+    # Every guess in the pool, no bounds
+    if len(answers) <= 2:
+        return lower_bound(len(answers))
+    if answers in known:
+        return known[answers]
+    best = None
+    for guess in search.candidates(answers):
+        buckets = search.partition(guess, answers)
+        if len(buckets) == 1 and len(buckets[0]) == len(answers):
+            continue
+        total = len(answers) + sum(brute_force(search, bucket, known) for bucket in buckets)
+        best = total if best is None else min(best, total)
+    known[answers] = best
+    return best
+
+def test_matches_brute_force():
+    search = Search(top_k = None)
+    search.pool = rank_guesses(WORDS, search.index.guesses)[0:12]
+    answers = search.columns(WORDS)
+    expected = Search(top_k = None)
+    expected.pool = search.pool
+    assert search.cost(answers) == brute_force(expected, answers, dict())
+    assert search.cost(answers) >= lower_bound(len(answers))
+
+def test_tree_replays_cost():
+    search = Search(top_k = 5)
+    answers = search.columns(WORDS)
+    cost = search.cost(answers)
+    tree = DecisionTree(search.tree(answers), exact_feedback = True)
+    total = 0
+    for answer in WORDS:
+        node = tree.root
+        total += 1
+        while node.guess != answer:
+            node = node.children[tree.pattern(node.guess, answer)]
+            total += 1
+    assert total == cost
@@ -0,0 +1,68 @@
+from patterns import pattern, decode, encode, solved, compute_row, PatternMatrix
+from patterns import bucket_counts, partition_stats, to_string
+from patterns import GRAY, YELLOW, GREEN
+from wordle_solver import Solver
+from wordle_solver import Dictionary
+
+def test_greens_and_grays():
+    assert decode(pattern('SLATE', 'SLATE'), 5) == [GREEN] * 5
+    assert pattern('SLATE', 'SLATE') == solved(5)
+    assert decode(pattern('SLATE', 'CRONY'), 5) == [GRAY] * 5
+
+def test_duplicate_guess_letters_only_match_once():
+    # Only one E in ABIDE, so the second E in SPEED is gray
+    assert decode(pattern('SPEED', 'ABIDE'), 5) == [GRAY, GRAY, YELLOW, GRAY, YELLOW]
+
+def test_green_takes_priority_over_earlier_yellow():
+    # The E in position 4 is green, so the E in position 1 has no unmatched E left
+    assert decode(pattern('EERIE', 'THOSE'), 5) == [GRAY, GRAY, GRAY, GRAY, GREEN]
+
+def test_encode_decode_round_trip():
+    for code in range(0, 243):
+        assert encode(decode(code, 5)) == code
+
+def test_compute_row_matches_pattern():
+    answers = ['ABIDE', 'THOSE', 'SPEED', 'EERIE', 'LLAMA']
+    for guess in answers + ['SLATE', 'ALLEE']:
+        assert list(compute_row(guess, answers)) == [pattern(guess, answer) for answer in answers]
+
+def test_matrix_cache_round_trip(tmp_path):
+    guesses = ['SLATE', 'CRONY', 'SPEED']
+    answers = ['ABIDE', 'THOSE', 'SPEED']
+    matrix = PatternMatrix(guesses, answers, tmp_path)
+    assert not matrix.is_cached()
+    lazy = [list(matrix.row(guess)) for guess in guesses]
+    assert matrix.build()
+
+    cached = PatternMatrix(guesses, answers, tmp_path)
+    assert cached.is_cached()
+    assert [list(cached.row(guess)) for guess in guesses] == lazy
+    assert cached.filter('SLATE', pattern('SLATE', 'THOSE'), answers) == ['THOSE']
+
+    # A different word list must not reuse the cache
+    assert not PatternMatrix(guesses, answers + ['EERIE'], tmp_path).is_cached()
+
+def test_exact_feedback_solver():
+    solution = Solver('RIPER', exact_feedback = True).solve('SALET')
+    assert solution.word == 'RIPER'
+    assert solution.guess_count <= 6
+
+def test_filter_by_pattern_keeps_target():
+    dictionary = Dictionary()
+    dictionary.filter_by_pattern('SLATE', pattern('SLATE', 'HOUND'))
+    assert 'HOUND' in dictionary.answers
+    assert all(pattern('SLATE', answer) == pattern('SLATE', 'HOUND') for answer in dictionary.answers)
+
+def test_partition_stats():
+    answers = ['ABIDE', 'THOSE', 'SPEED', 'EERIE']
+    counts = bucket_counts(compute_row('LUMPY', answers))
+    # LUMPY only shares the P in SPEED
+    assert sorted(counts.values()) == [1, 3]
+    expected, entropy, largest = partition_stats(counts)
+    assert expected == (1 + 9) / 4
+    assert largest == 3
+    assert round(entropy, 4) == 0.8113
+
+def test_to_string():
+    assert to_string(pattern('SPEED', 'ABIDE'), 5) == '--Y-Y'
+    assert to_string(solved(5), 5) == 'GGGGG'
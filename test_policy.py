@@ -0,0 +1,35 @@
+import pytest
+
+from guess_cache import GuessCache
+from policy import Policy
+from wordle_solver import Solver
+
+WORDS = ['HOUND', 'RIPER', 'LABEL', 'KHAKI', 'MOUND', 'BOUND']
+
+def test_parse():
+    policy = Policy.parse('starting_word=crane, intersecting_below=40,by_position=false')
+    assert (policy.starting_word, policy.intersecting_above, policy.intersecting_below, policy.by_position) == ('CRANE', 2, 40, False)
+    assert Policy.parse(str(policy)) == policy
+    assert Policy.parse('') == Policy()
+    with pytest.raises(ValueError):
+        Policy.parse('window=3')
+
+def test_default_policy_plays_the_same():
+    for word in WORDS:
+        assert Solver(word, policy = Policy()).solve('SLATE').guesses == Solver(word).solve('SLATE').guesses
+
+def test_policies_share_states():
+    cache = GuessCache()
+    narrow = Policy(intersecting_below = 10)
+    expected = [Solver(word, policy = narrow).solve('SLATE').guesses for word in WORDS]
+    for word in WORDS:
+        Solver(word, cache = cache).solve('SLATE')
+    hits = cache.hits
+    # Same states as the default policy, only the guesses chosen from them are new
+    assert [Solver(word, policy = narrow, cache = cache).solve('SLATE').guesses for word in WORDS] == expected
+    assert cache.hits > hits
+
+def test_solve_opens_with_policy_word():
+    assert Solver('HOUND', policy = Policy(starting_word = 'CRANE')).solve().guesses[0] == 'CRANE'
+    assert Solver('HOUND').solve().guesses == Solver('HOUND').solve('SLATE').guesses
+    assert Solver('HOUND', policy = Policy(starting_word = None)).solve().guesses[0] == Solver().next_guess()
@@ -1,6 +1,8 @@
 import pytest
 from puzzle import Puzzle
 from puzzle import Word
+from puzzle import MaskIndex
+from puzzle import ALL_LETTERS
 
 LETTER_COUNT = 26
 LETTER_A = 65
@@ -65,3 +67,24 @@ def test_word():
     word = Word('REBAR')
     print([bin(x) for x in word.positions])
 
+
+def test_minimum_and_maximum_counts():
+    puzzle = Puzzle([ALL_LETTERS]*5)
+    puzzle.set_minimum('E', 1)
+    puzzle.set_maximum('E', 1)
+    assert puzzle.matches('THOSE')
+    assert not puzzle.matches('EERIE')
+    assert not puzzle.matches('CRONY')
+
+def test_mask_index_matches_puzzle():
+    words = ['THOSE', 'EERIE', 'CRONY', 'HOUND', 'SPEED', 'ABIDE']
+    index = MaskIndex(words)
+    puzzle = index.puzzle()
+    puzzle.set_yellow(2, 'E')
+    puzzle.set_gray('S')
+    puzzle.set_minimum('E', 1)
+    puzzle.set_maximum('E', 1)
+    selected = index.select(index.evaluate(puzzle), words)
+    assert selected == [word for word in words if puzzle.matches(word)]
+    assert selected == ['ABIDE']
+    assert index.evaluate(puzzle, index.all & ~(1 << index.ids['ABIDE'])) == 0
@@ -0,0 +1,99 @@
+import asyncio
+import json
+from load_test import Client
+from load_test import feedback
+from solver_service import SessionPool
+from solver_service import SolverService
+from wordle_solver import Solver
+
+def test_pool_drops_least_recently_used():
+    pool = SessionPool(max_sessions = 2)
+    first = pool.create()
+    second = pool.create()
+    pool.get(first)
+    third = pool.create()
+    assert pool.get(second) is None
+    assert pool.get(first) is not None and pool.get(third) is not None
+    assert pool.evicted == 1
+
+def test_pool_evicts_idle_sessions():
+    pool = SessionPool(idle_timeout = 10)
+    old = pool.create()
+    fresh = pool.create()
+    pool.sessions[old].last_used -= 60
+    assert pool.evict_idle() == 1
+    assert pool.get(old) is None
+    assert pool.get(fresh) is not None
+
+def test_service_plays_like_solver():
+    service = SolverService()
+    status, data = service.handle('POST', '/games', b'{}')
+    id = data['id']
+    solver = Solver()
+    for word in ['SLATE', 'CRONY']:
+        in_place, out_of_place = feedback(word, 'HOUND')
+        body = json.dumps({'word': word, 'in_place': in_place, 'out_of_place': out_of_place}).encode()
+        assert service.handle('POST', f'/games/{id}/guess', body)[0] == 200
+        solver.guess(word, in_place, out_of_place)
+        assert service.handle('GET', f'/games/{id}/next_guess') == (200, {'guess': solver.next_guess(), 'is_solved': solver.is_solved()})
+    assert service.handle('GET', f'/games/{id}/answer_count') == (200, {'answer_count': solver.answer_count()})
+    status, data = service.handle('GET', f'/games/{id}/matches?answer=1&limit=3')
+    assert data['count'] == solver.answer_count() and data['words'] == list(solver.matches(True)[0:3])
+    assert service.handle('DELETE', f'/games/{id}')[0] == 200
+    assert service.handle('GET', f'/games/{id}/next_guess')[0] == 404
+
+def test_service_rejects_bad_requests():
+    service = SolverService()
+    id = service.handle('POST', '/games', b'')[1]['id']
+    assert service.handle('POST', f'/games/{id}/guess', b'not json')[0] == 400
+    assert service.handle('POST', f'/games/{id}/guess', b'{"word": "TOOLONG"}')[0] == 400
+    assert service.handle('POST', f'/games/{id}/guess', b'{"word": "SLATE", "out_of_place": "Z"}')[0] == 400
+    assert service.handle('GET', '/nowhere')[0] == 404
+    # Feedback that doesn't fit the word is turned away without touching the game
+    assert service.handle('POST', f'/games/{id}/guess', b'{"word": "SLATE", "in_place": "12345"}')[0] == 400
+    assert service.handle('POST', f'/games/{id}/guess', b'{"word": "SLATE", "in_place": "__T__"}')[0] == 400
+    assert service.handle('POST', f'/games/{id}/guess', b'{"word": "SLATE", "in_place": "__a__"}')[0] == 200
+    assert service.handle('GET', f'/games/{id}/next_guess')[0] == 200
+    assert service.handle('POST', '/games', b'{"use_intersecting": "false"}')[0] == 400
+    assert service.handle('POST', '/games', b'{"use_intersecting": false}')[0] == 200
+
+def test_service_answers_500_on_errors():
+    service = SolverService()
+    def broken(*args):
+        raise RuntimeError('broken')
+    service._route = broken
+    status, payload = service.handle('GET', '/stats')
+    assert status == 500 and 'broken' in payload['error']
+
+def test_service_over_http():
+    async def play():
+        service = SolverService()
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = Client('127.0.0.1', port)
+        await client.connect()
+        turns = await client.play('HOUND', 'SLATE')
+        await client.close()
+        server.close()
+        await server.wait_closed()
+        return turns, client.errors, len(service.pool)
+    turns, errors, sessions = asyncio.run(play())
+    assert turns is not None and turns <= 6
+    assert errors == 0
+    assert sessions == 0
+
+def test_service_rejects_bad_content_length():
+    async def send(length):
+        service = SolverService()
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f'POST /games HTTP/1.1\r\nContent-Length: {length}\r\n\r\n'.encode('latin-1'))
+        await writer.drain()
+        status = (await reader.readline()).split()[1]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return int(status)
+    assert asyncio.run(send('ten')) == 400
+    assert asyncio.run(send('-5')) == 400
@@ -0,0 +1,24 @@
+from patterns import pattern
+from patterns import to_input
+from speculation import Speculator
+from wordle_solver import Solver
+
+def test_speculated_guess_matches():
+    for answer in ['HOUND', 'RIPER', 'KHAKI']:
+        speculator = Speculator()
+        speculator.start(Solver(), 'SLATE')
+        speculator.wait()
+        in_place, out_of_place = to_input('SLATE', pattern('SLATE', answer))
+        expected = Solver()
+        expected.guess('SLATE', in_place, out_of_place)
+        # Typed differently, the same feedback
+        solver, guess = speculator.take('slate', in_place.rstrip('_'), out_of_place[::-1].lower())
+        assert guess == expected.next_guess()
+        assert solver.answer_count() == expected.answer_count()
+        assert speculator.hits == 1
+
+def test_miss_is_counted():
+    speculator = Speculator(max_patterns = 1)
+    speculator.start(Solver(), 'SLATE')
+    assert speculator.take('CRANE', None, None) is None
+    assert speculator.stats()['misses'] == 1
@@ -0,0 +1,36 @@
+import pytest
+from strategies import get_strategy
+from strategies import EntropyStrategy, ExpectedSizeStrategy, WorstCaseStrategy
+from wordle_solver import Solver
+from wordle_solver import pattern_matrix
+
+ANSWERS = ['BOUND', 'POUND', 'FOUND', 'DOING', 'MOUND', 'GOING', 'WOUND', 'HOUND', 'OWING']
+
+def test_get_strategy():
+    assert get_strategy(None) is None
+    assert get_strategy('heuristic') is None
+    assert isinstance(get_strategy('entropy', top_k = 10), EntropyStrategy)
+    strategy = WorstCaseStrategy()
+    assert get_strategy(strategy) is strategy
+    with pytest.raises(ValueError):
+        get_strategy('random')
+
+def test_strategies_split_answers():
+    matrix = pattern_matrix()
+    for strategy in [EntropyStrategy(), ExpectedSizeStrategy(), WorstCaseStrategy()]:
+        guess = strategy.choose(ANSWERS, matrix.guesses, matrix)
+        buckets = set(matrix.get(guess, answer) for answer in ANSWERS)
+        # With 9 answers a good guess leaves at most 2 in any bucket
+        assert len(buckets) >= 6
+
+def test_time_budget_still_evaluates_one_guess():
+    matrix = pattern_matrix()
+    strategy = EntropyStrategy(top_k = 1000, time_budget = 0)
+    assert strategy.choose(ANSWERS, matrix.guesses, matrix) is not None
+    assert strategy.evaluated == 1
+
+def test_solver_with_strategy():
+    for name in ['entropy', 'expected', 'worst']:
+        solution = Solver('RIPER', strategy = name).solve('SLATE')
+        assert solution.word == 'RIPER'
+        assert solution.guess_count <= 6
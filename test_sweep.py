@@ -0,0 +1,19 @@
+from policy import Policy
+from sweep import grid
+from sweep import sweep
+from wordle_solver import Solver
+
+WORDS = ['HOUND', 'RIPER', 'LABEL', 'KHAKI', 'MOUND', 'BOUND']
+
+def test_grid():
+    policies = grid({'starting_word': ['SLATE', 'CRANE'], 'by_position': ['true', 'false']})
+    assert len(policies) == 4
+    assert Policy(starting_word = 'CRANE', by_position = False) in policies
+
+def test_sweep_ranks_policies():
+    policies = grid({'intersecting_below': [10, 50]})
+    results = sweep(policies, WORDS)
+    assert [average for _, average, _, _ in results] == sorted(average for _, average, _, _ in results)
+    for policy, average, most, _ in results:
+        counts = [Solver(word, policy = policy).solve(policy.starting_word).guess_count for word in WORDS]
+        assert (average, most) == (sum(counts) / len(WORDS), max(counts))
@@ -0,0 +1,16 @@
+import io
+import json
+
+from wordle_runner import ResultWriter
+from wordle_solver import Solver
+
+def test_rows_are_streamed():
+    solution = Solver('HOUND').solve('SLATE')
+    stream = io.StringIO()
+    rows = ResultWriter('csv', stream)
+    rows.write(solution, 5.0)
+    assert stream.getvalue().splitlines() == ['word,guess_count,guesses,average', f'HOUND,{solution.guess_count},{" ".join(solution.guesses)},5.0']
+
+    stream = io.StringIO()
+    ResultWriter('jsonl', stream).write(solution, 5.0)
+    assert json.loads(stream.getvalue()) == {'word': 'HOUND', 'guess_count': solution.guess_count, 'guesses': solution.guesses, 'average': 5.0}
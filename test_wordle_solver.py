@@ -1,6 +1,8 @@
 import pytest
 from wordle_solver import Solver
 from wordle_solver import Dictionary
+from wordle_solver import WordIndex
+from instrumentation import STATS
 
 # riper was a problem
 def test_riper():
@@ -22,3 +24,126 @@ def test_all():
         assert solution.guess_count <= 6
 
     assert round(guess_count / count, 4) < 3.68
+
+def test_backends_agree():
+    for word in ['HOUND', 'RIPER', 'LABEL', 'KHAKI']:
+        python = Solver(word, backend = 'python').solve('SLATE')
+        bitmask = Solver(word, backend = 'bitmask').solve('SLATE')
+        assert python.guesses == bitmask.guesses
+
+def test_interactive_duplicate_letter_is_capped():
+    # Only the last E of EERIE is green, so the answer has exactly one E
+    for backend in ['python', 'bitmask']:
+        solver = Solver(backend = backend)
+        solver.guess('EERIE', '____E', None)
+        solver.next_guess()
+        assert 'THOSE' in solver.matches(True)
+        assert all(word.count('E') == 1 for word in solver.matches(True))
+
+def test_games_share_index_but_not_state():
+    first = Dictionary()
+    second = Dictionary()
+    assert first.index is second.index
+    first.register_guess('SLATE')
+    first.feedback.miss('S')
+    first.next_guess()
+    assert 'SLATE' not in first.guesses
+    assert 'SLATE' in second.guesses
+    assert len(second.answers) == len(WordIndex.shared().answers)
+
+def test_letter_counts_and_scores():
+    index = WordIndex.shared()
+    for letter, frequency in index.frequency.items():
+        counts = [sum(1 for word in index.answer_words if word[position] == letter) for position in range(0, index.length)]
+        assert list(frequency.by_position.values()) == counts
+        assert frequency.total == sum(counts) - 1
+    assert len(index.guess_scores) == len(index.guesses)
+    assert list(index.guess_scores) == sorted(index.guess_scores, reverse = True)
+    for rank in [0, 100, len(index.answers) - 1]:
+        assert index.answer_scores[rank] == index.get_word_score(index.answers[rank])
+    assert Dictionary().score_of('slate') == index.get_word_score('SLATE', False)
+
+def test_ranks_and_scores_in_bulk():
+    dictionary = Dictionary()
+    words = ['slate', 'HOUND', 'XXXXX', 'CRONY']
+    assert dictionary.scores_of(words) == [dictionary.score_of('SLATE'), dictionary.score_of('HOUND'), None, dictionary.score_of('CRONY')]
+    dictionary.register_guess(dictionary.guesses[0])
+    ranks = dictionary.ranks_of(words)
+    assert ranks[2] is None
+    assert ranks[0] == dictionary.guesses.index('SLATE') + 1
+    assert dictionary.rank_of('slate') == f'{ranks[0]}/{len(dictionary.guesses)}'
+    assert dictionary.top_scores(2) == list(zip(dictionary.guesses[0:2], dictionary.scores_of(dictionary.guesses[0:2])))
+    assert [word for word, _ in dictionary.top_scores(2, words)] == ['SLATE', 'CRONY']
+
+def test_only_new_feedback_is_applied():
+    solver = Solver('HOUND')
+    dictionary = solver.puzzle.dictionary
+    solver._process_guess('SLATE')
+    assert dictionary.feedback.has_changes()
+    solver.next_guess()
+    assert not dictionary.feedback.has_changes()
+    # Gray letters we already know about are not new constraints
+    dictionary.feedback.miss('S')
+    assert not dictionary.feedback.has_changes()
+
+    solver._process_guess('CRONY')
+    dictionary.next_guess()
+    full = Dictionary()
+    full.feedback = dictionary.feedback
+    full._update_answers()
+    assert dictionary.answers == full.answers
+
+def test_intersecting_words_for_hound():
+    # Same path as before intersecting words were scored from letter masks
+    solution = Solver('HOUND').solve('SLATE')
+    assert solution.guesses == ['SLATE', 'CRONY', 'GUIDE', 'BUMPH', 'HOUND']
+
+def test_trace():
+    solution = Solver('HOUND', trace = True).solve('SLATE')
+    assert [turn['guess'] for turn in solution.trace] == solution.guesses
+    assert solution.trace[0]['candidates'] == len(WordIndex.shared().answers)
+    assert solution.trace[0]['feedback'] == '-----'
+    assert solution.trace[-1]['feedback'] == 'GGGGG'
+    # Candidates only go down
+    counts = [turn['candidates'] for turn in solution.trace]
+    assert counts == sorted(counts, reverse = True)
+    assert Solver('HOUND').solve('SLATE').trace is None
+
+def test_stats():
+    STATS.reset()
+    STATS.enabled = True
+    try:
+        Solver('HOUND').solve('SLATE')
+    finally:
+        STATS.enabled = False
+    summary = STATS.summary()
+    STATS.reset()
+    assert summary['next_guess']['calls'] == 4
+    assert summary['filter']['scanned'] > summary['filter']['kept']
+    assert summary['intersecting']['calls'] >= 1
+
+@pytest.fixture
+def seven_letter_words(tmp_path):
+    answers = ['PLANETS', 'PLASTER', 'STAPLER', 'PSALTER', 'PLATENS', 'PALTERS', 'CRANKED', 'DANCERS', 'GARDENS', 'DANGERS']
+    guesses = answers + ['QUICKLY', 'JUMPING', 'MOUTHED', "IT'S", 'PLANET', 'CAFÉ']
+    (tmp_path / 'answers.txt').write_text('\n'.join(answers) + '\n')
+    (tmp_path / 'guesses.txt').write_text('\n'.join(word.lower() for word in guesses) + '\n')
+    previous = WordIndex.shared()
+    index = WordIndex.configure(str(tmp_path / 'guesses.txt'), str(tmp_path / 'answers.txt'), 7)
+    yield index
+    WordIndex.set_shared(previous)
+
+def test_seven_letter_words(seven_letter_words):
+    index = seven_letter_words
+    assert index.length == 7
+    # Words of other lengths or with other characters are skipped
+    assert len(index.guesses) == 13
+    assert index.starting_word('SLATE') is None
+    for options in [dict(), dict(exact_feedback = True), dict(backend = 'bitmask')]:
+        for answer in index.answers:
+            solution = Solver(answer, **options).solve(None)
+            assert solution.word == answer
+            assert solution.guess_count <= 6
+    solver = Solver()
+    solver.guess('PLANETS', 'PLA____', 'ST')
+    assert str(solver.puzzle.feedback).startswith('--Green: PLA****,')
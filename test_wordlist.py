@@ -0,0 +1,36 @@
+import pytest
+from wordlist import WordList
+
+def test_packs_words():
+    words = WordList.from_words(['SLATE', 'CRONY', 'HOUND'])
+    assert len(words) == 3
+    assert words.data == b'SLATECRONYHOUND'
+    assert list(words) == ['SLATE', 'CRONY', 'HOUND']
+    assert words[1] == 'CRONY' and words[-1] == 'HOUND'
+    assert words[0:2] == ['SLATE', 'CRONY']
+    # Every read of a word by position gives the same str object
+    assert words[2] is words[2:3][0]
+
+def test_index_only_matches_whole_words():
+    words = WordList.from_words(['ABCDE', 'FGHIJ'])
+    assert words.index('FGHIJ') == 1
+    assert 'CDEFG' not in words
+    assert 'ABCD' not in words
+    assert 'ABCDE' in words
+    with pytest.raises(ValueError):
+        words.index('BCDEF')
+
+def test_lengths_must_match():
+    with pytest.raises(ValueError):
+        WordList.from_words(['SLATE', 'CRANES'])
+    with pytest.raises(ValueError):
+        WordList.from_words(['SLATE']) + WordList.from_words(['CRANES'])
+    joined = WordList.from_words(['SLATE']) + WordList.from_words(['CRONY'])
+    assert list(joined) == ['SLATE', 'CRONY']
+
+def test_without_leaves_the_list_alone():
+    words = WordList.from_words(['SLATE', 'CRONY', 'HOUND'])
+    assert list(words.without('CRONY')) == ['SLATE', 'HOUND']
+    assert words.without('ROUND') is words
+    assert list(words) == ['SLATE', 'CRONY', 'HOUND']
+    assert words.find('HOUND') == 2 and words.find('ROUND') == -1 and words.find(None) == -1
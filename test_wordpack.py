@@ -0,0 +1,29 @@
+import wordpack
+from wordle_solver import WordIndex
+
+def write_pack(guess_file, answer_file, directory, length = None):
+    digest = wordpack.source_digest(guess_file, answer_file, length)
+    wordpack.write(WordIndex(guess_file, answer_file, length), wordpack.pack_path(digest, directory), digest)
+
+def test_pack_matches_text(tmp_path):
+    write_pack('nyt-guesses.txt', 'nyt-answers.txt', str(tmp_path))
+    text = WordIndex()
+    packed = WordIndex.open('nyt-guesses.txt', 'nyt-answers.txt', cache_directory = str(tmp_path))
+    assert isinstance(packed.guess_scores, memoryview)
+    assert packed.guesses == text.guesses
+    assert packed.answers == text.answers
+    assert packed.guess_words == text.guess_words
+    assert list(packed.guess_scores) == list(text.guess_scores)
+    assert list(packed.answer_scores) == list(text.answer_scores)
+    assert repr(list(packed.frequency.values())) == repr(list(text.frequency.values()))
+    assert packed.guess_letters == text.guess_letters
+
+def test_stale_pack_is_ignored(tmp_path):
+    answers = tmp_path / 'answers.txt'
+    answers.write_text('HOUND\nMOUND\nBOUND\n')
+    write_pack(str(answers), str(answers), str(tmp_path))
+    assert isinstance(WordIndex.open(str(answers), str(answers), cache_directory = str(tmp_path)).guess_scores, memoryview)
+    answers.write_text('HOUND\nMOUND\nROUND\n')
+    index = WordIndex.open(str(answers), str(answers), cache_directory = str(tmp_path))
+    assert not isinstance(index.guess_scores, memoryview)
+    assert 'ROUND' in index.answers
@@ -1,16 +1,28 @@
 #!/usr/bin/env python3
 from wordle_solver import Solver
+from wordle_solver import WordIndex
+from speculation import Speculator
 import argparse
 
 parser = argparse.ArgumentParser(description='Use -s to get suggestions')
 parser.add_argument('-s', '--suggest', action="store_true", dest="suggest", help="Get suggestions")
-should_suggest = parser.parse_args().suggest
+parser.add_argument('-d', '--dictionary', action="store", dest="dictionary", help="File of possible answers (also used for guesses unless -g is given)")
+parser.add_argument('-g', '--guesses', action="store", dest="guesses", help="File of words that may be guessed")
+parser.add_argument('-l', '--length', action="store", dest="length", type=int, help="Only use words with this many letters")
+parser.add_argument('-ns', '--no-speculate', action="store_true", dest="no_speculate", help="Don't work out suggestions while feedback is being typed")
+parser.add_argument('-p', '--precompute-stats', action="store_true", dest="precompute_stats", help="Print how often the suggestion was worked out before the feedback was entered")
+args = parser.parse_args()
+should_suggest = args.suggest
+index = WordIndex.configure(args.guesses, args.dictionary, args.length)
+# Built here so the background thread never has to
+index.guess_letters
+speculator = Speculator() if not args.no_speculate else None
 
 def suggest(guess):
     if should_suggest:
         print(f'Your next guess should be: {guess}')
 
-WORD_LENGTH = 5
+WORD_LENGTH = index.length
 def has_duplicate_letters(word):
     letters = set([letter for letter in word])
     return len(letters) < WORD_LENGTH
@@ -19,7 +31,7 @@ def get_green():
     if has_duplicate_letters(word):
         green = input('Please enter green letters in a string like \'__A__\' (press ENTER for none)\n> ')
         while len(green) != 0 and len(green) != WORD_LENGTH:
-            green = input("Please exactly five characters using '_' for non-green letters. Example: __A__\n> ")
+            green = input(f"Please exactly {WORD_LENGTH} characters using '_' for non-green letters. Example: __A__\n> ")
     else:
         green = input('Please enter green letters (press ENTER for none)\n> ')
         green_string = ""
@@ -30,17 +42,23 @@ def get_green():
     return green.upper()
 
 solver = Solver()
-word = input('What is your first word guess? (press ENTER for SLATE) \n> ')
-if len(word) < 5:
-    word = "SLATE"
+starting_word = index.starting_word('SLATE') or solver.next_guess()
+word = input(f'What is your first word guess? (press ENTER for {starting_word}) \n> ')
+if len(word) < WORD_LENGTH:
+    word = starting_word
 is_solved = False
 while not is_solved:
     word = word.strip().upper()
     print(f'You entered: {word}')
+    # Work out the next guess for the likeliest feedback while it is being typed
+    if speculator is not None:
+        speculator.start(solver, word)
     green = get_green()
 
     if green == word:
         is_solved = True
+        if speculator is not None:
+            speculator.cancel()
         solver.guess(word, word, None)
         break
     if len(green) == 0:
@@ -48,15 +66,21 @@ while not is_solved:
     yellow = input('Please enter yellow letters (press ENTER for none)\n> ')
     if len(yellow) == 0:
         yellow = None
-    solver.guess(word, green, yellow)
-    guess = solver.next_guess()
+    speculated = speculator.take(word, green, yellow) if speculator is not None else None
+    if speculated is not None:
+        solver, guess = speculated
+    else:
+        solver.guess(word, green, yellow)
+        guess = solver.next_guess()
 
     print(f'{solver.answer_count()} possible answers')
     suggest(guess)
     hint = f' (press Enter for {guess}' if should_suggest else ''
     word = input(f'What is your next guess?{hint}\n> ')
-    if len(word) < 5:
+    if len(word) < WORD_LENGTH:
         word = guess
     is_solved = solver.is_solved()
 
 print(f'You won in {len(solver.guesses())} guesses! 🎉')
+if args.precompute_stats and speculator is not None:
+    print(speculator)
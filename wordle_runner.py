@@ -1,87 +1,110 @@
 #!/usr/bin/env python3
-from termcolor import colored
-
+# termcolor and matplotlib are only imported when a sweep needs them, so quick queries start fast
 from wordle_solver import Solver
 from wordle_solver import Dictionary
-import matplotlib.pyplot as plt
+from wordle_solver import solve_all
+from wordle_solver import WordIndex
+from wordle_solver import read_words
+from batch_solver import BatchSolver
+from guess_cache import GuessCache
+from policy import Policy
+from strategies import STRATEGIES
+from instrumentation import STATS
 import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+FORMATS = ['text', 'csv', 'jsonl']
+# Streamed rows are flushed at least this often, so a sweep can be followed with tail -f
+FLUSH_SECONDS = 1.0
 
 parser = argparse.ArgumentParser(description='Use -d to test a dictionary')
 parser.add_argument('-w', '--word', action="store", dest="word", help="Test one word")
-parser.add_argument('-r', '--rank', action="store", dest="rank", help="Get word rank")
-parser.add_argument('-s', '--score', action="store", dest="score", help="Get word score")
-parser.add_argument('-d', '--dictionary', action="store", dest="dictionary", help="Run a dictionary file")
+parser.add_argument('-r', '--rank', action="store", dest="rank", help="Get word rank, several words can be given separated by commas or in a file")
+parser.add_argument('-s', '--score', action="store", dest="score", help="Get word score, several words can be given separated by commas or in a file")
+parser.add_argument('-k', '--top', action="store", dest="top", type=int, help="List this many highest scoring words (of those given with --score, if any)")
+parser.add_argument('-d', '--dictionary', action="store", dest="dictionary", help="Run a dictionary file (also used for guesses unless -g is given)")
+parser.add_argument('-g', '--guesses', action="store", dest="guesses", help="File of words that may be guessed")
+parser.add_argument('-l', '--length', action="store", dest="length", type=int, help="Only use words with this many letters, e.g. with /usr/share/dict/words")
 parser.add_argument('-di','--disable-intersecting', action="store_true", dest="disable_intersecting", help="Disable intersecting guesses")
-args = parser.parse_args()
-use_intersecting = not args.disable_intersecting
-if args.rank:
-    print(Dictionary().rank_of(args.rank))
-elif args.score:
-    print(Dictionary().score_of(args.score))
-elif args.word:
-    solution = Solver(args.word.strip().upper(), use_intersecting).solve('SLATE')
-    print("Solved: " + solution.word + " in " + str(solution.guess_count) + " guesses: ")
-    print(', '.join(solution.guesses))
-else:
-    starting_word = "SLATE"
-    dictionary = (args.dictionary if args.dictionary else "nyt-answers.txt")
-    count = 0
-    scores = dict()
-    guess_count = 0
-    maximum = 0
-    hardest_words = list()
-    avg = 0
-    for word in Dictionary().answers:
-        count += 1
-        solution = Solver(word, use_intersecting).solve(starting_word)
-        guess_count += solution.guess_count
-        if solution.guess_count > 6:
-            hardest_words.append(word)
-        if solution.guess_count > maximum:
-            maximum = solution.guess_count
-        avg = round(guess_count / count, 4)
-        color = 'red'
-        if solution.guess_count < 4:
-            color = 'green'
-        elif solution.guess_count < 5:
-            color = 'yellow'
-        output = str(avg).ljust(6) + " " + solution.word + "(" + str(solution.guess_count) + "): " + str(', '.join(solution.guesses))
-        print(colored(output, color))
-
-        if solution.guess_count not in scores:
-            scores[solution.guess_count] = {'count':1, 'words':[]}
-            scores[solution.guess_count]['words'].append(solution.word)
+parser.add_argument('-st', '--strategy', action="store", dest="strategy", default="heuristic", choices=['heuristic'] + list(STRATEGIES.keys()), help="How guesses are picked")
+parser.add_argument('-x', '--exact', action="store_true", dest="exact", help="Use real Wordle feedback for duplicate letters (the strategies score guesses with it either way)")
+parser.add_argument('-P', '--policy', action="store", dest="policy", help="Starting word, intersecting window and ranking, e.g. starting_word=CRANE,intersecting_below=40 or a JSON file (see policy.py)")
+parser.add_argument('-j', '--jobs', action="store", dest="jobs", type=int, default=1, help="Solve answers across this many processes (0 for one per core)")
+parser.add_argument('-b', '--batch', action="store_true", dest="batch", help="Solve all answers in lockstep, sharing guesses between games in the same state")
+parser.add_argument('-T', '--trace', action="store", dest="trace", help="Write every game's turns (guess, feedback, candidates, time) to this JSONL file")
+parser.add_argument('-nm', '--no-memo', action="store_true", dest="no_memo", help="Don't remember guesses across games (see guess_cache.py)")
+parser.add_argument('-M', '--memo', action="store", dest="memo", help="Load remembered guesses from this file and save them back when done")
+parser.add_argument('-f', '--format', action="store", dest="format", default="text", choices=FORMATS, help="How each solved word is printed: colored text, or CSV/JSONL rows for piping")
+parser.add_argument('-o', '--output', action="store", dest="output", help="Write each solved word to this file instead of the terminal")
+parser.add_argument('-np', '--no-plot', action="store_true", dest="no_plot", help="Don't draw the bar chart of guesses per answer (no matplotlib needed)")
+parser.add_argument('-p', '--profile', action="store_true", dest="profile", help="Print time spent filtering and searching for intersecting words")
+
+class ResultWriter:
+    """
+    Writes a row per solved word as it comes in, flushing every FLUSH_SECONDS rather than every row
+    """
+    def __init__(self, format, stream):
+        self.format = format
+        self.stream = stream
+        self.last_flush = time.perf_counter()
+        if format == 'text':
+            from termcolor import colored
+            self.colored = colored
+        elif format == 'csv':
+            self.csv = csv.writer(stream)
+            self.csv.writerow(['word', 'guess_count', 'guesses', 'average'])
+
+    def write(self, solution, average):
+        if self.format == 'csv':
+            self.csv.writerow([solution.word, solution.guess_count, ' '.join(solution.guesses), average])
+        elif self.format == 'jsonl':
+            self.stream.write(json.dumps({'word': solution.word, 'guess_count': solution.guess_count, 'guesses': solution.guesses, 'average': average}) + '\n')
         else:
-            scores[solution.guess_count]['count'] += 1
-            scores[solution.guess_count]['words'].append(solution.word)
-
-    sorted_scores = dict(sorted(scores.items(), key = lambda x: x[0]))
-    names = list(sorted_scores.keys())
-    values = list(map(lambda x: x['count'], sorted_scores.values()))
-    words = list(map(lambda x: ', '.join(x[1]['words']) if x[0] > 6 else str(len(x[1]['words'])), sorted_scores.items()))
-    for index, name in enumerate(names):
-        print(str(name) + ": " + words[index])
-    print(f'Total Words: {count}, Total Guesses: {guess_count}')
-
-    # Write the results to a txt file
-    filename = f'results-{starting_word}-{avg}'
-    f = open(f'{filename}.txt', "w")
-    for index, name in enumerate(names):
-        f.write(f'{str(name)}: {words[index]}\n')
-    f.close()
+            color = 'red'
+            if solution.guess_count < 4:
+                color = 'green'
+            elif solution.guess_count < 5:
+                color = 'yellow'
+            output = str(average).ljust(6) + " " + solution.word + "(" + str(solution.guess_count) + "): " + str(', '.join(solution.guesses))
+            self.stream.write(self.colored(output, color) + '\n')
+        now = time.perf_counter()
+        if now - self.last_flush > FLUSH_SECONDS:
+            self.stream.flush()
+            self.last_flush = now
+
+    def close(self):
+        if self.stream is sys.stdout:
+            self.stream.flush()
+        else:
+            self.stream.close()
+
+def word_arguments(value):
+    """
+    Words for --rank and --score: a file with one word per line, or words separated by commas
+    """
+    if os.path.isfile(value):
+        return read_words(value)
+    return [word.strip().upper() for word in value.split(',') if word.strip()]
+
+def plot(filename, names, values):
+    import matplotlib.pyplot as plt
 
     # Draw a "histogram", actually just a bar chart in this case
     fig, ax = plt.subplots(1,1)
-    plt.bar(range(len(sorted_scores)), values, tick_label=names, color=(96.0/255.0, 160.0/255.0, 94.0/255.0, 1.0))
+    plt.bar(range(len(names)), values, tick_label=names, color=(96.0/255.0, 160.0/255.0, 94.0/255.0, 1.0))
     ax.set_xlabel('Guesses per answer')
     ax.set_ylabel('Words solved')
 
     # Get rid of the border and tick marks which look cheap
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
-#ax.spines['bottom'].set_visible(False)
+    #ax.spines['bottom'].set_visible(False)
     ax.spines['left'].set_visible(False)
-#    ax.get_xaxis().set_ticks([])
+    #    ax.get_xaxis().set_ticks([])
     ax.get_yaxis().set_ticks([])
 
     rects = ax.patches
@@ -91,3 +114,123 @@ else:
                 ha='center', va='bottom')
 
     plt.savefig(f'{filename}.png')
+
+def main():
+    args = parser.parse_args()
+    use_intersecting = not args.disable_intersecting
+    index = WordIndex.configure(args.guesses, args.dictionary, args.length)
+    try:
+        policy = Policy.parse(args.policy) if args.policy else Policy()
+    except (ValueError, TypeError) as e:
+        parser.error(f'--policy: {e}')
+    starting_word = index.starting_word(policy.starting_word)
+    if args.rank:
+        words = word_arguments(args.rank)
+        if len(words) == 1:
+            print(Dictionary().rank_of(words[0]))
+        else:
+            dictionary = Dictionary()
+            count = len(dictionary.guesses)
+            for word, rank in zip(words, dictionary.ranks_of(words)):
+                print(f'{word} {rank}/{count}' if rank is not None else f'{word} -')
+    elif args.top:
+        words = word_arguments(args.score) if args.score else None
+        for word, score in Dictionary().top_scores(args.top, words):
+            print(f'{word} {score}')
+    elif args.score:
+        words = word_arguments(args.score)
+        if len(words) == 1:
+            print(Dictionary().score_of(words[0]))
+        else:
+            for word, score in zip(words, Dictionary().scores_of(words)):
+                print(f'{word} {score if score is not None else "-"}')
+    elif args.word:
+        solution = Solver(args.word.strip().upper(), use_intersecting, exact_feedback = args.exact, strategy = args.strategy, policy = policy).solve(starting_word)
+        print("Solved: " + solution.word + " in " + str(solution.guess_count) + " guesses: ")
+        print(', '.join(solution.guesses))
+    else:
+        jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+        if args.trace and args.batch:
+            parser.error('--trace needs each game solved on its own, it cannot be used with --batch')
+        if args.profile:
+            if jobs > 1:
+                parser.error('--profile only counts work done in this process, it cannot be used with --jobs')
+            STATS.enabled = True
+        if args.memo and args.no_memo:
+            parser.error('--memo and --no-memo cannot be used together')
+        memo = not args.no_memo and not args.batch
+        if args.memo:
+            GuessCache.shared().load(args.memo)
+        trace = open(args.trace, 'w') if args.trace else None
+        rows = ResultWriter(args.format, open(args.output, 'w', newline = '') if args.output else sys.stdout)
+        # Keep rows piped to stdout parseable by sending the summary elsewhere
+        summary = sys.stderr if args.format != 'text' and not args.output else sys.stdout
+        count = 0
+        scores = dict()
+        guess_count = 0
+        maximum = 0
+        hardest_words = list()
+        avg = 0
+        start = time.perf_counter()
+        if args.batch:
+            solutions = BatchSolver(use_intersecting = use_intersecting, exact_feedback = args.exact, strategy = args.strategy, policy = policy).solve(Dictionary().answers, starting_word)
+        else:
+            solutions = solve_all(Dictionary().answers, starting_word, jobs, use_intersecting = use_intersecting, exact_feedback = args.exact, strategy = args.strategy, trace = trace is not None, cache = memo, policy = policy)
+        for solution in solutions:
+            if trace is not None:
+                trace.write(json.dumps({'word': solution.word, 'guess_count': solution.guess_count, 'turns': solution.trace}) + '\n')
+            word = solution.word
+            count += 1
+            guess_count += solution.guess_count
+            if solution.guess_count > 6:
+                hardest_words.append(word)
+            if solution.guess_count > maximum:
+                maximum = solution.guess_count
+            avg = round(guess_count / count, 4)
+            rows.write(solution, avg)
+
+            if solution.guess_count not in scores:
+                scores[solution.guess_count] = {'count':1, 'words':[]}
+                scores[solution.guess_count]['words'].append(solution.word)
+            else:
+                scores[solution.guess_count]['count'] += 1
+                scores[solution.guess_count]['words'].append(solution.word)
+
+        sorted_scores = dict(sorted(scores.items(), key = lambda x: x[0]))
+        names = list(sorted_scores.keys())
+        values = list(map(lambda x: x['count'], sorted_scores.values()))
+        words = list(map(lambda x: ', '.join(x[1]['words']) if x[0] > 6 else str(len(x[1]['words'])), sorted_scores.items()))
+        rows.close()
+        for index, name in enumerate(names):
+            print(str(name) + ": " + words[index], file = summary)
+        print(f'Total Words: {count}, Total Guesses: {guess_count}', file = summary)
+        elapsed = time.perf_counter() - start
+        print(f'Solved in {round(elapsed, 2)}s ({round(count / elapsed)} games/sec)', file = summary)
+        if trace is not None:
+            trace.close()
+        if args.profile:
+            print(STATS, file = summary)
+            if memo and jobs <= 1:
+                print(GuessCache.shared(), file = summary)
+        if args.memo:
+            GuessCache.shared().save(args.memo)
+
+        # Write the results to a txt file
+        strategy = f'-{args.strategy}' if args.strategy != 'heuristic' else ''
+        strategy += '-exact' if args.exact else ''
+        filename = f'results-{starting_word if starting_word else index.length}{strategy}-{avg}'
+        f = open(f'{filename}.txt', "w")
+        for index, name in enumerate(names):
+            f.write(f'{str(name)}: {words[index]}\n')
+        f.close()
+
+        if not args.no_plot:
+            plot(filename, names, values)
+
+if __name__ == '__main__':
+    try:
+        main()
+    except BrokenPipeError:
+        # Whatever rows were piped into stopped reading (e.g. head), don't complain on exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
@@ -1,17 +1,79 @@
-import re
+import sys
+import array
+import collections
 import functools
+import gc
+import bisect
+import heapq
+import itertools
 import os
 
-LOGGING = False
+from patterns import PatternMatrix
+from patterns import CACHE_DIRECTORY
+from patterns import words_digest
+from patterns import pattern as feedback_pattern
+from patterns import presence_pattern
+from patterns import to_string as pattern_string
+from patterns import decode as decode_pattern
+from patterns import solved as solved_pattern
+from patterns import GRAY, GREEN
+from puzzle import MaskIndex
+from puzzle import LETTER_A
+from strategies import get_strategy
+from guess_cache import GuessCache
+from policy import DEFAULT_POLICY
+from wordlist import WordList
+import wordpack
+from instrumentation import STATS
+from instrumentation import clock
+from instrumentation import env_flag
+
+# Read once, callers check LOGGING before building log messages
+LOGGING = env_flag('WORDLE_LOGGING')
 #DICTIONARY = "/usr/share/dict/words"
-GUESSING_DICTIONARY = "./nyt-guesses.txt"
-ANSWER_DICTIONARY = "./nyt-answers.txt"
+# Next to this file, so the solver works from any directory
+GUESSING_DICTIONARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nyt-guesses.txt')
+ANSWER_DICTIONARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nyt-answers.txt')
+# Length of the NYT words, the actual length is taken from the word lists (WordIndex.length)
 WORD_LENGTH = 5
+# Ways Dictionary can prune answers from LetterFeedback
+#  python: a predicate per word
+#  bitmask: bit-sliced per position masks evaluated against every word at once (see puzzle.MaskIndex)
+BACKENDS = ('python', 'bitmask')
 
-def log(string):
-    logging = int(os.getenv('WORDLE_LOGGING')) == 1 if os.getenv('WORDLE_LOGGING') else False
-    if logging:
-        print(string)
+def log(*strings, sep = ' '):
+    if LOGGING:
+        print(*strings, sep = sep)
+
+def read_words(filename, length = None):
+    """
+    Returns the words in a file, one per line, in upper case.
+    length: if given, only words of that many letters from A to Z are kept (once each), so a
+    general dictionary like /usr/share/dict/words can be used
+    """
+    with open(filename, 'r') as words:
+        word_arr = [word.strip() for word in words.read().upper().splitlines()]
+
+    if length is not None:
+        word_arr = list(dict.fromkeys(word for word in word_arr if len(word) == length and word.isascii() and word.isalpha()))
+    return word_arr
+
+@functools.lru_cache(maxsize = None)
+def pattern_matrix():
+    """
+    The process-wide PatternMatrix for every guessable word against every answer.
+    Rows are guesses followed by answers, exactly as the word files list them.
+    """
+    index = WordIndex.shared()
+    return PatternMatrix(index.guess_words + index.answer_words, index.answer_words)
+
+@functools.lru_cache(maxsize = None)
+def mask_index():
+    """
+    The process-wide MaskIndex over every guessable word and answer
+    """
+    index = WordIndex.shared()
+    return MaskIndex(index.guess_words + index.answer_words)
 
 class UnsupportedAnswer(Exception):
     """Used when Solver is initialized with an unsupported word"""
@@ -21,23 +83,31 @@ class UnsupportedAnswer(Exception):
         return "This word is not a supported answer"
 
 class LetterFrequency:
-    def __init__(self, letter, position):
+    """
+    A view of one letter's counts in WordIndex.letter_counts, by position and in total
+    """
+    __slots__ = ('letter', 'counts', 'row', 'length', 'total')
+
+    def __init__(self, letter, counts, totals, length):
         self.letter = letter
-        self.by_position = {0:0,1:0,2:0,3:0,4:0}
-        self.total = 0
-        self.by_position[position] = 1
+        self.counts = counts
+        self.row = (ord(letter) - LETTER_A) * length
+        self.length = length
+        self.total = totals[ord(letter) - LETTER_A]
 
-    def add(self, position):
-        self.by_position[position] += 1
-        self.total += 1
+    @property
+    def by_position(self):
+        return dict((position, self.counts[self.row + position]) for position in range(0, self.length))
 
     def __getitem__(self, item):
-        return self.by_position[item]
+        return self.counts[self.row + item]
 
     def __repr__(self):
         return f'{self.letter}:{self.total}:{self.by_position}'
 
 class PositionLetters:
+    __slots__ = ('letter', 'position', 'score')
+
     def __init__(self, letter, position, score):
         self.letter = letter
         self.position = position
@@ -49,42 +119,187 @@ class PositionLetters:
     def __repr__(self):
         return f'{self.letter}:{self.score}'
 
-class Dictionary:
-    def __init__(self, use_intersecting = True):
-        guesses = self.get_words('nyt-guesses.txt')
-        answers = self.get_words('nyt-answers.txt')
-        self.frequency = self._generate_letter_frequency(answers)
+class WordIndex:
+    """
+    Word lists, letter frequencies and scores. These never change during a game, so they are
+    loaded once per process (see WordIndex.shared) and every Dictionary refers to the same index.
+    Forked worker processes share it copy-on-write.
+    """
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the process-wide WordIndex, loading it on first use
+        """
+        if cls._shared is None:
+            cls._shared = cls.open()
+        return cls._shared
+
+    @classmethod
+    def set_shared(cls, index):
+        """
+        Makes index the process-wide WordIndex, e.g. to play with another dictionary.
+        Games already started keep the index they were created with.
+        """
+        cls._shared = index
+        pattern_matrix.cache_clear()
+        mask_index.cache_clear()
+
+    @classmethod
+    def configure(cls, guess_file = None, answer_file = None, length = None):
+        """
+        Sets up the shared index from command line options and returns it. An answer file on its own
+        is used for guesses too, and nothing given leaves the NYT lists in place.
+        """
+        if guess_file is None and answer_file is None and length is None:
+            return cls.shared()
+        if guess_file is None:
+            guess_file = answer_file if answer_file is not None else GUESSING_DICTIONARY
+        if answer_file is None:
+            answer_file = ANSWER_DICTIONARY
+        cls.set_shared(cls.open(guess_file, answer_file, length))
+        return cls._shared
+
+    @classmethod
+    def open(cls, guess_file = GUESSING_DICTIONARY, answer_file = ANSWER_DICTIONARY, length = None, cache_directory = CACHE_DIRECTORY):
+        """
+        Returns the WordIndex for these word lists from their word pack (see wordpack.py) if one
+        has been built in cache_directory, otherwise reads and scores the words
+        """
+        digest = wordpack.source_digest(guess_file, answer_file, length)
+        sections = wordpack.read(wordpack.pack_path(digest, cache_directory), digest)
+        if sections is None:
+            return cls(guess_file, answer_file, length)
+        index = cls.__new__(cls)
+        index._load(sections)
+        return index
+
+    def starting_word(self, word = 'SLATE'):
+        """
+        Returns word if it can be guessed with these word lists, otherwise None so the solver picks one
+        """
+        return word if word and (word in self.guess_words or word in self.answer_words) else None
+
+    def __init__(self, guess_file = GUESSING_DICTIONARY, answer_file = ANSWER_DICTIONARY, length = None):
+        """
+        length: only use words of this many letters (see read_words). By default every word must
+        have the same length as the first answer.
+        """
+        answer_words = read_words(answer_file, length)
+        guess_words = read_words(guess_file, length)
+        if length is None:
+            length = len(answer_words[0])
+        self.length = length
+
+        # Words in the order the files list them, packed into bytes
+        self.guess_words = WordList.from_words(guess_words, length)
+        self.answer_words = WordList.from_words(answer_words, length)
+        # Letter counts are kept for A to Z only
+        for words in [self.guess_words, self.answer_words]:
+            if len(words) > 0 and not words.data.isalpha():
+                raise ValueError(f'Words must only have the letters A to Z, {words} has others')
+
+        self.letter_counts, self.letter_totals = self._count_letters(answer_words)
+        # Letters in the order they first appear in the answers
+        letters = dict.fromkeys(letter for word in answer_words for letter in word)
+        self.frequency = dict((letter, LetterFrequency(letter, self.letter_counts, self.letter_totals, length)) for letter in letters)
         self.letters_by_position = self._sort_letters()
 
-        self.word_scores = self._word_scores(guesses + answers, False)
-        self.guesses = self._sort_by_score(self.word_scores)
-        self.answers = self._sort_by_score(self._word_scores(answers))
+        # Answers are usually guesses too, only score them once
+        words = list(dict.fromkeys(map(sys.intern, itertools.chain(guess_words, answer_words))))
+        # Both sorted by score, highest first, with a parallel array of their scores:
+        # guesses by letter frequency in any position, answers by letter frequency in their positions
+        self.guesses, self.guess_scores = self._sort_by_score(words, self._word_scores(words, False))
+        answers = list(dict.fromkeys(map(sys.intern, answer_words)))
+        self.answers, self.answer_scores = self._sort_by_score(answers, self._word_scores(answers))
 
-        self.feedback = LetterFeedback()
+    def _load(self, sections):
+        """
+        Sets everything __init__ computes from the sections of a word pack. Words are decoded, the
+        numeric tables are used as they are in the mapped file.
+        """
+        self.length = length = sections['length']
+        self.guess_words = WordList(sections['guess_words'], length)
+        self.answer_words = WordList(sections['answer_words'], length)
+        self.letter_counts = sections['letter_counts']
+        self.letter_totals = sections['letter_totals']
+        letters = bytes(sections['letters']).decode('ascii')
+        self.frequency = dict((letter, LetterFrequency(letter, self.letter_counts, self.letter_totals, length)) for letter in letters)
+        self.letters_by_position = self._sort_letters()
+        self.guesses = WordList(sections['guesses'], length)
+        self.guess_scores = sections['guess_scores']
+        self.answers = WordList(sections['answers'], length)
+        self.answer_scores = sections['answer_scores']
 
-        self.use_intersecting_guesses = use_intersecting
+    @functools.cached_property
+    def guess_letters(self):
+        """
+        Two arrays parallel to guesses: the bit mask of each guess's distinct letters, and its
+        positional word score. Used to score intersecting words without looking at their letters again
+        """
+        masks = array.array('I', bytes(4 * len(self.guesses)))
+        for id, word in enumerate(self.guesses):
+            mask = 0
+            for letter in word:
+                mask |= 1 << (ord(letter) - LETTER_A)
+            masks[id] = mask
+        return masks, array.array('I', self._word_scores(self.guesses))
 
-    def get_words(self, filename):
-        word_arr = []
-        with open(filename, 'r') as words:
-            for word in words:
-                word_arr.append(word.strip().upper())
-
-        return word_arr
-
-    def _generate_letter_frequency(self, target_words):
-        """ Returns a dictionary of letters with their corresponding frequencies
-        target_words: list of words
-        """
-        frequency = dict()
-        for word in target_words:
-            for position, letter in enumerate(word):
-                if letter not in frequency:
-                    frequency[letter] = LetterFrequency(letter, position)
-                else:
-                    lett = frequency[letter]
-                    lett.add(position)
-        return frequency
+    @functools.cached_property
+    def answers_by_letter(self):
+        """
+        answers ranked like the guesses, by how common their letters are in any position, for
+        Policy(by_position = False). Ties keep their order in answers.
+        """
+        return self._sort_by_score(list(self.answers), self._word_scores(self.answers, False))[0]
+
+    @functools.cached_property
+    def guess_ids(self):
+        """
+        Maps each guess to its position in guesses (and guess_scores), which is its rank from 0.
+        The words stay packed in guesses, this is only the index for looking them up
+        """
+        return dict((word, id) for id, word in enumerate(self.guesses))
+
+    @functools.cached_property
+    def answer_set(self):
+        return frozenset(self.answers)
+
+    def guess_id(self, word):
+        """
+        The position of word in guesses (and guess_scores), which is its rank from 0, or None
+        """
+        return self.guess_ids.get(word)
+
+    @functools.cached_property
+    def digest(self):
+        """
+        Identifies these word lists, e.g. in keys of the guess cache
+        """
+        return words_digest(self.guess_words, self.answer_words).hex()[0:16]
+
+    @property
+    def word_scores(self):
+        """
+        (word, score) for every guess, highest first
+        """
+        return tuple(zip(self.guesses, self.guess_scores))
+
+    def _count_letters(self, target_words):
+        """
+        Returns (counts, totals): how often every letter is in every position of target_words,
+        a 26 x length array indexed by letter * length + position, and each letter's total
+        """
+        length = self.length
+        counts = array.array('I', bytes(4 * 26 * length))
+        for position in range(0, length):
+            for letter, count in collections.Counter(word[position] for word in target_words).items():
+                counts[(ord(letter) - LETTER_A) * length + position] = count
+        # Totals have always been one short of the letter's count, which the word scores (and so the
+        # order of the guesses) are based on
+        totals = array.array('I', (max(0, sum(counts[row:row + length]) - 1) for row in range(0, 26 * length, length)))
+        return counts, totals
 
     def _sort_letters(self):
         """
@@ -92,105 +307,246 @@ class Dictionary:
         Values are arrays of PositionLetters which have the letter, index and word letter score
         """
         letters_by_position = dict()
-        for i in range(0,WORD_LENGTH):
+        for i in range(0,self.length):
             letters_by_position[i] = []
             for letter in self.frequency:
-                letters_by_position[i].append(PositionLetters(letter, i, self.frequency[letter].by_position[i]))
+                letters_by_position[i].append(PositionLetters(letter, i, self.frequency[letter][i]))
             letters_by_position[i] = sorted(letters_by_position[i], reverse = True)
 
         return letters_by_position
 
-    def _get_word_score(self, word, by_position = True):
+    def _letter_scores(self):
+        """
+        Returns a table of letter scores for each position, letters no answer has score 0
+        """
+        tables = []
+        for position in range(0, self.length):
+            tables.append(dict((chr(LETTER_A + number), self.letter_counts[number * self.length + position]) for number in range(0, 26)))
+        return tables
+
+    def get_word_score(self, word, by_position = True):
         """
         Returns score for word
         by_position: if true, then score will be based on letter position
         """
-        scores = dict()
-        if by_position:
-            for i, letter in enumerate(word):
-                this_score = self.frequency[letter][i]
-                # Don't give points for duplicate letters
-                # For duplicate letters, give the highest score
-                if letter not in scores or scores[letter] < this_score:
-                    scores[letter] = this_score
-        else:
-            for letter in word:
-                scores[letter] = self.frequency[letter].total
-        score = functools.reduce(lambda a, b: a + b, scores.values())
-        return score
+        return self._word_scores([word], by_position)[0]
 
     def _word_scores(self, words, by_position = True):
         """
-        Returns a sorted dictionary of words with word as key and score as value
+        Returns a list with the score of each word
         words: list of words
         by_position: if True then scores will be based on letter position
         """
-        word_dict = dict()
-        count = 0
+        if not by_position:
+            totals = dict((chr(LETTER_A + number), total) for number, total in enumerate(self.letter_totals)).__getitem__
+            return [sum(map(totals, set(word))) for word in words]
+
+        tables = self._letter_scores()
+        length = self.length
+        scores = []
         for word in words:
-                word_dict[word] = self._get_word_score(word, by_position)
-                count += 1
+            if len(set(word)) == length:
+                scores.append(sum(map(dict.__getitem__, tables, word)))
+                continue
+            # Don't give points for duplicate letters
+            # For duplicate letters, give the highest score
+            best = dict()
+            for letter, table in zip(word, tables):
+                score = table[letter]
+                if best.get(letter, -1) < score:
+                    best[letter] = score
+            scores.append(sum(best.values()))
+        return scores
+
+    def _sort_by_score(self, words, scores):
+        """
+        Returns words as a WordList and scores as an array, both sorted by score, highest first
+        """
+        order = sorted(range(0, len(words)), key = scores.__getitem__, reverse = True)
+        return WordList.from_words([words[i] for i in order], self.length), array.array('I', (scores[i] for i in order))
 
-        sorted_word_dict = sorted(word_dict.items(), key = lambda item: item[1], reverse = True)
-        return sorted_word_dict
+def _without(words, word):
+    """
+    Returns words without word as a new list, or words itself if word isn't in it. Words are unique,
+    so slicing around the one copy is much faster than filtering the whole list.
+    """
+    if isinstance(words, WordList):
+        return words.without(word)
+    try:
+        index = words.index(word)
+    except ValueError:
+        return words
+    remaining = list(words[0:index])
+    remaining.extend(words[index + 1:])
+    return remaining
 
-    def _sort_by_score(self, scores):
-        sorted_word_arr = list(map(lambda x: x[0], scores))
-        return sorted_word_arr
+class Dictionary:
+    """
+    The state of one game: the answers and guesses still available and the feedback so far.
+    Everything else lives in the shared WordIndex, so creating a Dictionary is cheap.
+    """
+    def __init__(self, use_intersecting = True, backend = 'python', index = None, strategy = None, cache = None, policy = None):
+        """
+        backend: one of BACKENDS, used to prune answers from feedback
+        index: the WordIndex to play with, WordIndex.shared() by default
+        strategy: a strategies.Strategy (or its name) to pick guesses by how they partition the answers,
+        None (or 'heuristic') for the top scoring answer/intersecting word
+        cache: a guess_cache.GuessCache to remember guesses in across games, True for GuessCache.shared()
+        policy: a policy.Policy, the thresholds and ranking the heuristic guesses use
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown backend {backend}, expected one of {BACKENDS}')
+        self.backend = backend
+        self.strategy = get_strategy(strategy)
+        self.index = index if index is not None else WordIndex.shared()
+        if cache is True:
+            cache = GuessCache.shared()
+        self.cache = cache if cache is not False else None
+        self.policy = policy if policy is not None else DEFAULT_POLICY
+
+        # This starts out as the index's own (immutable) sequence and is replaced,
+        # never modified, when it is pruned. Pruning keeps the order, so the first is the top scoring.
+        self.answers = self.index.answers if self.policy.by_position else self.index.answers_by_letter
+        # Guesses are the index's less these, so a game doesn't need its own copy of them
+        self.guessed = ()
+        # (guess, pattern) for answers pruned with filter_by_pattern
+        self.patterns = ()
+        # The guesses less those made, built when first asked for after a guess
+        self._guesses = None
+
+        self.feedback = LetterFeedback(self.index.length)
+
+        self.use_intersecting_guesses = use_intersecting
+
+    def copy(self):
+        """
+        Returns a Dictionary for the same game state that can be played on independently.
+        The word lists are shared since they are replaced rather than modified.
+        """
+        other = Dictionary.__new__(Dictionary)
+        other.__dict__.update(self.__dict__)
+        other.feedback = self.feedback.copy()
+        return other
+
+    @property
+    def guesses(self):
+        if len(self.guessed) == 0:
+            return self.index.guesses
+        if self._guesses is None:
+            guessed = set(self._guessed_ids())
+            self._guesses = [word for id, word in enumerate(self.index.guesses) if id not in guessed]
+        return self._guesses
+
+    @property
+    def frequency(self):
+        return self.index.frequency
+
+    @property
+    def letters_by_position(self):
+        return self.index.letters_by_position
+
+    @property
+    def word_scores(self):
+        return self.index.word_scores
+
+    def get_words(self, filename):
+        return read_words(filename)
+
+    def _get_word_score(self, word, by_position = True):
+        return self.index.get_word_score(word, by_position)
 
     def register_guess(self, guess):
         """
         Call this after a guess is actually made. It will make sure guesses are removed from available answers and guess words.
         guess: the word to remove
         """
-        log(f'GUESSING: {guess}')
-        if guess in self.answers:
-            self.answers.remove(guess)
-        if guess in self.guesses:
-            self.guesses.remove(guess)
+        if LOGGING:
+            log(f'GUESSING: {guess}')
+        if guess in self.index.answer_set:
+            self.answers = _without(self.answers, guess)
+        if guess not in self.guessed:
+            self.guessed += (guess,)
+            self._guesses = None
 
     def _update(self):
-        # Looping over words is costly, don't do it if we don't need to
-        if self.feedback.used() == 0:
+        # Looping over words is costly, don't do it if we don't need to:
+        # answers already satisfy everything up to the last update, so only new constraints are applied
+        if not self.feedback.has_changes():
+            return
+        if not STATS.enabled:
+            self._update_answers(self.feedback.take_changes())
             return
-        # always update answers first
-        self._update_answers()
+        before = len(self.answers)
+        start = clock()
+        self._update_answers(self.feedback.take_changes())
+        STATS.record('filter', clock() - start, before, len(self.answers))
 
-    def _word_should_be_saved(self, word):
+    def _word_should_be_saved(self, word, constraints = None):
         """
         Used internally to decide whether or not a word should be removed from a given word list
         based on LetterFeedback (greens, yellows, grays and used).
+        constraints: Constraints to check instead of all of the feedback
         """
-        # Don't save words that have YELLOW letters in YELLOW spots
-        for position, letters in self.feedback.yellow.items():
-            for letter in letters:
+        return self._predicate(constraints)(word)
+
+    def _predicate(self, constraints = None):
+        """
+        Returns a function for _word_should_be_saved with the constraints unpacked once,
+        so filtering a long list doesn't look them up again for every word
+        """
+        if constraints is None:
+            constraints = self.feedback
+        yellow = [(position, letter) for position, letters in constraints.yellow.items() for letter in letters]
+        gray = list(constraints.gray)
+        green = list(constraints.green.items())
+        minimum = list(constraints.minimum.items())
+        maximum = list(constraints.maximum.items())
+
+        def should_be_saved(word):
+            # Don't save words that have YELLOW letters in YELLOW spots
+            for position, letter in yellow:
                 if letter not in word or word[position] == letter:
                     return False
-        # Don't save words that have GRAY letters
-        for letter in self.feedback.gray:
-            if letter in word:
-                return False
-        # Don't save words that don't have GREEN letters in GREEN spots
-        for position, letter in self.feedback.green.items():
-            if word[position] != letter:
-                return False
+            # Don't save words that have GRAY letters
+            for letter in gray:
+                if letter in word:
+                    return False
+            # Don't save words that don't have GREEN letters in GREEN spots
+            for position, letter in green:
+                if word[position] != letter:
+                    return False
+            # Don't save words with too few or too many copies of a letter
+            for letter, count in minimum:
+                if word.count(letter) < count:
+                    return False
+            for letter, count in maximum:
+                if word.count(letter) > count:
+                    return False
+            return True
 
-        return True
+        return should_be_saved
 
-    def _word_should_be_saved_intersecting(self, word, letter_info):
-        for letter in letter_info.keys():
-            if letter in word:
-                return True
-        return False
-
-    def _get_intersecting_score(self, word, info):
-        score = 0
-        letters_matched = list()
-        for letter in word:
-            if letter in info and letter not in letters_matched:
-                letters_matched.append(letter)
-                score += info[letter]
-        return score
+    def _feedback_puzzle(self, constraints = None):
+        """
+        Translates LetterFeedback (or just the given Constraints) into a puzzle.Puzzle of allowed letters per position
+        Greens are applied before grays so a letter that is both rules out every word, like _word_should_be_saved
+        """
+        if constraints is None:
+            constraints = self.feedback
+        puzzle = mask_index().puzzle()
+        for position, letter in constraints.green.items():
+            puzzle.set_green(position, letter)
+        for position, letters in constraints.yellow.items():
+            for letter in letters:
+                puzzle.set_yellow(position, letter)
+                puzzle.set_minimum(letter, 1)
+        for letter in constraints.gray:
+            puzzle.set_gray(letter)
+        for letter, count in constraints.minimum.items():
+            puzzle.set_minimum(letter, count)
+        for letter, count in constraints.maximum.items():
+            puzzle.set_maximum(letter, count)
+        return puzzle
 
     def _find_best_intersecting_word(self):
         """
@@ -203,26 +559,46 @@ class Dictionary:
             This will sort all available guesses by their composition of these letters, favoring first those with the letters that occur the most times in the above answers and then will break ties using the word score of those scores.
             The word with the most of these letters is HUMID which narrows the answer list down to only one word:
                 HOUND
+
+            Every guess has a precomputed mask of its distinct letters (WordIndex.guess_letters), so its
+            intersecting score only depends on which targeted letters it has. That score is computed once
+            per combination of targeted letters, and a single pass over the guess ids (never decoding a
+            word) keeps the highest scoring guess, breaking ties with the positional word score and then
+            the order of self.guesses.
 """
         letter_info = self._find_letter_frequency_in_answers()
-        options = list(filter(lambda word: self._word_should_be_saved_intersecting(word, letter_info), self.guesses))
-        if len(options) == 0:
+        if len(letter_info) == 0:
             return None
 
-        # Creating a list of tuples with (word, word score)
-        options = list(map(lambda word: (word, self._get_intersecting_score(word, letter_info)), options))
-        options = sorted(options, key = lambda word: word[1], reverse = True)
-        log(f'Options: {options[0:20]}')
-
-        # take the top scoring words:
-        max_score = max(list(map(lambda score: score[1], options)))
-        highest_scoring = list(filter(lambda score: score[1] == max_score, options))
-        log(f'Max Score: {highest_scoring}')
-
-        # Sort by word score here, since they are all equally with intersecting score
-        highest_scoring = sorted(highest_scoring, key = lambda ws: self._get_word_score(ws[0]), reverse = True)
-        word = highest_scoring[0][0]
-        log(f'Highest scoring intersecting: {word}')
+        weights = [(1 << (ord(letter) - LETTER_A), count) for letter, count in letter_info.items()]
+        targeted = 0
+        for bit, _ in weights:
+            targeted |= bit
+
+        # Key is the targeted letters a guess has, value is their intersecting score
+        scores = {0: 0}
+        masks, word_scores = self.index.guess_letters
+        guessed = set(self._guessed_ids())
+        best_id = None
+        best = (0, 0)
+        for id, mask in enumerate(masks):
+            if guessed and id in guessed:
+                continue
+            mask &= targeted
+            score = scores.get(mask)
+            if score is None:
+                score = 0
+                for bit, count in weights:
+                    if mask & bit:
+                        score += count
+                scores[mask] = score
+            if score > best[0] or (score == best[0] and word_scores[id] > best[1] and score > 0):
+                best_id = id
+                best = (score, word_scores[id])
+
+        word = self.index.guesses[best_id] if best_id is not None else None
+        if LOGGING:
+            log(f'Highest scoring intersecting: {word} {best}')
         return word
 
     def _find_letter_frequency_in_answers(self):
@@ -231,47 +607,146 @@ class Dictionary:
             for their unique frequency in each word (meaning only 1 point per word)
         """
         letters_guessed = self.feedback.used()
-        # Remove duplicate letters from available answers
-        # FUZZY => FUZY or because sets don't preserve order
-        # FUZZY => YFZU
-        words = list(map(lambda word: ''.join(list(set(letter for letter in word))), self.answers))
-
-        letters_in_word = set(letter for letter in ''.join(words))
+        # A letter gets +1 for each word it is in, so duplicate letters in a word only count once
+        counts = collections.Counter()
+        for word in self.answers:
+            counts.update(set(word))
 
-        # Remove letters already guessed
-        letters_targeted = letters_in_word - letters_guessed
-
-        # Then create a dict of letters and their frequency (after making letters distinct)
-        # A letter gets +1 for each word it is in
-        letter_info = dict(map(lambda letter: (letter, ''.join(words).count(letter)), letters_targeted))
-
-        # Sort them by their frequency
+        # Remove letters already guessed, then sort them by their frequency
+        letter_info = dict((letter, count) for letter, count in counts.items() if letter not in letters_guessed)
         letter_info = dict(sorted(letter_info.items(), key = lambda item: item[1], reverse = True))
-        log(f'Letters: {letter_info}')
+        if LOGGING:
+            log(f'Letters: {letter_info}')
 
         return letter_info
 
     def intersecting_word(self):
-        return self._find_best_intersecting_word()
+        if not STATS.enabled:
+            return self._find_best_intersecting_word()
+        start = clock()
+        word = self._find_best_intersecting_word()
+        STATS.record('intersecting', clock() - start, len(self.index.guesses) - len(self.guessed))
+        return word
+
+    def _update_answers(self, constraints = None):
+        """
+        Prunes answers with the given Constraints, or all of the feedback
+        """
+        if self.backend == 'bitmask':
+            index = mask_index()
+            self.answers = index.select(index.evaluate(self._feedback_puzzle(constraints)), self.answers)
+        else:
+            self.answers = list(filter(self._predicate(constraints), self.answers))
 
-    def _update_answers(self):
-        self.answers = list(filter(self._word_should_be_saved, self.answers))
+    def filter_by_pattern(self, guess, code):
+        """
+        Prunes answers to those which would have given the pattern code for guess.
+        This is a single row lookup in the precomputed pattern matrix instead of a per word predicate.
+        """
+        self.patterns += ((guess, code),)
+        if not STATS.enabled:
+            self.answers = pattern_matrix().filter(guess, code, self.answers)
+            return
+        before = len(self.answers)
+        start = clock()
+        self.answers = pattern_matrix().filter(guess, code, self.answers)
+        STATS.record('filter', clock() - start, before, len(self.answers))
 
     def next_guess(self):
         """
         This function starts the pruning process and based on number of answers remaining
         returns either an answer or an intersecting word
         """
-        self._update()
-        log(f'Remaining Answers ({len(self.answers)}): {self.answers}')
-        guess = None
-        if self.use_intersecting_guesses and len(self.answers) < 50 and len(self.answers) > 2:
-            guess = self.intersecting_word()
-        if guess is None:
-            guess = self.answers[0]
+        if not STATS.enabled:
+            return self._choose_guess()
+        start = clock()
+        guess = self._choose_guess()
+        STATS.record('next_guess', clock() - start)
+        return guess
 
+    def _choose_guess(self):
+        state = self._state_key() if self.cache is not None else None
+        options = self._options_key() if state is not None else None
+        if options is not None:
+            entry = self.cache.get(f'{state}|{options}')
+            if entry is not None:
+                self._take_answers(entry[1])
+                return entry[0]
+            # The answers left don't depend on the options, games with another policy may have pruned them
+            if self.cache.store_answers:
+                entry = self.cache.get(f'{state}|answers')
+                if entry is not None:
+                    self._take_answers(entry[1])
+                else:
+                    self._update()
+                    self.cache.put(f'{state}|answers', None, self.answers)
+
+        self._update()
+        if LOGGING:
+            log(f'Remaining Answers ({len(self.answers)}): {self.answers}')
+        if self.strategy is not None:
+            guess = self.strategy.choose(self.answers, self.guesses, pattern_matrix())
+        else:
+            guess = None
+            if self.use_intersecting_guesses and self.policy.intersects(len(self.answers)):
+                guess = self._shared_intersecting_word(state if options is not None else None)
+            if guess is None:
+                guess = self.answers[0]
+
+        if options is not None:
+            self.cache.put(f'{state}|{options}', guess, self.answers)
         return guess
 
+    def _take_answers(self, answers):
+        """
+        Uses answers from the guess cache, or prunes them if it didn't keep them
+        """
+        if answers is not None:
+            # Everything the pending feedback would prune is already gone from these
+            self.feedback.take_changes()
+            self.answers = answers
+        else:
+            self._update()
+
+    def _shared_intersecting_word(self, state):
+        """
+        intersecting_word, remembered for the state when there is a cache. It only depends on the
+        answers, words guessed and letters used, so games with any policy can share it.
+        """
+        if state is None:
+            return self.intersecting_word()
+        entry = self.cache.get(f'{state}|intersecting')
+        if entry is not None:
+            return entry[0]
+        word = self.intersecting_word()
+        self.cache.put(f'{state}|intersecting', word)
+        return word
+
+    def _options_key(self):
+        """
+        The options that decide the guess from a state, None if guesses can't be cached
+        """
+        if self.strategy is None:
+            return f'heuristic:{int(self.use_intersecting_guesses)}:{self.policy.key()}'
+        if self.strategy.time_budget is None:
+            return f'{type(self.strategy).__name__}:{self.strategy.top_k}'
+        # What gets evaluated depends on the clock
+        return None
+
+    def _state_key(self):
+        """
+        A string which is the same for games in the same state. The answers left (and their order)
+        only depend on the feedback, patterns and words guessed (not the order they came in) and how
+        the answers are ranked.
+        """
+        feedback = self.feedback
+        green = ''.join(feedback.green.get(position, '.') for position in range(0, self.index.length))
+        yellow = ','.join(f'{position}{"".join(sorted(letters))}' for position, letters in sorted(feedback.yellow.items()))
+        counts = ','.join(f'{letter}{feedback.minimum.get(letter, 0)}-{feedback.maximum.get(letter, "")}' for letter in sorted(feedback.minimum.keys() | feedback.maximum.keys()))
+        patterns = ','.join(f'{guess}{code}' for guess, code in sorted(self.patterns))
+        return '|'.join([self.index.digest, str(int(self.policy.by_position)), ','.join(sorted(self.guessed)), ''.join(sorted(feedback.used())),
+            green, yellow, ''.join(sorted(feedback.gray)), counts, patterns])
+
     def is_answer(self, guess):
         """
         This is to ensure we don't try to solve a word that isn't supported in the answer list
@@ -287,28 +762,71 @@ class Dictionary:
         """
         Get the rank of a single word out of all words
         """
-        word = word.upper()
-        count = len(self.guesses)
-        index = self.guesses.index(word)+1
-        return f'{index}/{count}'
+        rank = self.ranks_of([word])[0]
+        if rank is None:
+            raise ValueError(f'{word.upper()} is not a guess')
+        return f'{rank}/{len(self.index.guesses) - len(self._guessed_ids())}'
 
     def score_of(self, word):
         """
         Get the score for a single word: x/(total word count)
         """
-        word = word.upper()
-        found = filter(lambda x: x[1] if x[0] == word else None, self.word_scores)
-        return list(found)[0][1]
+        score = self.scores_of([word])[0]
+        if score is None:
+            raise ValueError(f'{word.upper()} is not a guess')
+        return score
+
+    def _guessed_ids(self):
+        return sorted(id for id in map(self.index.guess_id, self.guessed) if id is not None)
+
+    def ranks_of(self, words):
+        """
+        Returns the rank (from 1) of each word among the guesses still available, None for words that aren't
+        """
+        guessed = self._guessed_ids()
+        ranks = []
+        for word in map(str.upper, words):
+            id = self.index.guess_id(word)
+            if id is None or word in self.guessed:
+                ranks.append(None)
+            else:
+                # Guesses already made and ranked higher don't count
+                ranks.append(id + 1 - bisect.bisect_left(guessed, id))
+        return ranks
+
+    def scores_of(self, words):
+        """
+        Returns the score of each word, None for words that aren't guesses
+        """
+        ids = map(self.index.guess_id, map(str.upper, words))
+        scores = self.index.guess_scores
+        return [scores[id] if id is not None else None for id in ids]
+
+    def top_scores(self, count, words = None):
+        """
+        Returns (word, score) for the count highest scoring words, in rank order
+        words: the words to choose from, by default every guess still available
+        """
+        index = self.index
+        guessed = set(self._guessed_ids())
+        if words is None:
+            # Guesses are in rank order already
+            top = itertools.islice((id for id in range(0, len(index.guesses)) if id not in guessed), 0, count)
+        else:
+            ids = set(map(index.guess_id, map(str.upper, words)))
+            top = heapq.nsmallest(count, ids - guessed - {None})
+        return [(index.guesses[id], index.guess_scores[id]) for id in top]
 
     def __str__(self):
-        return f'Dictionary\n{list(map(lambda x: x, words.frequency.values()))}'
+        return f'Dictionary\n{list(self.frequency.values())}'
 
     def log(self):
         log(*list(map(lambda x: x, self.letters_by_position.items())), sep = '\n')
 
-class LetterFeedback:
+class Constraints:
     """
-    This class keeps track of letters used and whether they were green, yellow or gray
+    Green, yellow and gray letters plus known letter counts.
+    The add_ methods return True only if the constraint is new.
     """
     def __init__(self):
         # These are for letters in known position
@@ -322,24 +840,118 @@ class LetterFeedback:
         # letters not in the word
         self.gray   = set()
 
+        # how many times a letter must/may appear, when known
+        # Key is letter, value is count
+        self.minimum = dict()
+        self.maximum = dict()
+
+    def add_green(self, position, letter):
+        if self.green.get(position) == letter:
+            return False
+        self.green[position] = letter
+        return True
+
+    def add_yellow(self, position, letter):
+        if position not in self.yellow:
+            self.yellow[position] = [letter]
+        elif letter not in self.yellow[position]: # don't add the same letter twice in the same index
+            self.yellow[position].append(letter)
+        else:
+            return False
+        return True
+
+    def add_gray(self, letter):
+        if letter in self.gray:
+            return False
+        self.gray.add(letter)
+        return True
+
+    def add_minimum(self, letter, count):
+        if count <= self.minimum.get(letter, 0):
+            return False
+        self.minimum[letter] = count
+        return True
+
+    def add_maximum(self, letter, count):
+        if letter in self.maximum and count >= self.maximum[letter]:
+            return False
+        self.maximum[letter] = count
+        return True
+
+    def is_empty(self):
+        return len(self.green) == 0 and len(self.yellow) == 0 and len(self.gray) == 0 \
+            and len(self.minimum) == 0 and len(self.maximum) == 0
+
+    def _copy_into(self, other):
+        other.green = dict(self.green)
+        other.yellow = dict((position, list(letters)) for position, letters in self.yellow.items())
+        other.gray = set(self.gray)
+        other.minimum = dict(self.minimum)
+        other.maximum = dict(self.maximum)
+        return other
+
+    def copy(self):
+        return self._copy_into(Constraints())
+
+class LetterFeedback(Constraints):
+    """
+    This class keeps track of letters used and whether they were green, yellow or gray
+
+    Constraints added since answers were last pruned are also kept in `changes`, so the Dictionary
+    only has to apply those to the answers that are left
+    """
+    def __init__(self, length = WORD_LENGTH):
+        super().__init__()
+        self.length = length
+
         # letters used in guesses
         self._used   = set()
 
         self._unused = set([letter for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"])
 
+        self.changes = Constraints()
+
     def hit(self, letter, position, is_green):
         self.use(letter)
         if is_green:
-            self.green[position] = letter
+            if self.add_green(position, letter):
+                self.changes.add_green(position, letter)
         else:
-            if position not in self.yellow:
-                self.yellow[position] = [letter]
-            elif letter not in self.yellow[position]: # don't add the same letter twice in the same index
-                    self.yellow[position].append(letter)
+            if self.add_yellow(position, letter):
+                self.changes.add_yellow(position, letter)
 
     def miss(self, letter):
-        self.gray.add(letter)
+        if self.add_gray(letter):
+            self.changes.add_gray(letter)
+        self.use(letter)
+
+    def bound(self, letter, minimum = 0, maximum = None):
+        """
+        Records that letter appears at least minimum times and (if given) at most maximum times
+        """
         self.use(letter)
+        if self.add_minimum(letter, minimum):
+            self.changes.add_minimum(letter, minimum)
+        if maximum is not None and self.add_maximum(letter, maximum):
+            self.changes.add_maximum(letter, maximum)
+
+    def has_changes(self):
+        return not self.changes.is_empty()
+
+    def copy(self):
+        other = self._copy_into(LetterFeedback(self.length))
+        other._used = set(self._used)
+        other._unused = set(self._unused)
+        other.changes = self.changes.copy()
+        return other
+
+    def take_changes(self):
+        """
+        Returns the constraints added since the last call and starts recording new ones
+        """
+        changes = self.changes
+        self.changes = Constraints()
+        return changes
 
     def use(self, letter):
         self._used.add(letter)
@@ -349,13 +961,16 @@ class LetterFeedback:
     def used(self):
         return self._used
 
+    def has_constraints(self):
+        return not self.is_empty()
+
     def unused(self):
         return self._unused
 
     def __str__(self):
         gray = ''.join(sorted(self.gray))
         unused = ''.join(sorted(self.unused()))
-        greens = ['*' for i in range(0,5)]
+        greens = ['*' for i in range(0,self.length)]
         for key in self.green:
             greens[key] = self.green[key]
         greens = ''.join(greens)
@@ -363,8 +978,8 @@ class LetterFeedback:
         return f'--Green: {greens}, Yellow: {yellows}, Gray: {gray}, Unused: {unused}'
 
 class Puzzle:
-    def __init__(self, use_intersecting = True):
-        self.dictionary = Dictionary(use_intersecting)
+    def __init__(self, use_intersecting = True, backend = 'python', strategy = None, cache = None, policy = None):
+        self.dictionary = Dictionary(use_intersecting, backend, strategy = strategy, cache = cache, policy = policy)
         self.feedback = self.dictionary.feedback
 
         # words we have guessed
@@ -381,6 +996,13 @@ class Puzzle:
         self.guesses.append(guess)
         self.dictionary.register_guess(guess)
 
+    def copy(self):
+        other = Puzzle.__new__(Puzzle)
+        other.dictionary = self.dictionary.copy()
+        other.feedback = other.dictionary.feedback
+        other.guesses = list(self.guesses)
+        return other
+
     def next_guess(self):
         return self.dictionary.next_guess()
 
@@ -394,26 +1016,41 @@ class Puzzle:
         return self.dictionary.is_answer(guess)
 
     def is_supported_answer(self, answer):
-        return answer in self.dictionary.answers
+        return answer in self.dictionary.index.answer_set
 
 class Solution:
-    def __init__(self, guesses):
+    def __init__(self, guesses, trace = None):
         self.word = guesses[-1]
         self.guess_count = len(guesses)
         self.guesses = guesses
+        # One dictionary per turn when the Solver was tracing, see Solver.solve
+        self.trace = trace
 
 class Solver:
-    def __init__(self, target = None, use_intersecting = True):
+    def __init__(self, target = None, use_intersecting = True, exact_feedback = False, backend = 'python', strategy = None, trace = False, cache = None, policy = None):
+        """
+        exact_feedback: if True, guesses are scored with real Wordle duplicate letter rules and answers
+        are pruned with the precomputed pattern matrix instead of the green/yellow/gray predicates
+        backend: how the Dictionary prunes answers from green/yellow/gray feedback, one of BACKENDS
+        strategy: how the Dictionary picks guesses, see strategies.py
+        trace: if True, solve records every turn in the Solution's trace
+        cache: remember guesses across games, see Dictionary
+        policy: a policy.Policy for the heuristic guesses, see Dictionary
+        """
+        self.exact_feedback = exact_feedback
+        self.trace = list() if trace else None
         if target is not None:
             self.target = target.upper()
         else:
             self.target = None
-        self.puzzle = Puzzle(use_intersecting)
+        self.puzzle = Puzzle(use_intersecting, backend, strategy, cache, policy)
         if self.target is not None and not self.puzzle.is_supported_answer(self.target):
             raise UnsupportedAnswer()
         self._is_solved = False
 
     def _process_guess(self, guess):
+        if self.exact_feedback:
+            return self._process_pattern(guess)
         for (index, letter) in enumerate(guess):
             if letter in self.target:
                 # letter is in correct position (Green)
@@ -424,11 +1061,52 @@ class Solver:
                     self.puzzle.hit(letter, index, False)
             else:
                 self.puzzle.miss(letter)
-        log(self.puzzle.feedback)
+        if LOGGING:
+            log(self.puzzle.feedback)
+
+    def _process_pattern(self, guess):
+        self._apply_pattern(guess, feedback_pattern(guess, self.target))
+
+    def _apply_pattern(self, guess, code):
+        if self.exact_feedback:
+            self.puzzle.dictionary.filter_by_pattern(guess, code)
+            # Letters still count as used so intersecting guesses target new letters
+            for letter in guess:
+                self.puzzle.feedback.use(letter)
+        else:
+            for index, digit in enumerate(decode_pattern(code, len(guess))):
+                if digit == GRAY:
+                    self.puzzle.miss(guess[index])
+                else:
+                    self.puzzle.hit(guess[index], index, digit == GREEN)
+        if LOGGING:
+            log(f'{guess}: {decode_pattern(code, len(guess))}')
 
-    def solve(self, starting_word = "SALET"):
+    def copy(self):
+        """
+        Returns a Solver in the same state, e.g. to try different feedback from here
+        """
+        other = Solver.__new__(Solver)
+        other.exact_feedback = self.exact_feedback
+        other.target = self.target
+        other.puzzle = self.puzzle.copy()
+        other._is_solved = self._is_solved
+        other.trace = list(self.trace) if self.trace is not None else None
+        return other
+
+    def solve(self, starting_word = None):
+        """
+        starting_word: the first guess, the policy's starting word by default. If that isn't set or
+        can't be guessed with these word lists the solver picks its own.
+        """
+        if starting_word is None:
+            dictionary = self.puzzle.dictionary
+            starting_word = dictionary.index.starting_word(dictionary.policy.starting_word)
+        start = clock() if self.trace is not None else 0
         guess = starting_word if starting_word else self.puzzle.next_guess()
         while not self._is_solved:
+            if self.trace is not None:
+                self._trace_turn(guess, clock() - start)
             # Keep track of words and letters guessed
             self.puzzle.add_guess(guess)
             if guess == self.target:
@@ -436,9 +1114,24 @@ class Solver:
                 break
             else:
                 self._process_guess(guess)
+                start = clock() if self.trace is not None else 0
                 guess = self.puzzle.next_guess()
 
-        return Solution(self.puzzle.guesses)
+        return Solution(self.puzzle.guesses, self.trace)
+
+    def _trace_turn(self, guess, seconds):
+        """
+        Records a turn: candidates is how many answers were left when guess was chosen and
+        seconds is how long choosing it took (0 for the starting word)
+        """
+        code = feedback_pattern(guess, self.target) if self.exact_feedback else presence_pattern(guess, self.target)
+        self.trace.append({
+            'turn': len(self.puzzle.guesses) + 1,
+            'guess': guess,
+            'feedback': pattern_string(code, len(guess)),
+            'candidates': self.answer_count(),
+            'seconds': seconds,
+        })
 
     ######################################################
     # The following methods are for the interactive solver
@@ -467,6 +1160,28 @@ class Solver:
                 unused.remove(letter)
         for letter in unused:
             self.puzzle.miss(letter)
+        # Each green or yellow is one copy of its letter. Copies in the guess that were neither
+        # mean the answer has no more of that letter (yellows are too ambiguous to cap this way)
+        for letter in set(word) - unused:
+            greens = sum(1 for index, g in enumerate(in_place) if g == letter and word[index] == letter)
+            yellows = out_of_place.count(letter)
+            if greens + yellows == 0:
+                continue
+            maximum = greens if yellows == 0 and word.count(letter) > greens else None
+            self.puzzle.feedback.bound(letter, greens + yellows, maximum)
+
+    def feedback(self, word, code, add_guess = True):
+        """
+        Registers a guess along with the pattern (see patterns.py) it received.
+        Without exact_feedback the pattern is read the way _process_guess builds it (patterns.presence_pattern):
+        yellow means the letter is somewhere in the answer.
+        add_guess: False if word was already added with puzzle.add_guess, e.g. before copying the Solver
+        """
+        word = word.upper()
+        if add_guess:
+            self.puzzle.add_guess(word)
+        self._apply_pattern(word, code)
+        self._is_solved = code == solved_pattern(len(word))
 
     def answer_count(self):
         return self.puzzle.dictionary.answer_count()
@@ -484,3 +1199,29 @@ class Solver:
 
     def guesses(self):
         return self.puzzle.guesses
+
+def _solve(word, starting_word, options):
+    return Solver(word, **options).solve(starting_word)
+
+def solve_all(words, starting_word, jobs = 1, **options):
+    """
+    Yields a Solution for each word, in the same order as words.
+    options are passed on to every Solver, e.g. use_intersecting = False
+    With jobs > 1 the words are spread over a pool of worker processes. The WordIndex is
+    loaded once here, before the pool starts, so forked workers share it copy-on-write.
+    """
+    solver = functools.partial(_solve, starting_word = starting_word, options = options)
+    if jobs <= 1:
+        yield from map(solver, words)
+        return
+
+    # Load the shared word data, then move it out of the garbage collector's generations
+    # so collections in the workers don't touch (and copy) those pages
+    WordIndex.shared().guess_letters
+    gc.freeze()
+    import multiprocessing
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    chunksize = max(1, len(words) // (jobs * 8))
+    with context.Pool(jobs) as pool:
+        yield from pool.imap(solver, words, chunksize)
@@ -0,0 +1,108 @@
+"""
+Compact storage for word lists.
+
+Every word in a list has the same length, so a WordList packs them into a single bytes object of
+ASCII letters, word i being data[i*length:(i+1)*length]. That is length bytes per word instead of a
+Python str each (about 50 bytes plus the letters), which matters for 100k+ word dictionaries.
+Words are decoded as they are read. Words read by position are interned, so every one of them
+decoded anywhere in the process is the same str object; iterating doesn't, since a pass over a list
+mostly makes words that are dropped right away (filtering answers) and interning them costs more
+than the pass.
+"""
+import sys
+
+class WordList:
+    __slots__ = ('data', 'length')
+
+    def __init__(self, data, length):
+        """
+        data: the words' letters back to back, length bytes each
+        """
+        if length <= 0 or len(data) % length != 0:
+            raise ValueError(f'{len(data)} bytes is not a whole number of {length} letter words')
+        self.data = bytes(data)
+        self.length = length
+
+    @classmethod
+    def from_words(cls, words, length = None):
+        """
+        Packs words, which must all have length letters (by default the length of the first word)
+        """
+        words = list(words)
+        if length is None:
+            if len(words) == 0:
+                raise ValueError('Cannot tell the word length of an empty list')
+            length = len(words[0])
+        for word in words:
+            if len(word) != length:
+                raise ValueError(f'{word} is not {length} letters long')
+        return cls(''.join(words).encode('ascii'), length)
+
+    def __len__(self):
+        return len(self.data) // self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            # Decode the run of words at once
+            text = self.data[start * self.length:max(start, stop) * self.length].decode('ascii')
+            return [sys.intern(text[i:i + self.length]) for i in range(0, len(text), self.length)]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('WordList index out of range')
+        start = index * self.length
+        return sys.intern(self.data[start:start + self.length].decode('ascii'))
+
+    def __iter__(self):
+        text = self.data.decode('ascii')
+        length = self.length
+        for start in range(0, len(text), length):
+            yield text[start:start + length]
+
+    def find(self, word):
+        """
+        Returns the position of word, or -1 if it isn't in the list. This searches the packed bytes,
+        so it takes time in proportion to the list; anything looking up words often should keep a
+        dictionary of them (like WordIndex.guess_ids) instead.
+        """
+        if not isinstance(word, str) or len(word) != self.length or not word.isascii():
+            return -1
+        target = word.encode('ascii')
+        start = self.data.find(target)
+        # Only matches starting on a word boundary count
+        while start != -1 and start % self.length != 0:
+            start = self.data.find(target, start + 1)
+        return start // self.length if start != -1 else -1
+
+    def index(self, word):
+        position = self.find(word)
+        if position == -1:
+            raise ValueError(f'{word} is not in the list')
+        return position
+
+    def __contains__(self, word):
+        return self.find(word) != -1
+
+    def without(self, word):
+        """
+        Returns a WordList without word, or this one if word isn't in it
+        """
+        position = self.find(word)
+        if position == -1:
+            return self
+        start = position * self.length
+        return WordList(self.data[0:start] + self.data[start + self.length:], self.length)
+
+    def __add__(self, other):
+        if not isinstance(other, WordList) or other.length != self.length:
+            raise ValueError('Only word lists of the same word length can be joined')
+        return WordList(self.data + other.data, self.length)
+
+    def __eq__(self, other):
+        return isinstance(other, WordList) and self.length == other.length and self.data == other.data
+
+    def __repr__(self):
+        return f'WordList({len(self)} words of {self.length} letters)'
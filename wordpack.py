@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Compiled word lists, so starting up doesn't parse the text files or score every word again.
+
+A word pack holds everything a WordIndex computes from its two word lists, and is named after (and
+keyed by) a sha256 of the lists' bytes, so editing a list simply means the pack is no longer found.
+Running this file builds the pack for the NYT lists (or the ones given) in .wordle-cache/, and
+WordIndex.open memory-maps it from then on. The numeric tables are used in place from the mapped
+file, so every process using the same pack shares those pages.
+
+Layout, little endian, words are length ASCII letters each and counts are uint32:
+    header: PACK_HEADER
+    guess words, answer words: as the files list them
+    guesses, answers: sorted by score, highest first (see WordIndex)
+    guess scores, answer scores: parallel to guesses and answers
+    letter counts: 26 x length, indexed by letter * length + position
+    letter totals: 26
+    letters: the letters of the answers in the order they first appear, one byte each
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from patterns import CACHE_DIRECTORY
+
+PACK_VERSION = 1
+PACK_MAGIC = b'WPAK'
+# magic, version, word length, guess words, answer words, guesses, answers, letters, source digest
+PACK_HEADER = struct.Struct('<4sHBIIIIB32s')
+
+def source_digest(guess_file, answer_file, length = None):
+    """
+    sha256 of both word files as they are on disk and the length they are read with
+    """
+    digest = hashlib.sha256()
+    digest.update(f'v{PACK_VERSION}\n{length}\n'.encode())
+    for filename in [guess_file, answer_file]:
+        with open(filename, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\0')
+    return digest.digest()
+
+def pack_path(digest, directory = CACHE_DIRECTORY):
+    return os.path.join(directory, f'words-v{PACK_VERSION}-{digest.hex()[0:16]}.pack')
+
+def _counts_bytes(counts):
+    return struct.pack(f'<{len(counts)}I', *counts)
+
+def write(index, path, digest):
+    """
+    Writes a WordIndex to path. The file is written to a temporary name first so a partially
+    written pack is never read.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    letters = ''.join(index.frequency.keys())
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, index.length, len(index.guess_words), len(index.answer_words),
+            len(index.guesses), len(index.answers), len(letters), digest))
+        f.write(index.guess_words.data)
+        f.write(index.answer_words.data)
+        f.write(index.guesses.data)
+        f.write(index.answers.data)
+        f.write(_counts_bytes(index.guess_scores))
+        f.write(_counts_bytes(index.answer_scores))
+        f.write(_counts_bytes(index.letter_counts))
+        f.write(_counts_bytes(index.letter_totals))
+        f.write(letters.encode('ascii'))
+    os.replace(temporary, path)
+
+def _counts(view):
+    """
+    uint32s from the mapped file, in place unless this machine is big endian
+    """
+    if sys.byteorder == 'little':
+        return view.cast('I')
+    import array
+    counts = array.array('I', bytes(view))
+    counts.byteswap()
+    return counts
+
+def read(path, digest):
+    """
+    Memory-maps a pack and returns its sections as a dict, or None if there is no pack at path
+    or it was built from other word lists or by another version
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+    if len(mapped) < PACK_HEADER.size:
+        mapped.close()
+        return None
+    magic, version, length, guess_words, answer_words, guesses, answers, letters, source = PACK_HEADER.unpack_from(mapped)
+    sizes = [
+        ('guess_words', guess_words * length),
+        ('answer_words', answer_words * length),
+        ('guesses', guesses * length),
+        ('answers', answers * length),
+        ('guess_scores', guesses * 4),
+        ('answer_scores', answers * 4),
+        ('letter_counts', 26 * length * 4),
+        ('letter_totals', 26 * 4),
+        ('letters', letters),
+    ]
+    if (magic, version, source) != (PACK_MAGIC, PACK_VERSION, digest) or length == 0 \
+            or len(mapped) != PACK_HEADER.size + sum(size for _, size in sizes):
+        mapped.close()
+        return None
+    view = memoryview(mapped)
+    sections = {'length': length}
+    offset = PACK_HEADER.size
+    for name, size in sizes:
+        sections[name] = view[offset:offset + size]
+        offset += size
+    for name in ['guess_scores', 'answer_scores', 'letter_counts', 'letter_totals']:
+        sections[name] = _counts(sections[name])
+    return sections
+
+if __name__ == '__main__':
+    import argparse
+    import time
+    from wordle_solver import ANSWER_DICTIONARY
+    from wordle_solver import GUESSING_DICTIONARY
+    from wordle_solver import WordIndex
+    parser = argparse.ArgumentParser(description='Build the word pack that WordIndex loads at startup')
+    parser.add_argument('-d', '--dictionary', action="store", dest="dictionary", default=ANSWER_DICTIONARY, help="File of possible answers")
+    parser.add_argument('-g', '--guesses', action="store", dest="guesses", default=GUESSING_DICTIONARY, help="File of words that may be guessed")
+    parser.add_argument('-l', '--length', action="store", dest="length", type=int, help="Only use words with this many letters")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    digest = source_digest(args.guesses, args.dictionary, args.length)
+    path = pack_path(digest)
+    index = WordIndex(args.guesses, args.dictionary, args.length)
+    write(index, path, digest)
+    print(f'Packed {len(index.guesses)} guesses and {len(index.answers)} answers in {round(time.perf_counter() - start, 3)}s: {path}')